@@ -143,9 +143,9 @@ async def migrated_database(admin_psql_dsn: str):
 
 @pytest.fixture
 async def psql_pool(migrated_database: str):
-    import asyncpg
+    from core.storage.psql._psql_pool import create_psql_pool
 
-    pool = await asyncpg.create_pool(dsn=migrated_database)
+    pool = await create_psql_pool(migrated_database)
 
     yield pool
     await pool.close()
@@ -1,10 +1,19 @@
 import os
-
-from openai import AsyncOpenAI
+from functools import cache
+from typing import TYPE_CHECKING
 
 from core.consts import ANOTHERAI_API_URL
 
-client = AsyncOpenAI(
-    api_key=os.environ.get("ANOTHERAI_API_KEY", ""),
-    base_url=f"{ANOTHERAI_API_URL}/v1/",
-)
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+@cache
+def client() -> "AsyncOpenAI":
+    # openai is slow to import so the client is only built when an agent is first called
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=os.environ.get("ANOTHERAI_API_KEY", ""),
+        base_url=f"{ANOTHERAI_API_URL}/v1/",
+    )
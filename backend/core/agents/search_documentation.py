@@ -1,7 +1,6 @@
 import json
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from openai.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel, Field
 
 from core.domain.documentation_section import DocumentationSection
@@ -9,6 +8,9 @@ from core.domain.models.models import Model
 
 from ._client import client
 
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletionMessageParam
+
 
 # TODO: we should piggy back on the model below
 def _create_search_documentation_json_schema(available_section_file_paths: list[str]) -> dict[str, Any]:
@@ -120,7 +122,7 @@ Given a search query and all available documentation sections, you must:
         },
     ]
 
-    completion = await client.chat.completions.create(
+    completion = await client().chat.completions.create(
         model="search-documentation-agent/gemini-2.5-flash",
         messages=messages,
         response_format={
@@ -1,20 +1,24 @@
 import base64
+import binascii
+import hashlib
 import mimetypes
 import re
 from base64 import b64decode
 from enum import StrEnum
 from urllib.parse import parse_qs, urlparse
 
-import httpx
 import structlog
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from pydantic.json_schema import SkipJsonSchema
 
 from core.domain.exceptions import InternalError, InvalidFileError
+from core.utils.file_downloader import file_downloader
 from core.utils.files import guess_content_type
 
 log = structlog.get_logger(__name__)
 
+_HASH_CHUNK_SIZE = 1024 * 1024
+
 
 class FileKind(StrEnum):
     DOCUMENT = "document"  # includes text, pdfs and images
@@ -39,6 +43,10 @@ class File(BaseModel):
 
     storage_url: str | None = Field(default=None, description="The URL of the file in the storage")
 
+    # Caches keyed by the data string they were computed from, so they are ignored once data is replaced
+    _content: tuple[str, bytes] | None = PrivateAttr(default=None)
+    _data_hash: tuple[str, str] | None = PrivateAttr(default=None)
+
     @property
     def is_image(self) -> bool | None:
         if self.content_type:
@@ -81,9 +89,26 @@ class File(BaseModel):
         return ""
 
     def content_bytes(self) -> bytes | None:
-        if self.data:
-            return b64decode(self.data)
-        return None
+        if not self.data:
+            return None
+        if self._content and self._content[0] is self.data:
+            return self._content[1]
+        # Unlike b64decode, a2b_base64 reads ASCII strings without copying them to bytes first
+        return binascii.a2b_base64(self.data)
+
+    def data_hash(self) -> str | None:
+        """A hash of the base64 data, computed once per data value"""
+        if not self.data:
+            return None
+        if self._data_hash and self._data_hash[0] is self.data:
+            return self._data_hash[1]
+        hasher = hashlib.blake2s()
+        # Encoding by chunks avoids copying the whole data
+        for i in range(0, len(self.data), _HASH_CHUNK_SIZE):
+            hasher.update(self.data[i : i + _HASH_CHUNK_SIZE].encode())
+        data_hash = hasher.hexdigest()[:32]
+        self._data_hash = (self.data, data_hash)
+        return data_hash
 
     def templatable_content(self) -> str:
         return " ".join(k for k in (self.url, self.data, self.content_type) if k)
@@ -96,48 +121,30 @@ class File(BaseModel):
 
         raise InternalError("No data or URL provided for image")
 
-    @classmethod
-    async def _fetch_with_retries(cls, client: httpx.AsyncClient, url: str, retries: int = 2) -> httpx.Response:
-        try:
-            return await client.get(url)
-        except (
-            httpx.ConnectTimeout,
-            httpx.ReadTimeout,
-            httpx.ReadError,
-            httpx.ConnectError,
-            httpx.RemoteProtocolError,
-        ) as e:
-            if retries <= 0:
-                raise InvalidFileError(
-                    f"Failed to download file: {e}",
-                    capture=False,
-                ) from e
-            return await cls._fetch_with_retries(client, url, retries - 1)
-
     async def download(self):
         if not self.url:
             raise InvalidFileError("File url is required when data is not provided")
 
-        async with httpx.AsyncClient() as client:
-            response = await self._fetch_with_retries(client, self.url)
+        downloaded = await file_downloader.download(self.url)
 
-        if response.status_code != 200:
-            raise InvalidFileError(
-                f"Failed to file image: {response.status_code}",
-                file_url=self.url,
-                details={"response_status_code": response.status_code, "response_body": response.text},
-            )
-
-        self.data = base64.b64encode(response.content).decode("utf-8")
+        self.data = base64.b64encode(downloaded.content).decode("utf-8")
+        # Keeping the downloaded bytes avoids decoding the data again when the file is stored
+        self._content = (self.data, downloaded.content)
 
         if self.content_type is None:
-            self.content_type = guess_content_type(response.content)
+            self.content_type = guess_content_type(downloaded.content) or downloaded.content_type
             if self.content_type is None:
                 log.warning("Could not guess content type of url", url=self.url)
 
+    async def sniff_content_type(self):
+        """Sets the content type of a file that is only available by URL without downloading it"""
+        if self.content_type or not self.url or self.url.startswith("data:"):
+            return
+        self.content_type = await file_downloader.sniff_content_type(self.url)
+
     def _validate_url_and_set_content_type(self, url: str):
         if url.startswith("data:"):
-            content_type, data = _parse_data_url(url[5:])
+            content_type, data = _parse_data_url(url)
             self.content_type = content_type
             _validate_base64(data)
             self.data = data
@@ -166,9 +173,9 @@ class File(BaseModel):
 
     def sanitize(self):
         if self.data:
-            decoded_data = _validate_base64(self.data)
+            _validate_base64(self.data)
             if not self.content_type:
-                self.content_type = guess_content_type(decoded_data)
+                self.content_type = guess_content_type(_decode_head(self.data))
             return self
         if self.url:
             self._validate_url_and_set_content_type(self.url)
@@ -180,17 +187,34 @@ class File(BaseModel):
 _template_var_regexp = re.compile(r"\{\{([^}]+)\}\}")
 
 
-def _validate_base64(data: str) -> bytes:
-    # TODO: maybe we do not need to decode the data here, just check the padding
-    # That's a lot of memory usage for no reason
+_strict_base64_regexp = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+# Enough characters to decode the signatures used to guess content types
+_HEAD_BASE64_LENGTH = 64
+_BASE64_MARKER = ";base64,"
+
+
+def _validate_base64(data: str) -> None:
+    # Canonical base64 is validated without decoding it, which would allocate the full content
+    if len(data) % 4 == 0 and _strict_base64_regexp.fullmatch(data):
+        return
+    # Decoding is more lenient, for example with line breaks
     try:
-        return b64decode(data)
+        _ = b64decode(data)
     except Exception as e:
         raise ValueError("Invalid base64 data in file") from e
 
 
+def _decode_head(data: str) -> bytes:
+    try:
+        return b64decode(data[:_HEAD_BASE64_LENGTH])
+    except ValueError:
+        # Not canonical base64, the signature can only be found by decoding everything
+        return b64decode(data)
+
+
 def _parse_data_url(data_url: str) -> tuple[str, str]:
-    splits = data_url.split(";base64,")
-    if len(splits) != 2:
+    # Slicing only once avoids copying the data, which can be several MBs, multiple times
+    marker_index = data_url.find(_BASE64_MARKER)
+    if marker_index == -1 or data_url.find(_BASE64_MARKER, marker_index + 1) != -1:
         raise ValueError("Invalid base64 data URL")
-    return splits[0], splits[1]
+    return data_url[5:marker_index], data_url[marker_index + len(_BASE64_MARKER) :]
@@ -0,0 +1,68 @@
+import base64
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from core.domain.file import File
+from core.utils.hash import hash_string
+
+_PNG_DATA = base64.b64encode(b"\x89PNG\r\n\x1a\n" + b"\x00" * 100).decode()
+
+
+class TestSanitize:
+    def test_data_content_type_is_guessed(self):
+        file = File(data=_PNG_DATA).sanitize()
+        assert file.content_type == "image/png"
+
+    def test_data_url(self):
+        file = File(url=f"data:image/png;base64,{_PNG_DATA}").sanitize()
+        assert file.content_type == "image/png"
+        assert file.data == _PNG_DATA
+        assert file.url is None
+
+    def test_data_with_line_breaks(self):
+        data = _PNG_DATA[:20] + "\n" + _PNG_DATA[20:]
+        file = File(data=data).sanitize()
+        assert file.content_type == "image/png"
+
+    @pytest.mark.parametrize("data", ["not base64!", "aGVsbG8"])
+    def test_invalid_data(self, data: str):
+        with pytest.raises(ValueError, match="Invalid base64 data in file"):
+            _ = File(data=data).sanitize()
+
+    @pytest.mark.parametrize("url", ["data:image/png,hello", "data:image/png;base64,a;base64,b"])
+    def test_invalid_data_url(self, url: str):
+        with pytest.raises(ValueError, match="Invalid base64 data URL"):
+            _ = File(url=url).sanitize()
+
+
+class TestDataHash:
+    def test_hash_is_cached_per_data(self):
+        file = File(data=_PNG_DATA)
+        data_hash = file.data_hash()
+        assert data_hash == hash_string(_PNG_DATA)
+        assert file.data_hash() is data_hash
+
+        file.data = base64.b64encode(b"hello").decode()
+        assert file.data_hash() == hash_string(file.data)
+
+    def test_no_data(self):
+        assert File(url="https://example.com/image.png").data_hash() is None
+
+
+class TestContentBytes:
+    def test_decodes_data(self):
+        assert File(data=base64.b64encode(b"hello").decode()).content_bytes() == b"hello"
+
+    async def test_downloaded_content_is_reused(self, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(url="https://example.com/image.png", content=b"hello")
+        file = File(url="https://example.com/image.png")
+
+        await file.download()
+        assert file.data == base64.b64encode(b"hello").decode()
+        assert file._content == (file.data, b"hello")  # pyright: ignore[reportPrivateUsage]
+        assert file.content_bytes() == b"hello"
+
+        # Replaced data is decoded
+        file.data = base64.b64encode(b"world").decode()
+        assert file.content_bytes() == b"world"
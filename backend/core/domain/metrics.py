@@ -1,3 +1,7 @@
+import asyncio
+import math
+import os
+import re
 import time
 from collections.abc import Awaitable, Callable
 from contextlib import contextmanager
@@ -6,7 +10,7 @@ from typing import Any, ClassVar
 from pydantic import BaseModel, Field
 from structlog import get_logger
 
-from core.utils.background import add_background_task
+from core.utils.coroutines import sentry_wrap
 
 
 async def _noop_sender(metric: "Metric", *args: Any, **kwargs: Any):
@@ -34,20 +38,222 @@ class Metric(BaseModel):
         cls.sender = _noop_sender
 
 
+type _Tags = tuple[tuple[str, int | str | float | bool], ...]
+type _Key = tuple[str, _Tags]
+
+# Upper bounds of the histogram buckets, histograms are only used for durations in seconds,
+# up to the several minutes of some LLM calls
+_HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+_FLUSH_INTERVAL_SECONDS = 10.0
+
+# Labels with an unbounded number of values. They are kept in the metrics that are sent,
+# which only hold the values of a flush interval, but not in the cumulative aggregates
+# that live as long as the process
+_UNBOUNDED_LABELS = frozenset({"tenant"})
+# Safeguard against other high cardinality labels, new series are dropped from the cumulative aggregates
+_MAX_SERIES = int(os.environ.get("METRICS_MAX_SERIES", "5000"))
+
+_invalid_name_chars = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(_HISTOGRAM_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(_HISTOGRAM_BUCKETS):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                # Buckets are cumulative when rendered so only the first matching bucket is incremented
+                break
+
+
+def _metric_name(name: str) -> str:
+    return _invalid_name_chars.sub("_", name)
+
+
+def _label_value(value: str | float | bool) -> str:
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(tags: _Tags, *extra: tuple[str, str]) -> str:
+    labels = [f'{_metric_name(k)}="{_label_value(v)}"' for k, v in tags]
+    labels.extend(f'{k}="{v}"' for k, v in extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsAggregator:
+    """Aggregates counters, gauges and durations in process, keyed by name and tags.
+
+    Recording a metric only updates a few numbers. Aggregates are exposed in the
+    Prometheus text format and, when a metric sender is configured, the values
+    accumulated since the last flush are sent periodically by a single task."""
+
+    def __init__(self, flush_interval_seconds: float = _FLUSH_INTERVAL_SECONDS, max_series: int = _MAX_SERIES):
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_series = max_series
+        # Cumulative values, as expected by Prometheus
+        self._counters: dict[_Key, int] = {}
+        self._gauges: dict[_Key, float] = {}
+        self._histograms: dict[_Key, _Histogram] = {}
+        self._series_limit_reached = False
+        # Values accumulated since the last flush
+        self._pending_counters: dict[_Key, int] = {}
+        self._pending_gauges: dict[_Key, float] = {}
+        self._pending_durations: dict[_Key, tuple[float, int]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def _cumulative_key(self, name: str, tags: dict[str, str | float | bool], series: dict[_Key, Any]) -> _Key | None:
+        """The key of the cumulative aggregate or None if the series should not be created"""
+        key = (name, tuple(sorted((k, v) for k, v in tags.items() if k not in _UNBOUNDED_LABELS)))
+        if key in series:
+            return key
+        if len(self._counters) + len(self._gauges) + len(self._histograms) >= self._max_series:
+            if not self._series_limit_reached:
+                self._series_limit_reached = True
+                get_logger(__name__).warning("Maximum number of metric series reached", max_series=self._max_series)
+            return None
+        return key
+
+    def increment(self, name: str, value: int, tags: dict[str, str | float | bool]):
+        if key := self._cumulative_key(name, tags, self._counters):
+            self._counters[key] = self._counters.get(key, 0) + value
+        if self._should_send():
+            key = (name, tuple(sorted(tags.items())))
+            self._pending_counters[key] = self._pending_counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, tags: dict[str, str | float | bool]):
+        if key := self._cumulative_key(name, tags, self._gauges):
+            self._gauges[key] = value
+        if self._should_send():
+            self._pending_gauges[(name, tuple(sorted(tags.items())))] = value
+
+    def observe(self, name: str, value: float, tags: dict[str, str | float | bool]):
+        """Records a duration in seconds"""
+        if key := self._cumulative_key(name, tags, self._histograms):
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(value)
+        if self._should_send():
+            key = (name, tuple(sorted(tags.items())))
+            total, count = self._pending_durations.get(key, (0.0, 0))
+            self._pending_durations[key] = (total + value, count + 1)
+
+    def _should_send(self) -> bool:
+        if Metric.sender is _noop_sender:
+            return False
+        self._ensure_flushing()
+        return True
+
+    def _ensure_flushing(self):
+        if self._flush_task and not self._flush_task.done():
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self._scheduled_flush())
+        except RuntimeError:
+            # No running loop, pending values are sent on the next flush
+            self._flush_task = None
+
+    async def _scheduled_flush(self):
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            await sentry_wrap(self.flush())
+
+    def _pending_metrics(self) -> list[Metric]:
+        counters, self._pending_counters = self._pending_counters, {}
+        gauges, self._pending_gauges = self._pending_gauges, {}
+        durations, self._pending_durations = self._pending_durations, {}
+        now = time.time()
+        metrics = [
+            Metric(name=name, counter=value, tags=dict(tags), timestamp=now) for (name, tags), value in counters.items()
+        ]
+        # Gauges are sent as their last value
+        metrics.extend(
+            Metric(name=name, gauge=value, tags=dict(tags), timestamp=now) for (name, tags), value in gauges.items()
+        )
+        # Durations are sent as the average of the values observed during the interval
+        metrics.extend(
+            Metric(name=name, gauge=total / count, tags=dict(tags), timestamp=now)
+            for (name, tags), (total, count) in durations.items()
+        )
+        return metrics
+
+    async def flush(self):
+        metrics = self._pending_metrics()
+        if metrics:
+            _ = await asyncio.gather(*(metric.send() for metric in metrics), return_exceptions=True)
+
+    async def close(self):
+        if self._flush_task:
+            _ = self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+
+        counters: dict[str, list[tuple[_Tags, int]]] = {}
+        for (name, tags), value in self._counters.items():
+            counters.setdefault(_metric_name(name), []).append((tags, value))
+        for name, series in sorted(counters.items()):
+            lines.append(f"# TYPE {name}_total counter")
+            lines.extend(f"{name}_total{_labels(tags)} {value}" for tags, value in series)
+
+        gauges: dict[str, list[tuple[_Tags, float]]] = {}
+        for (name, tags), value in self._gauges.items():
+            gauges.setdefault(_metric_name(name), []).append((tags, value))
+        for name, series in sorted(gauges.items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{_labels(tags)} {_format_value(value)}" for tags, value in series)
+
+        histograms: dict[str, list[tuple[_Tags, _Histogram]]] = {}
+        for (name, tags), histogram in self._histograms.items():
+            histograms.setdefault(_metric_name(name), []).append((tags, histogram))
+        for name, series in sorted(histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for tags, histogram in series:
+                cumulative = 0
+                for bound, count in zip(_HISTOGRAM_BUCKETS, histogram.bucket_counts, strict=True):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(tags, ('le', _format_value(bound)))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(tags, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{name}_count{_labels(tags)} {histogram.count}")
+                lines.append(f"{name}_sum{_labels(tags)} {_format_value(histogram.sum)}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics_aggregator = MetricsAggregator()
+
+
 def send_counter(name: str, value: int = 1, **tags: str | float | bool | None):
-    # No need to catch exceptions here, add_background_task wraps coroutines in try/catch
-    add_background_task(Metric(name=name, counter=value, tags={k: v for k, v in tags.items() if v is not None}).send())
+    metrics_aggregator.increment(name, value, {k: v for k, v in tags.items() if v is not None})
 
 
 def send_gauge(name: str, value: float, timestamp: float | None = None, **tags: str | float | bool | None):
-    add_background_task(
-        Metric(
-            name=name,
-            gauge=value,
-            timestamp=timestamp or time.time(),
-            tags={k: v for k, v in tags.items() if v is not None},
-        ).send(),
-    )
+    """Records the current value of a quantity, e.g. a pool size or a queue depth"""
+    # Only the last value is kept so the timestamp of individual values is not used
+    metrics_aggregator.set_gauge(name, value, {k: v for k, v in tags.items() if v is not None})
+
+
+def send_duration(name: str, seconds: float, **tags: str | float | bool | None):
+    """Records a duration in seconds, aggregated in a histogram"""
+    metrics_aggregator.observe(name, seconds, {k: v for k, v in tags.items() if v is not None})
 
 
 @contextmanager
@@ -56,4 +262,4 @@ def measure_time(name: str, **tags: str | float | bool | None):
     try:
         yield
     finally:
-        send_gauge(name, time.time() - start, timestamp=start, **tags)
+        send_duration(name, time.time() - start, **tags)
@@ -0,0 +1,113 @@
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from core.domain.metrics import Metric, MetricsAggregator
+
+
+@pytest.fixture
+def sent_metrics() -> Iterator[list[Metric]]:
+    sent: list[Metric] = []
+
+    async def _sender(metric: Metric):
+        sent.append(metric)
+
+    with patch.object(Metric, "sender", _sender):
+        yield sent
+
+
+class TestMetricsAggregator:
+    def test_counters_are_aggregated_by_name_and_tags(self):
+        aggregator = MetricsAggregator()
+        aggregator.increment("requests", 1, {"provider": "openai", "success": True})
+        aggregator.increment("requests", 2, {"success": True, "provider": "openai"})
+        aggregator.increment("requests", 1, {"provider": "anthropic", "success": False})
+
+        assert aggregator.render_prometheus() == (
+            "# TYPE requests_total counter\n"
+            'requests_total{provider="openai",success="true"} 3\n'
+            'requests_total{provider="anthropic",success="false"} 1\n'
+        )
+
+    def test_durations_are_rendered_as_histograms(self):
+        aggregator = MetricsAggregator()
+        aggregator.observe("job.duration", 0.2, {})
+        aggregator.observe("job.duration", 0.3, {})
+        aggregator.observe("job.duration", 1000, {})
+
+        rendered = aggregator.render_prometheus()
+        assert "# TYPE job_duration histogram\n" in rendered
+        assert 'job_duration_bucket{le="0.1"} 0\n' in rendered
+        assert 'job_duration_bucket{le="0.25"} 1\n' in rendered
+        assert 'job_duration_bucket{le="0.5"} 2\n' in rendered
+        assert 'job_duration_bucket{le="300.0"} 2\n' in rendered
+        assert 'job_duration_bucket{le="+Inf"} 3\n' in rendered
+        assert "job_duration_count 3\n" in rendered
+        assert "job_duration_sum 1000.5\n" in rendered
+
+    def test_gauges_keep_the_last_value(self):
+        aggregator = MetricsAggregator()
+        aggregator.set_gauge("pool.size", 10, {"pool": "main"})
+        aggregator.set_gauge("pool.size", 4, {"pool": "main"})
+        aggregator.set_gauge("hit_ratio", 0.5, {})
+
+        assert aggregator.render_prometheus() == (
+            '# TYPE hit_ratio gauge\nhit_ratio 0.5\n# TYPE pool_size gauge\npool_size{pool="main"} 4\n'
+        )
+
+    def test_unbounded_labels_are_not_aggregated(self):
+        aggregator = MetricsAggregator()
+        aggregator.increment("inferences", 1, {"provider": "openai", "tenant": "a"})
+        aggregator.increment("inferences", 1, {"provider": "openai", "tenant": "b"})
+
+        assert aggregator.render_prometheus() == (
+            '# TYPE inferences_total counter\ninferences_total{provider="openai"} 2\n'
+        )
+
+    def test_series_are_capped(self):
+        aggregator = MetricsAggregator(max_series=2)
+        aggregator.increment("requests", 1, {"provider": "openai"})
+        aggregator.set_gauge("size", 1, {})
+        aggregator.increment("requests", 1, {"provider": "anthropic"})
+        aggregator.observe("duration", 1, {})
+        # Existing series are still updated
+        aggregator.increment("requests", 1, {"provider": "openai"})
+
+        assert aggregator.render_prometheus() == (
+            '# TYPE requests_total counter\nrequests_total{provider="openai"} 2\n# TYPE size gauge\nsize 1\n'
+        )
+
+    def test_label_values_are_escaped(self):
+        aggregator = MetricsAggregator()
+        aggregator.increment("errors", 1, {"error": 'invalid "json"\n'})
+        assert 'errors_total{error="invalid \\"json\\"\\n"} 1' in aggregator.render_prometheus()
+
+    async def test_nothing_is_pending_without_sender(self):
+        aggregator = MetricsAggregator()
+        aggregator.increment("requests", 1, {})
+        aggregator.observe("duration", 1, {})
+        assert aggregator._pending_metrics() == []  # pyright: ignore[reportPrivateUsage]
+
+    async def test_flush(self, sent_metrics: list[Metric]):
+        aggregator = MetricsAggregator(flush_interval_seconds=3600)
+        aggregator.increment("requests", 1, {"provider": "openai"})
+        aggregator.increment("requests", 1, {"provider": "openai"})
+        aggregator.set_gauge("size", 1, {})
+        aggregator.set_gauge("size", 3, {})
+        aggregator.observe("duration", 1, {"tenant": "a"})
+        aggregator.observe("duration", 2, {"tenant": "a"})
+
+        await aggregator.close()
+
+        # Unbounded labels are kept in the sent metrics
+        assert [(m.name, m.counter, m.gauge, m.tags) for m in sent_metrics] == [
+            ("requests", 2, None, {"provider": "openai"}),
+            ("size", None, 3, {}),
+            ("duration", None, 1.5, {"tenant": "a"}),
+        ]
+
+        # Only values recorded after the flush are sent
+        sent_metrics.clear()
+        await aggregator.flush()
+        assert sent_metrics == []
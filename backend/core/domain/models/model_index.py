@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from enum import IntFlag, auto
+from functools import cache
+from typing import Self
+
+from core.domain.exceptions import ProviderDoesNotSupportModelError
+from core.domain.models import Model, Provider
+from core.domain.models.model_data import DeprecatedModel, FinalModelData, LatestModel, ModelDataMapping
+from core.domain.models.model_data_supports import ModelDataSupports
+from core.domain.models.model_provider_data import ModelProviderData
+from core.domain.typology import IOTypology
+
+
+class ModelCapability(IntFlag):
+    NONE = 0
+    TOOLS = auto()
+    PARALLEL_TOOL_CALLS = auto()
+    STRUCTURED_OUTPUT = auto()
+    JSON_MODE = auto()
+    INPUT_IMAGE = auto()
+    INPUT_PDF = auto()
+    INPUT_AUDIO = auto()
+    OUTPUT_IMAGE = auto()
+    OUTPUT_TEXT = auto()
+    REASONING = auto()
+    # Not set for models that only accept audio inputs
+    NON_AUDIO_INPUT = auto()
+
+    @classmethod
+    def from_supports(cls, supports: ModelDataSupports, reasoning: bool = False) -> "ModelCapability":
+        flags = cls.NONE
+        for flag, supported in (
+            (cls.TOOLS, supports.supports_tool_calling),
+            (cls.PARALLEL_TOOL_CALLS, supports.supports_parallel_tool_calls),
+            (cls.STRUCTURED_OUTPUT, supports.supports_structured_output),
+            (cls.JSON_MODE, supports.supports_json_mode),
+            (cls.INPUT_IMAGE, supports.supports_input_image),
+            (cls.INPUT_PDF, supports.supports_input_pdf),
+            (cls.INPUT_AUDIO, supports.supports_input_audio),
+            (cls.OUTPUT_IMAGE, supports.supports_output_image),
+            (cls.OUTPUT_TEXT, supports.supports_output_text),
+            (cls.REASONING, reasoning),
+            (cls.NON_AUDIO_INPUT, not supports.supports_audio_only),
+        ):
+            if supported:
+                flags |= flag
+        return flags
+
+    @classmethod
+    def required_for(cls, typology: IOTypology) -> "ModelCapability | None":
+        """The capabilities a model needs to run a task with the typology, None if no model can run it.
+        Same rules as FinalModelData.is_not_supported_reason"""
+        # Right now we have no model supporting output audio or PDF
+        if typology.output.has_audio or typology.output.has_pdf:
+            return None
+        flags = cls.NONE
+        for flag, required in (
+            (cls.INPUT_IMAGE, typology.input.has_image),
+            (cls.INPUT_PDF, typology.input.has_pdf),
+            (cls.INPUT_AUDIO, typology.input.has_audio),
+            (cls.NON_AUDIO_INPUT, not typology.input.has_audio),
+            (cls.OUTPUT_IMAGE, typology.output.has_image),
+            (cls.OUTPUT_TEXT, typology.output.has_text),
+        ):
+            if required:
+                flags |= flag
+        return flags
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedModel:
+    data: FinalModelData
+    capabilities: ModelCapability
+    # Provider data, in the same order as data.providers
+    provider_datas: dict[Provider, ModelProviderData]
+    # The model data with the provider supports overrides applied
+    provider_model_datas: dict[Provider, FinalModelData]
+
+    @property
+    def model(self) -> Model:
+        return self.data.model
+
+    def supports(self, capabilities: ModelCapability) -> bool:
+        return self.capabilities & capabilities == capabilities
+
+    @classmethod
+    def build(cls, data: FinalModelData) -> Self:
+        capabilities = ModelCapability.from_supports(data, reasoning=data.reasoning is not None)
+        if ModelCapability.INPUT_IMAGE in capabilities:
+            # PDFs can be sent as images
+            capabilities |= ModelCapability.INPUT_PDF
+        if any(provider == Provider.FIREWORKS for provider, _ in data.providers):
+            # Fireworks supports document inlining which makes models without vision "support" images and PDFs
+            capabilities |= ModelCapability.INPUT_IMAGE | ModelCapability.INPUT_PDF
+        return cls(
+            data=data,
+            capabilities=capabilities,
+            provider_datas=dict(data.providers),
+            provider_model_datas={provider: pdata.override(data) for provider, pdata in data.providers},
+        )
+
+
+class ModelIndex:
+    """An immutable index over the model data mapping, built once so that lookups on the hot path
+    do not have to resolve latest / deprecated models or iterate over provider lists"""
+
+    def __init__(self, model_datas: ModelDataMapping):
+        finals = {
+            model: IndexedModel.build(data) for model, data in model_datas.items() if isinstance(data, FinalModelData)
+        }
+
+        self._by_model: dict[Model, IndexedModel] = dict(finals)
+        # Models that are displayed when listing models, in the model enum order
+        listed: list[tuple[Model, IndexedModel]] = []
+        for model in Model:
+            data = model_datas.get(model)
+            match data:
+                case LatestModel():
+                    indexed = finals[data.model]
+                    self._by_model[model] = indexed
+                case DeprecatedModel():
+                    self._by_model[model] = finals[data.replacement_model]
+                    # Deprecated models are not listed
+                    continue
+                case FinalModelData():
+                    indexed = finals[model]
+                case None:
+                    continue
+            if indexed.provider_datas:
+                listed.append((model, indexed))
+        self._listed = tuple(listed)
+
+    def __getitem__(self, model: Model) -> IndexedModel:
+        return self._by_model[model]
+
+    def model_data(self, model: Model) -> FinalModelData:
+        return self._by_model[model].data
+
+    def provider_data(self, provider: Provider, model: Model) -> ModelProviderData:
+        indexed = self._by_model[model]
+        try:
+            return indexed.provider_datas[provider]
+        except KeyError:
+            raise ProviderDoesNotSupportModelError(indexed.model, provider) from None
+
+    def provider_model_data(self, provider: Provider, model: Model) -> FinalModelData:
+        """Returns the model data with the supports overrides of the provider applied"""
+        indexed = self._by_model[model]
+        try:
+            return indexed.provider_model_datas[provider]
+        except KeyError:
+            raise ProviderDoesNotSupportModelError(indexed.model, provider) from None
+
+    def listed_models(self) -> tuple[tuple[Model, IndexedModel], ...]:
+        """The models that are exposed to users, as (model id, resolved model) tuples.
+        Latest models are listed under their own id, deprecated models and models without providers are skipped"""
+        return self._listed
+
+
+@cache
+def model_index() -> ModelIndex:
+    from core.domain.models.model_data_mapping import MODEL_DATAS
+
+    return ModelIndex(MODEL_DATAS)
@@ -0,0 +1,69 @@
+import pytest
+
+from core.domain.exceptions import ProviderDoesNotSupportModelError
+from core.domain.models import Model, Provider
+from core.domain.models.model_data import DeprecatedModel, FinalModelData, LatestModel
+from core.domain.models.model_data_mapping import MODEL_DATAS
+from core.domain.models.model_index import ModelCapability, model_index
+from core.domain.typology import IOTypology, Typology
+
+
+class TestModelIndex:
+    @pytest.mark.parametrize("model", list(Model))
+    def test_model_data_resolves_indirections(self, model: Model):
+        data = MODEL_DATAS[model]
+        match data:
+            case LatestModel():
+                expected = MODEL_DATAS[data.model]
+            case DeprecatedModel():
+                expected = MODEL_DATAS[data.replacement_model]
+            case FinalModelData():
+                expected = data
+
+        assert model_index().model_data(model) is expected
+
+    def test_listed_models(self):
+        listed = [model for model, _ in model_index().listed_models()]
+        assert listed, "sanity"
+        assert not any(isinstance(MODEL_DATAS[m], DeprecatedModel) for m in listed)
+        assert all(indexed.provider_datas for _, indexed in model_index().listed_models())
+        # Listed in the model enum order
+        assert listed == [m for m in Model if m in set(listed)]
+
+    def test_provider_data(self):
+        data = model_index().model_data(Model.GPT_4O_2024_11_20)
+        for provider, provider_data in data.providers:
+            assert model_index().provider_data(provider, Model.GPT_4O_2024_11_20) is provider_data
+
+    def test_provider_data_not_supported(self):
+        with pytest.raises(ProviderDoesNotSupportModelError):
+            model_index().provider_data(Provider.GROQ, Model.GPT_4O_2024_11_20)
+
+    def test_provider_model_data_applies_overrides(self):
+        for model, indexed in model_index().listed_models():
+            for provider, provider_data in indexed.data.providers:
+                assert model_index().provider_model_data(provider, model) == provider_data.override(indexed.data)
+
+    def test_capabilities(self):
+        indexed = model_index()[Model.GPT_4O_2024_11_20]
+        assert ModelCapability.TOOLS in indexed.capabilities
+        assert ModelCapability.INPUT_IMAGE in indexed.capabilities
+        assert ModelCapability.INPUT_AUDIO not in indexed.capabilities
+
+    @pytest.mark.parametrize(
+        "typology",
+        [
+            pytest.param(IOTypology(input=Typology()), id="text"),
+            pytest.param(IOTypology(input=Typology(has_image=True)), id="input image"),
+            pytest.param(IOTypology(input=Typology(has_pdf=True)), id="input pdf"),
+            pytest.param(IOTypology(input=Typology(has_audio=True)), id="input audio"),
+            pytest.param(IOTypology(input=Typology(), output=Typology(has_image=True)), id="output image"),
+            pytest.param(IOTypology(input=Typology(), output=Typology(has_text=False)), id="data output"),
+            pytest.param(IOTypology(input=Typology(), output=Typology(has_audio=True)), id="output audio"),
+        ],
+    )
+    def test_supports_matches_is_not_supported_reason(self, typology: IOTypology):
+        required = ModelCapability.required_for(typology)
+        for model, indexed in model_index().listed_models():
+            supported = required is not None and indexed.supports(required)
+            assert supported == (indexed.data.is_not_supported_reason(typology) is None), model
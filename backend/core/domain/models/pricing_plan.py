@@ -0,0 +1,194 @@
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache
+from typing import NamedTuple, Self
+
+from structlog import get_logger
+
+from core.domain.exceptions import UnpriceableRunError
+from core.domain.models import Model, Provider
+from core.domain.models.model_index import model_index
+from core.domain.models.model_provider_data import (
+    AudioPricePerSecond,
+    AudioPricePerToken,
+    ImageFixedPrice,
+    ModelProviderData,
+    TextPricePerToken,
+)
+
+_log = get_logger(__name__)
+
+
+class PricingUsage(NamedTuple):
+    """The usage numbers needed to compute the cost of a completion"""
+
+    # Total number of tokens in the prompt, used to select thresholded prices
+    context_token_count: float
+    prompt_text_token_count: float | None
+    prompt_token_count_cached: float | None = None
+    completion_token_count: float | None = None
+    prompt_image_count: int | None = None
+    prompt_audio_token_count: float | None = None
+    prompt_audio_duration_seconds: float | None = None
+    completion_image_count: int | None = None
+
+
+def _threshold[T](thresholded_prices: list[T] | None) -> T | None:
+    # We know for sure that there is only one thresholded price
+    return thresholded_prices[0] if thresholded_prices else None
+
+
+@dataclass(frozen=True, slots=True)
+class PricingPlan:
+    """The prices of a model at a provider, flattened from the ModelProviderData so that computing
+    the cost of a completion does not involve any lookup or price type check.
+
+    Models without thresholded prices have an infinite threshold."""
+
+    prompt_cost_per_token: float
+    completion_cost_per_token: float
+    prompt_cached_tokens_discount: float
+    text_threshold: float
+    prompt_cost_per_token_over_threshold: float
+    completion_cost_per_token_over_threshold: float
+
+    # None when images are not priced
+    cost_per_image: float | None
+    image_threshold: float
+    cost_per_image_over_threshold: float
+
+    # At most one of the audio costs is set
+    audio_cost_per_token: float | None
+    audio_cost_per_second: float | None
+    audio_threshold: float
+    audio_cost_per_second_over_threshold: float
+
+    cost_per_output_image: float | None
+
+    @classmethod
+    def build(cls, data: ModelProviderData) -> Self:
+        if type(data.text_price) is not TextPricePerToken:
+            raise ValueError(f"Unknown text price type {type(data.text_price)}")
+        text_price = data.text_price
+        text_threshold = _threshold(text_price.thresholded_prices)
+
+        image_price = data.image_price
+        if image_price is not None and type(image_price) is not ImageFixedPrice:
+            raise ValueError(f"Unknown image price type {type(image_price)}")
+        image_threshold = _threshold(image_price.thresholded_prices) if image_price else None
+
+        audio_cost_per_token = audio_cost_per_second = None
+        audio_threshold = None
+        match data.audio_price:
+            case None:
+                pass
+            case AudioPricePerToken() as audio_price:
+                audio_cost_per_token = audio_price.audio_input_cost_per_token
+            case AudioPricePerSecond() as audio_price:
+                audio_cost_per_second = audio_price.cost_per_second
+                audio_threshold = _threshold(audio_price.thresholded_prices)
+
+        return cls(
+            prompt_cost_per_token=text_price.prompt_cost_per_token,
+            completion_cost_per_token=text_price.completion_cost_per_token,
+            prompt_cached_tokens_discount=text_price.prompt_cached_tokens_discount,
+            text_threshold=text_threshold.threshold if text_threshold else math.inf,
+            prompt_cost_per_token_over_threshold=text_threshold.prompt_cost_per_token_over_threshold
+            if text_threshold
+            else text_price.prompt_cost_per_token,
+            completion_cost_per_token_over_threshold=text_threshold.completion_cost_per_token_over_threshold
+            if text_threshold
+            else text_price.completion_cost_per_token,
+            cost_per_image=image_price.cost_per_image if image_price else None,
+            image_threshold=image_threshold.threshold if image_threshold else math.inf,
+            cost_per_image_over_threshold=image_threshold.cost_per_image_over_threshold if image_threshold else 0,
+            audio_cost_per_token=audio_cost_per_token,
+            audio_cost_per_second=audio_cost_per_second,
+            audio_threshold=audio_threshold.threshold if audio_threshold else math.inf,
+            audio_cost_per_second_over_threshold=audio_threshold.cost_per_second_over_threshold
+            if audio_threshold
+            else 0,
+            cost_per_output_image=data.image_output_price.cost_per_image if data.image_output_price else None,
+        )
+
+    def _text_costs(self, usage: PricingUsage) -> tuple[float, float]:
+        if usage.context_token_count > self.text_threshold:
+            prompt_cost_per_token = self.prompt_cost_per_token_over_threshold
+            completion_cost_per_token = self.completion_cost_per_token_over_threshold
+        else:
+            prompt_cost_per_token = self.prompt_cost_per_token
+            completion_cost_per_token = self.completion_cost_per_token
+
+        prompt_text_token_count = usage.prompt_text_token_count
+        # Apply discout for cached tokens
+        if cached := usage.prompt_token_count_cached:
+            cached_tokens_discount = self.prompt_cached_tokens_discount
+            if cached_tokens_discount == 0.0:
+                _log.warning(
+                    "Cached tokens discount is 0.0 for model while there are cached tokens. Please review pricing config!",
+                )
+            prompt_cost_usd = (
+                (prompt_text_token_count - cached) * prompt_cost_per_token
+                + (cached * (1 - cached_tokens_discount) * prompt_cost_per_token)
+                if prompt_text_token_count
+                else 0
+            )
+        else:
+            prompt_cost_usd = prompt_text_token_count * prompt_cost_per_token if prompt_text_token_count else 0
+
+        completion_token_count = usage.completion_token_count
+        completion_cost_usd = completion_token_count * completion_cost_per_token if completion_token_count else 0
+        return prompt_cost_usd, completion_cost_usd
+
+    def _image_cost(self, usage: PricingUsage) -> float:
+        if self.cost_per_image is None:
+            return 0
+        if usage.prompt_image_count is None:
+            _log.warning("Prompt image count is None while calculating image price")
+            return 0
+        if usage.prompt_image_count <= 0:
+            return 0
+        if usage.context_token_count > self.image_threshold:
+            return usage.prompt_image_count * self.cost_per_image_over_threshold
+        return usage.prompt_image_count * self.cost_per_image
+
+    def _audio_cost(self, usage: PricingUsage) -> float:
+        if self.audio_cost_per_token is None and self.audio_cost_per_second is None:
+            return 0
+        if usage.prompt_audio_token_count is None:
+            _log.warning("Prompt audio token count is None while calculating audio price")
+            return 0
+        if not usage.prompt_audio_token_count:
+            return 0
+        if self.audio_cost_per_token is not None:
+            return usage.prompt_audio_token_count * self.audio_cost_per_token
+
+        if self.audio_cost_per_second is not None:
+            if not usage.prompt_audio_duration_seconds:
+                raise UnpriceableRunError("Prompt audio duration seconds is None while calculating audio price")
+            if usage.context_token_count > self.audio_threshold:
+                return usage.prompt_audio_duration_seconds * self.audio_cost_per_second_over_threshold
+            return usage.prompt_audio_duration_seconds * self.audio_cost_per_second
+        return 0
+
+    def costs(self, usage: PricingUsage) -> tuple[float, float]:
+        """Returns the prompt and completion costs in USD"""
+        prompt_cost_usd, completion_cost_usd = self._text_costs(usage)
+        prompt_cost_usd += self._image_cost(usage) + self._audio_cost(usage)
+        if self.cost_per_output_image is not None and usage.completion_image_count:
+            completion_cost_usd += self.cost_per_output_image * usage.completion_image_count
+        return prompt_cost_usd, completion_cost_usd
+
+    def costs_batch(self, usages: Iterable[PricingUsage]) -> list[tuple[float, float]]:
+        """Computes the costs of many completions of the same model and provider at once,
+        e.g. when recomputing costs after a price correction"""
+        costs = self.costs
+        return [costs(usage) for usage in usages]
+
+
+@cache
+def pricing_plan(provider: Provider, model: Model) -> PricingPlan:
+    """The pricing plan of a model at a provider, built once from the model provider data.
+    Raises ProviderDoesNotSupportModelError if the provider does not support the model"""
+    return PricingPlan.build(model_index().provider_data(provider, model))
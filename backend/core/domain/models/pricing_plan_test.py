@@ -0,0 +1,133 @@
+import pytest
+
+from core.domain.exceptions import UnpriceableRunError
+from core.domain.models import Model, Provider
+from core.domain.models.model_index import model_index
+from core.domain.models.model_provider_data import (
+    AudioPricePerSecond,
+    AudioPricePerToken,
+    ImageFixedPrice,
+    ModelProviderData,
+    TextPricePerToken,
+    ThresholdedAudioPricePerSecond,
+    ThresholdedImageFixedPrice,
+    ThresholdedTextPricePerToken,
+)
+from core.domain.models.model_provider_data_mapping import MODEL_PROVIDER_DATAS
+from core.domain.models.pricing_plan import PricingPlan, PricingUsage, pricing_plan
+
+
+def _plan(
+    thresholded: bool = False,
+    cached_discount: float = 0.5,
+    image_price: ImageFixedPrice | None = None,
+    image_output_price: ImageFixedPrice | None = None,
+    audio_price: AudioPricePerToken | AudioPricePerSecond | None = None,
+) -> PricingPlan:
+    return PricingPlan.build(
+        ModelProviderData(
+            text_price=TextPricePerToken(
+                source="",
+                prompt_cost_per_token=1,
+                completion_cost_per_token=2,
+                prompt_cached_tokens_discount=cached_discount,
+                thresholded_prices=[
+                    ThresholdedTextPricePerToken(
+                        threshold=100,
+                        prompt_cost_per_token_over_threshold=10,
+                        completion_cost_per_token_over_threshold=20,
+                    ),
+                ]
+                if thresholded
+                else None,
+            ),
+            image_price=image_price,
+            image_output_price=image_output_price,
+            audio_price=audio_price,
+        ),
+    )
+
+
+class TestPricingPlan:
+    def test_text(self):
+        plan = _plan(thresholded=True)
+        usage = PricingUsage(context_token_count=50, prompt_text_token_count=50, completion_token_count=10)
+        assert plan.costs(usage) == (50, 20)
+        assert plan.costs(usage._replace(context_token_count=150)) == (500, 200)
+
+    def test_no_tokens(self):
+        assert _plan().costs(PricingUsage(context_token_count=0, prompt_text_token_count=None)) == (0, 0)
+
+    def test_cached_tokens(self):
+        usage = PricingUsage(
+            context_token_count=50,
+            prompt_text_token_count=50,
+            prompt_token_count_cached=20,
+            completion_token_count=10,
+        )
+        assert _plan(cached_discount=0.5).costs(usage) == (30 + 10, 20)
+
+    def test_images(self):
+        plan = _plan(
+            image_price=ImageFixedPrice(
+                cost_per_image=100,
+                thresholded_prices=[ThresholdedImageFixedPrice(threshold=100, cost_per_image_over_threshold=1000)],
+            ),
+            image_output_price=ImageFixedPrice(cost_per_image=7),
+        )
+        usage = PricingUsage(
+            context_token_count=50,
+            prompt_text_token_count=50,
+            prompt_image_count=2,
+            completion_image_count=3,
+        )
+        assert plan.costs(usage) == (50 + 200, 21)
+        assert plan.costs(usage._replace(context_token_count=150)) == (50 + 2000, 21)
+        # Missing image count is logged and not priced
+        assert plan.costs(usage._replace(prompt_image_count=None)) == (50, 21)
+
+    def test_audio_per_token(self):
+        plan = _plan(audio_price=AudioPricePerToken(audio_input_cost_per_token=3))
+        usage = PricingUsage(context_token_count=50, prompt_text_token_count=50, prompt_audio_token_count=10)
+        assert plan.costs(usage) == (50 + 30, 0)
+
+    def test_audio_per_second(self):
+        plan = _plan(
+            audio_price=AudioPricePerSecond(
+                cost_per_second=5,
+                thresholded_prices=[ThresholdedAudioPricePerSecond(threshold=100, cost_per_second_over_threshold=50)],
+            ),
+        )
+        usage = PricingUsage(
+            context_token_count=50,
+            prompt_text_token_count=50,
+            prompt_audio_token_count=10,
+            prompt_audio_duration_seconds=4,
+        )
+        assert plan.costs(usage) == (50 + 20, 0)
+        assert plan.costs(usage._replace(context_token_count=150)) == (50 + 200, 0)
+
+        with pytest.raises(UnpriceableRunError):
+            _ = plan.costs(usage._replace(prompt_audio_duration_seconds=None))
+
+    def test_costs_batch(self):
+        plan = _plan(thresholded=True)
+        usages = [
+            PricingUsage(context_token_count=count, prompt_text_token_count=count, completion_token_count=1)
+            for count in range(0, 300, 7)
+        ]
+        assert plan.costs_batch(usages) == [plan.costs(usage) for usage in usages]
+
+
+class TestPricingPlanForModel:
+    def test_all_plans_build(self):
+        for provider, datas in MODEL_PROVIDER_DATAS.items():
+            for model in datas:
+                assert isinstance(pricing_plan(provider, model), PricingPlan)
+
+    def test_plan_is_cached(self):
+        plan = pricing_plan(Provider.OPEN_AI, Model.GPT_4O_2024_11_20)
+        assert pricing_plan(Provider.OPEN_AI, Model.GPT_4O_2024_11_20) is plan
+
+        data = model_index().provider_data(Provider.OPEN_AI, Model.GPT_4O_2024_11_20)
+        assert plan.prompt_cost_per_token == data.text_price.prompt_cost_per_token
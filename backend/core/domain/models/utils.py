@@ -4,17 +4,16 @@ from core.domain.models import Model, Provider
 from core.domain.models.model_provider_data import ModelProviderData
 from core.domain.models.model_provider_data_mapping import MODEL_PROVIDER_DATAS, ProviderDataByModel
 
-from .model_data import DeprecatedModel, FinalModelData, LatestModel
-from .model_data_mapping import MODEL_DATAS
+from .model_data import FinalModelData
+from .model_index import IndexedModel, model_index
 
 
 def get_model_data(model: Model) -> FinalModelData:
-    model_data = MODEL_DATAS[model]
-    if isinstance(model_data, LatestModel):
-        return MODEL_DATAS[model_data.model]  # pyright: ignore [reportReturnType]
-    if isinstance(model_data, DeprecatedModel):
-        return MODEL_DATAS[model_data.replacement_model]  # pyright: ignore [reportReturnType]
-    return model_data
+    return model_index().model_data(model)
+
+
+def get_indexed_model(model: Model) -> IndexedModel:
+    return model_index()[model]
 
 
 def get_provider_data_by_model(provider: Provider) -> ProviderDataByModel:
@@ -22,7 +21,7 @@ def get_provider_data_by_model(provider: Provider) -> ProviderDataByModel:
 
 
 def get_model_provider_data(provider: Provider, model: Model) -> ModelProviderData:
-    return get_model_data(model).provider_data(provider)
+    return model_index().provider_data(provider, model)
 
 
 # TODO: this is deprecated, do not use
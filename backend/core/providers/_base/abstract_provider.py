@@ -17,14 +17,8 @@ from core.domain.message import Message
 from core.domain.metrics import send_counter, send_gauge
 from core.domain.models import Model, Provider
 from core.domain.models.model_data import ModelData
-from core.domain.models.model_provider_data import (
-    AudioPricePerSecond,
-    AudioPricePerToken,
-    ImageFixedPrice,
-    ModelProviderData,
-    TextPricePerToken,
-)
 from core.domain.models.model_provider_data_mapping import MODEL_PROVIDER_DATAS
+from core.domain.models.pricing_plan import PricingUsage, pricing_plan
 from core.domain.models.utils import get_model_data, get_model_provider_data
 from core.domain.tool import Tool
 from core.providers._base.builder_context import builder_context
@@ -187,15 +181,17 @@ class AbstractProvider[ProviderConfigVar: ProviderConfigInterface, ProviderReque
     def get_model_provider_data(self, model: Model):
         return get_model_provider_data(self.name(), model)
 
-    def _calculate_image_output_cost(
-        self,
-        model_provider_data: ModelProviderData,
-        llm_usage: LLMUsage,
-    ) -> float | None:
-        if not model_provider_data.image_output_price or not llm_usage.completion_image_count:
-            return None
-
-        return model_provider_data.image_output_price.cost_per_image * llm_usage.completion_image_count
+    def _pricing_usage(self, model: Model, llm_usage: LLMUsage) -> PricingUsage:
+        return PricingUsage(
+            context_token_count=self._get_context_token_count(llm_usage, model),
+            prompt_text_token_count=self._get_prompt_text_token_count(llm_usage),
+            prompt_token_count_cached=llm_usage.prompt_token_count_cached,
+            completion_token_count=llm_usage.completion_token_count,
+            prompt_image_count=llm_usage.prompt_image_count,
+            prompt_audio_token_count=llm_usage.prompt_audio_token_count,
+            prompt_audio_duration_seconds=llm_usage.prompt_audio_duration_seconds,
+            completion_image_count=llm_usage.completion_image_count,
+        )
 
     async def _compute_llm_completion_cost(
         self,
@@ -209,31 +205,9 @@ class AbstractProvider[ProviderConfigVar: ProviderConfigInterface, ProviderReque
             return
 
         # These functions are on the run critical path so they should be very fast
-        # And not error prone
-        model_provider_data = self.get_model_provider_data(model)
-        context_token_count = self._get_context_token_count(llm_usage, model)
-
-        llm_usage.prompt_cost_usd, llm_usage.completion_cost_usd = self._calculate_text_price(
-            model_provider_data,
-            llm_usage,
-            context_token_count,
-        )
-
-        prompt_image_cost_usd = self._calculate_image_price(
-            model_provider_data,
-            llm_usage,
-            context_token_count,
-        )
-
-        prompt_audio_cost_usd = self._calculate_audio_price(
-            model_provider_data,
-            llm_usage,
-            context_token_count,
-        )
-
-        llm_usage.prompt_cost_usd += prompt_image_cost_usd + prompt_audio_cost_usd
-        if image_output_cost_usd := self._calculate_image_output_cost(model_provider_data, llm_usage):
-            llm_usage.completion_cost_usd += image_output_cost_usd
+        # And not error prone. Prices are resolved once per provider and model
+        plan = pricing_plan(self.name(), model)
+        llm_usage.prompt_cost_usd, llm_usage.completion_cost_usd = plan.costs(self._pricing_usage(model, llm_usage))
 
     async def compute_llm_completion_usage(
         self,
@@ -264,118 +238,6 @@ class AbstractProvider[ProviderConfigVar: ProviderConfigInterface, ProviderReque
     def _get_prompt_text_token_count(self, llm_usage: LLMUsage):
         return llm_usage.prompt_token_count
 
-    def _calculate_text_price(
-        self,
-        model_provider_data: ModelProviderData,
-        llm_usage: LLMUsage,
-        context_token_count: float,
-    ) -> tuple[float, float]:
-        if type(model_provider_data.text_price) is TextPricePerToken:
-            prompt_cost_per_token = model_provider_data.text_price.prompt_cost_per_token
-            completion_cost_per_token = model_provider_data.text_price.completion_cost_per_token
-            prompt_text_token_count = self._get_prompt_text_token_count(llm_usage)
-
-            if model_provider_data.text_price.thresholded_prices:
-                # We know for sure that there is only one thresholded price
-                thresholded_price = model_provider_data.text_price.thresholded_prices[0]
-
-                if context_token_count > thresholded_price.threshold:
-                    prompt_cost_per_token = thresholded_price.prompt_cost_per_token_over_threshold
-                    completion_cost_per_token = thresholded_price.completion_cost_per_token_over_threshold
-
-            # Apply discout for cached tokens
-            if llm_usage.prompt_token_count_cached:
-                cached_tokens_discount = model_provider_data.text_price.prompt_cached_tokens_discount
-
-                if cached_tokens_discount == 0.0:
-                    self.logger.warning(
-                        "Cached tokens discount is 0.0 for model while there are cached tokens. Please review pricing config!",
-                    )
-                prompt_cost_usd = (
-                    (prompt_text_token_count - llm_usage.prompt_token_count_cached) * prompt_cost_per_token
-                    + (llm_usage.prompt_token_count_cached * (1 - cached_tokens_discount) * prompt_cost_per_token)
-                    if prompt_text_token_count
-                    else 0
-                )
-            else:
-                prompt_cost_usd = prompt_text_token_count * prompt_cost_per_token if prompt_text_token_count else 0
-
-            completion_cost_usd = (
-                llm_usage.completion_token_count * completion_cost_per_token if llm_usage.completion_token_count else 0
-            )
-            return prompt_cost_usd, completion_cost_usd
-
-        raise Exception(f"Unknown text price type {type(model_provider_data.text_price)}")
-
-    def _calculate_image_price(
-        self,
-        model_provider_data: ModelProviderData,
-        llm_usage: LLMUsage,
-        context_token_count: float,
-    ) -> float:
-        if not model_provider_data.image_price:
-            return 0
-
-        prompt_image_cost_usd = 0
-
-        if llm_usage.prompt_image_count is None:
-            self.logger.warning("Prompt image count is None while calculating image price")
-            return prompt_image_cost_usd
-
-        if llm_usage.prompt_image_count > 0:
-            if not model_provider_data.image_price:
-                self.logger.debug("Model has no per image price, skipping image cost")
-                return 0
-
-            image_price = model_provider_data.image_price.cost_per_image
-
-            if type(model_provider_data.image_price) is ImageFixedPrice:
-                if model_provider_data.image_price.thresholded_prices:
-                    # We know for sure that there is only one thresholded price
-                    thresholded_price = model_provider_data.image_price.thresholded_prices[0]
-
-                    if context_token_count > thresholded_price.threshold:
-                        image_price = thresholded_price.cost_per_image_over_threshold
-
-                prompt_image_cost_usd = llm_usage.prompt_image_count * image_price
-            else:
-                raise Exception(f"Unknown image price type {type(image_price)}")
-
-        return prompt_image_cost_usd
-
-    def _calculate_audio_price(
-        self,
-        model_provider_data: ModelProviderData,
-        llm_usage: LLMUsage,
-        context_token_count: float,
-    ) -> float:
-        if not model_provider_data.audio_price:
-            return 0
-
-        if llm_usage.prompt_audio_token_count is None:
-            self.logger.warning("Prompt audio token count is None while calculating audio price")
-            return 0
-
-        if not llm_usage.prompt_audio_token_count:
-            return 0
-
-        if type(model_provider_data.audio_price) is AudioPricePerToken:
-            return llm_usage.prompt_audio_token_count * model_provider_data.audio_price.audio_input_cost_per_token
-
-        if type(model_provider_data.audio_price) is AudioPricePerSecond:
-            if not llm_usage.prompt_audio_duration_seconds:
-                raise UnpriceableRunError("Prompt audio duration seconds is None while calculating audio price")
-
-            audio_price = model_provider_data.audio_price.cost_per_second
-            if model_provider_data.audio_price.thresholded_prices:
-                thresholded_price = model_provider_data.audio_price.thresholded_prices[0]
-
-                if context_token_count > thresholded_price.threshold:
-                    audio_price = thresholded_price.cost_per_second_over_threshold
-            return llm_usage.prompt_audio_duration_seconds * audio_price
-
-        raise UnpriceableRunError(f"Unknown audio price type {type(model_provider_data.audio_price)}")
-
     @classmethod
     def error_incurs_cost(cls, error: ProviderError) -> bool | None:
         if not error.provider_status_code:
@@ -2,14 +2,15 @@ from typing import Annotated
 
 from pydantic import Field
 
-from core.providers.amazon_bedrock.amazon_bedrock_provider import AmazonBedrockConfig
-from core.providers.anthropic.anthropic_provider import AnthropicConfig
-from core.providers.google.gemini.gemini_api_provider import GoogleGeminiAPIProviderConfig
-from core.providers.google.google_provider import GoogleProviderConfig
-from core.providers.groq.groq_provider import GroqConfig
-from core.providers.mistral.mistral_provider import MistralAIConfig
-from core.providers.openai.azure_open_ai_provider.azure_openai_provider import AzureOpenAIConfig
-from core.providers.openai.openai_provider import OpenAIConfig
+# Only importing config modules here, provider modules are imported lazily by the provider factory
+from core.providers.amazon_bedrock.amazon_bedrock_config import AmazonBedrockConfig
+from core.providers.anthropic.anthropic_config import AnthropicConfig
+from core.providers.google.gemini.gemini_api_config import GoogleGeminiAPIProviderConfig
+from core.providers.google.google_provider_config import GoogleProviderConfig
+from core.providers.groq.groq_config import GroqConfig
+from core.providers.mistral.mistral_config import MistralAIConfig
+from core.providers.openai.azure_open_ai_provider.azure_openai_config import AzureOpenAIConfig
+from core.providers.openai.openai_config import OpenAIConfig
 
 ProviderConfig = Annotated[
     GroqConfig
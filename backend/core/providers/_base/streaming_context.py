@@ -2,41 +2,48 @@ import json
 from collections.abc import Callable
 from typing import NamedTuple
 
-from pydantic import BaseModel, Field
-
 from core.domain.finish_reason import FinishReason
 from core.domain.tool_call import ToolCallRequest
 from core.providers._base.llm_usage import LLMUsage
 from core.providers._base.models import RawCompletion
 from core.providers._base.provider_error import FailedGenerationError, InvalidGenerationError, MaxTokensExceededError
 from core.runners.runner_output import RunnerOutput, RunnerOutputChunk, ToolCallRequestDelta
+from core.utils.json_utils import JSONPrefixValidator
 
 
-class _ToolCallRequestBuffer(BaseModel):
-    id: str | None = None
-    idx: int
-    tool_name: str | None = None
-    tool_input: list[str] = Field(default_factory=list)
+class _ToolCallRequestBuffer:
+    __slots__ = ("id", "idx", "tool_input", "tool_name", "validator")
 
-    def should_handle_delta(self, delta: ToolCallRequestDelta) -> bool:
-        if delta.idx is not None:
-            return delta.idx == self.idx
-        if delta.id:
-            return delta.id == self.id
-        if delta.tool_name:
-            return delta.tool_name == self.tool_name
-        return True
+    def __init__(self, id: str | None, idx: int, tool_name: str | None):
+        self.id = id
+        self.idx = idx
+        self.tool_name = tool_name
+        self.tool_input: list[str] = []
+        # Checking the arguments as they are streamed so that malformed arguments are detected early
+        self.validator = JSONPrefixValidator()
 
     def add_delta(self, delta: ToolCallRequestDelta):
         self.tool_input.append(delta.arguments)
+        if not self.validator.feed(delta.arguments):
+            raise self._invalid_arguments_error("".join(self.tool_input))
 
     @classmethod
     def from_delta(cls, delta: ToolCallRequestDelta, default_idx: int):
-        return cls(
+        buffer = cls(
             id=delta.id,
-            idx=delta.idx or default_idx,
+            idx=delta.idx if delta.idx is not None else default_idx,
             tool_name=delta.tool_name,
-            tool_input=[delta.arguments],
+        )
+        buffer.add_delta(delta)
+        return buffer
+
+    def _invalid_arguments_error(self, arguments: str):
+        return InvalidGenerationError(
+            msg="Model returned a tool call with unparseable arguments",
+            capture=True,
+            extras={
+                "arguments": arguments,
+            },
         )
 
     def to_tool_call(self) -> ToolCallRequest:
@@ -44,13 +51,7 @@ class _ToolCallRequestBuffer(BaseModel):
         try:
             input_dict = json.loads(_final_input) if _final_input else {}
         except json.JSONDecodeError as e:
-            raise InvalidGenerationError(
-                msg="Model returned a tool call with unparseable arguments",
-                capture=True,
-                extras={
-                    "arguments": _final_input,
-                },
-            ) from e
+            raise self._invalid_arguments_error(_final_input) from e
         return ToolCallRequest(
             index=self.idx,
             id=self.id or "",
@@ -72,7 +73,6 @@ class ParsedResponse(NamedTuple):
         return all(v is None for v in self)
 
 
-# TODO: add tests
 class StreamingContext:
     def __init__(self, raw_completion: RawCompletion):
         # self.streamer = JSONStreamParser() if json else RawStreamParser()
@@ -81,6 +81,9 @@ class StreamingContext:
         self.raw_completion = raw_completion
 
         self._tool_call_buffers: list[_ToolCallRequestBuffer] = []
+        self._tool_call_buffers_by_idx: dict[int, _ToolCallRequestBuffer] = {}
+        self._tool_call_buffers_by_id: dict[str, _ToolCallRequestBuffer] = {}
+        self._tool_call_buffers_by_name: dict[str, _ToolCallRequestBuffer] = {}
         self._last_chunk: ParsedResponse | None = None
 
         self._agg_output: list[str] = []
@@ -95,15 +98,30 @@ class StreamingContext:
     def final_output(self) -> RunnerOutput | None:
         return self._runner_output
 
+    def _find_tool_call_buffer(self, delta: ToolCallRequestDelta) -> _ToolCallRequestBuffer | None:
+        # Some providers match tool calls by index, others by ID or by name so buffers are indexed
+        # by all three. The index holds the last buffer for each key since the tool being updated
+        # is always the last one created with that key
+        if delta.idx is not None:
+            return self._tool_call_buffers_by_idx.get(delta.idx)
+        if delta.id:
+            return self._tool_call_buffers_by_id.get(delta.id)
+        if delta.tool_name:
+            return self._tool_call_buffers_by_name.get(delta.tool_name)
+        return self._tool_call_buffers[-1] if self._tool_call_buffers else None
+
     def _add_tool_call_delta(self, chunk: ToolCallRequestDelta):
-        # We cannot create a map here since some providers match tool calls by ID or by index
-        # Reversed iteration should be somewhat efficient since it is very likely that the tool
-        # being updated is the last one
-        for b in reversed(self._tool_call_buffers):
-            if b.should_handle_delta(chunk):
-                b.add_delta(chunk)
-                return
-        self._tool_call_buffers.append(_ToolCallRequestBuffer.from_delta(chunk, len(self._tool_call_buffers)))
+        if buffer := self._find_tool_call_buffer(chunk):
+            buffer.add_delta(chunk)
+            return
+
+        buffer = _ToolCallRequestBuffer.from_delta(chunk, len(self._tool_call_buffers))
+        self._tool_call_buffers.append(buffer)
+        self._tool_call_buffers_by_idx[buffer.idx] = buffer
+        if buffer.id:
+            self._tool_call_buffers_by_id[buffer.id] = buffer
+        if buffer.tool_name:
+            self._tool_call_buffers_by_name[buffer.tool_name] = buffer
 
     def _tool_calls(self) -> list[ToolCallRequest]:
         return [b.to_tool_call() for b in self._tool_call_buffers]
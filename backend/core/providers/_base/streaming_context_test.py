@@ -0,0 +1,73 @@
+import pytest
+
+from core.domain.tool_call import ToolCallRequest
+from core.providers._base.llm_usage import LLMUsage
+from core.providers._base.models import RawCompletion
+from core.providers._base.provider_error import InvalidGenerationError
+from core.providers._base.streaming_context import ParsedResponse, StreamingContext
+from core.runners.runner_output import RunnerOutput, ToolCallRequestDelta
+
+
+@pytest.fixture
+def context() -> StreamingContext:
+    return StreamingContext(RawCompletion(response=None, usage=LLMUsage()))
+
+
+def _add_tool_calls(context: StreamingContext, *deltas: ToolCallRequestDelta):
+    for delta in deltas:
+        _ = context.add_chunk(ParsedResponse(tool_call_requests=[delta]))
+
+
+def _tool_calls(context: StreamingContext) -> list[ToolCallRequest]:
+    chunk = context.complete(lambda output, reasoning, tool_calls: RunnerOutput(output, tool_calls, reasoning))
+    assert chunk.final_chunk
+    return list(chunk.final_chunk.tool_call_requests or [])
+
+
+class TestToolCallDeltas:
+    def test_match_by_idx(self, context: StreamingContext):
+        _add_tool_calls(
+            context,
+            ToolCallRequestDelta(id="1", idx=0, tool_name="a", arguments='{"x"'),
+            ToolCallRequestDelta(id="2", idx=1, tool_name="b", arguments='{"y": 2}'),
+            ToolCallRequestDelta(id="", idx=0, tool_name="", arguments=": 1}"),
+        )
+        assert _tool_calls(context) == [
+            ToolCallRequest(index=0, id="1", tool_name="a", tool_input_dict={"x": 1}),
+            ToolCallRequest(index=1, id="2", tool_name="b", tool_input_dict={"y": 2}),
+        ]
+
+    def test_explicit_zero_idx_after_other_idx(self, context: StreamingContext):
+        _add_tool_calls(
+            context,
+            ToolCallRequestDelta(id="2", idx=1, tool_name="b", arguments="{}"),
+            ToolCallRequestDelta(id="1", idx=0, tool_name="a", arguments='{"x"'),
+            ToolCallRequestDelta(id="", idx=0, tool_name="", arguments=": 1}"),
+        )
+        assert [(t.index, t.tool_input_dict) for t in _tool_calls(context)] == [(1, {}), (0, {"x": 1})]
+
+    def test_match_by_id_and_name(self, context: StreamingContext):
+        _add_tool_calls(
+            context,
+            ToolCallRequestDelta(id="1", idx=None, tool_name="a", arguments='{"x": '),
+            ToolCallRequestDelta(id="2", idx=None, tool_name="b", arguments='{"y": '),
+            ToolCallRequestDelta(id="1", idx=None, tool_name="", arguments="1}"),
+            ToolCallRequestDelta(id="", idx=None, tool_name="b", arguments="2"),
+            # Deltas without any key go to the last tool call
+            ToolCallRequestDelta(id="", idx=None, tool_name="", arguments="}"),
+        )
+        assert [(t.index, t.id, t.tool_input_dict) for t in _tool_calls(context)] == [
+            (0, "1", {"x": 1}),
+            (1, "2", {"y": 2}),
+        ]
+
+    def test_malformed_arguments_are_detected_early(self, context: StreamingContext):
+        _add_tool_calls(context, ToolCallRequestDelta(id="1", idx=0, tool_name="a", arguments='{"x": 1'))
+        with pytest.raises(InvalidGenerationError) as e:
+            _add_tool_calls(context, ToolCallRequestDelta(id="", idx=0, tool_name="", arguments="]"))
+        assert e.value.extras["extras"] == {"arguments": '{"x": 1]'}
+
+    def test_incomplete_arguments(self, context: StreamingContext):
+        _add_tool_calls(context, ToolCallRequestDelta(id="1", idx=0, tool_name="a", arguments='{"x": 1'))
+        with pytest.raises(InvalidGenerationError):
+            _ = _tool_calls(context)
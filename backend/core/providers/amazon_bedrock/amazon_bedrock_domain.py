@@ -2,6 +2,7 @@
 
 import hashlib
 import re
+from collections.abc import Iterator
 from typing import Annotated, Any, Literal, Self
 
 from pydantic import BaseModel, BeforeValidator, Field, ValidationError
@@ -22,7 +23,7 @@ from core.providers.google.google_provider_domain import (
 from core.runners.runner_output import ToolCallRequestDelta
 from core.utils.dicts import TwoWayDict
 from core.utils.json_utils import safe_extract_dict_from_json
-from core.utils.token_utils import tokens_from_string
+from core.utils.token_utils import tokens_from_strings
 
 AmazonBedrockRole = Literal["system", "user", "assistant"]
 
@@ -161,14 +162,15 @@ class AmazonBedrockMessage(BaseModel):
 
         return cls(content=content, role=role)
 
-    def token_count(self, model: Model) -> int:
-        token_count = 0
+    def texts(self) -> Iterator[str]:
         for block in self.content:
             if block.text:
-                token_count += tokens_from_string(block.text, model)
+                yield block.text
             if block.image:
                 raise UnpriceableRunError("Token counting for images is not implemented")
-        return token_count
+
+    def token_count(self, model: Model) -> int:
+        return tokens_from_strings(self.texts(), model)
 
 
 class AmazonBedrockSystemMessage(BaseModel):
@@ -181,8 +183,11 @@ class AmazonBedrockSystemMessage(BaseModel):
 
         return cls(text=message.content)
 
+    def texts(self) -> Iterator[str]:
+        yield self.text
+
     def token_count(self, model: Model) -> int:
-        return tokens_from_string(self.text, model)
+        return tokens_from_strings(self.texts(), model)
 
 
 class BedrockToolInputSchema(BaseModel):
@@ -37,6 +37,7 @@ from core.providers.amazon_bedrock.amazon_bedrock_domain import (
 from core.providers.google.google_provider_domain import (
     native_tool_name_to_internal,
 )
+from core.utils.token_utils import tokens_from_strings
 
 _log = get_logger(__name__)
 
@@ -271,16 +272,9 @@ class AmazonBedrockProvider(HTTPXProvider[AmazonBedrockConfig, CompletionRespons
         boilerplate_tokens: int = 3
         per_message_boilerplate_tokens: int = 4
 
-        token_count: int = boilerplate_tokens
-
-        for message in messages:
-            token_count += per_message_boilerplate_tokens
-
-            domain_message = message_or_system(message)
-            message_token_count = domain_message.token_count(model)
-            token_count += message_token_count
-
-        return token_count
+        # Counting the tokens of all messages at once
+        texts = [text for message in messages for text in message_or_system(message).texts()]
+        return boilerplate_tokens + per_message_boilerplate_tokens * len(messages) + tokens_from_strings(texts, model)
 
     @override
     async def _compute_prompt_audio_token_count(
@@ -0,0 +1,14 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+from core.domain.models.providers import Provider
+
+
+class AnthropicConfig(BaseModel):
+    provider: Literal[Provider.ANTHROPIC] = Provider.ANTHROPIC
+    api_key: str
+    url: str = "https://api.anthropic.com/v1/messages"
+
+    def __str__(self):
+        return f"AnthropicConfig(url={self.url}, api_key={self.api_key[:4]}****)"
@@ -1,6 +1,6 @@
 import logging
 from collections.abc import AsyncIterator
-from typing import Any, Literal, override
+from typing import Any, override
 
 from httpx import Response
 from pydantic import BaseModel
@@ -23,6 +23,7 @@ from core.providers._base.provider_error import (
 from core.providers._base.provider_options import ProviderOptions
 from core.providers._base.streaming_context import ParsedResponse
 from core.providers._base.utils import get_provider_config_env
+from core.providers.anthropic.anthropic_config import AnthropicConfig
 from core.providers.anthropic.anthropic_domain import (
     AnthropicErrorResponse,
     AnthropicMessage,
@@ -46,15 +47,6 @@ _ANTHROPIC_VERSION: str = "2023-06-01"
 _ANTHROPIC_PDF_BETA: str = "pdfs-2024-09-25"
 
 
-class AnthropicConfig(BaseModel):
-    provider: Literal[Provider.ANTHROPIC] = Provider.ANTHROPIC
-    api_key: str
-    url: str = "https://api.anthropic.com/v1/messages"
-
-    def __str__(self):
-        return f"AnthropicConfig(url={self.url}, api_key={self.api_key[:4]}****)"
-
-
 class AnthropicProvider(HTTPXProvider[AnthropicConfig, CompletionResponse]):
     @classmethod
     def _max_tokens(
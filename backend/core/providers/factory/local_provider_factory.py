@@ -1,4 +1,6 @@
-from collections.abc import Iterable
+import importlib
+from collections.abc import Iterable, Iterator, Mapping
+from functools import cache
 from typing import Any, override
 
 import structlog
@@ -9,55 +11,75 @@ from core.domain.exceptions import (
 from core.domain.models import Provider
 from core.domain.tenant_data import ProviderConfig
 from core.providers._base.abstract_provider import AbstractProvider
-from core.providers.amazon_bedrock.amazon_bedrock_provider import AmazonBedrockProvider
-from core.providers.anthropic.anthropic_provider import AnthropicProvider
 from core.providers.factory.abstract_provider_factory import AbstractProviderFactory
-from core.providers.fireworks.fireworks_provider import FireworksAIProvider
-from core.providers.google.gemini.gemini_api_provider import GoogleGeminiAPIProvider
-from core.providers.google.google_provider import GoogleProvider
-from core.providers.groq.groq_provider import GroqProvider
-from core.providers.mistral.mistral_provider import MistralAIProvider
-from core.providers.openai.azure_open_ai_provider.azure_openai_provider import AzureOpenAIProvider
-from core.providers.openai.openai_provider import OpenAIProvider
-from core.providers.xai.xai_provider import XAIProvider
-
-_provider_cls: list[type[AbstractProvider[Any, Any]]] = [
-    OpenAIProvider,
-    AzureOpenAIProvider,
-    GroqProvider,
-    GoogleProvider,
-    AmazonBedrockProvider,
-    MistralAIProvider,
-    AnthropicProvider,
-    GoogleGeminiAPIProvider,
-    FireworksAIProvider,
-    XAIProvider,
-]
+
+# Provider modules are heavy to import so they are only imported when a provider type is first needed
+_provider_cls_paths: dict[Provider, str] = {
+    Provider.OPEN_AI: "core.providers.openai.openai_provider:OpenAIProvider",
+    Provider.AZURE_OPEN_AI: "core.providers.openai.azure_open_ai_provider.azure_openai_provider:AzureOpenAIProvider",
+    Provider.GROQ: "core.providers.groq.groq_provider:GroqProvider",
+    Provider.GOOGLE: "core.providers.google.google_provider:GoogleProvider",
+    Provider.AMAZON_BEDROCK: "core.providers.amazon_bedrock.amazon_bedrock_provider:AmazonBedrockProvider",
+    Provider.MISTRAL_AI: "core.providers.mistral.mistral_provider:MistralAIProvider",
+    Provider.ANTHROPIC: "core.providers.anthropic.anthropic_provider:AnthropicProvider",
+    Provider.GOOGLE_GEMINI: "core.providers.google.gemini.gemini_api_provider:GoogleGeminiAPIProvider",
+    Provider.FIREWORKS: "core.providers.fireworks.fireworks_provider:FireworksAIProvider",
+    Provider.X_AI: "core.providers.xai.xai_provider:XAIProvider",
+}
+
+
+@cache
+def _import_provider_cls(provider: Provider) -> type[AbstractProvider[Any, Any]]:
+    module_name, cls_name = _provider_cls_paths[provider].split(":")
+    provider_cls: type[AbstractProvider[Any, Any]] = getattr(importlib.import_module(module_name), cls_name)
+    return provider_cls
+
+
+class _LazyProviderTypes(Mapping[Provider, type[AbstractProvider[Any, Any]]]):
+    @override
+    def __getitem__(self, key: Provider) -> type[AbstractProvider[Any, Any]]:
+        if key not in _provider_cls_paths:
+            raise KeyError(key)
+        return _import_provider_cls(key)
+
+    @override
+    def __iter__(self) -> Iterator[Provider]:
+        return iter(_provider_cls_paths)
+
+    @override
+    def __len__(self) -> int:
+        return len(_provider_cls_paths)
+
 
 _log = structlog.get_logger("LocalProviderFactory")
 
 
 class LocalProviderFactory(AbstractProviderFactory):
     """A provider factory that uses locally defined providers.
-    To add a supported provider, add it to the PROVIDER_TYPES list."""
+    To add a supported provider, add it to the _provider_cls_paths map.
+
+    Providers are imported and built lazily, the first time a provider type is requested."""
 
     # This should not be a class variable
-    PROVIDER_TYPES: dict[Provider, type[AbstractProvider[Any, Any]]] = {
-        provider.name(): provider for provider in _provider_cls
-    }
+    PROVIDER_TYPES: Mapping[Provider, type[AbstractProvider[Any, Any]]] = _LazyProviderTypes()
 
     def __init__(self) -> None:
-        self._providers = self.build_available_providers()
+        self._providers: dict[Provider, list[AbstractProvider[Any, Any]]] = {}
+
+    def _providers_for_type(self, provider: Provider) -> list[AbstractProvider[Any, Any]]:
+        if (providers := self._providers.get(provider)) is None:
+            providers = self._build_providers_for_type(provider)
+            self._providers[provider] = providers
+        return providers
 
     @override
     def get_provider(self, provider: Provider, index: int = 0) -> AbstractProvider[Any, Any]:
-        return self._providers[provider][index]
+        return self._providers_for_type(provider)[index]
 
     @override
     def get_providers(self, provider: Provider) -> Iterable[AbstractProvider[Any, Any]]:
         # We return the providers in the order they were inserted
-        # If prepare_all_providers was called first, it should be the same order
-        return self._providers[provider]
+        return self._providers_for_type(provider)
 
     @classmethod
     def _build_providers_for_type(cls, provider: Provider):
@@ -119,4 +141,4 @@ class LocalProviderFactory(AbstractProviderFactory):
 
     @override
     def available_providers(self) -> Iterable[Provider]:
-        return self._providers.keys()
+        return self.PROVIDER_TYPES.keys()
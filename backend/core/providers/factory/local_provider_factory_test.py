@@ -2,6 +2,7 @@
 
 import pytest
 
+from core.domain.models import Provider
 from core.domain.models.model_provider_data_mapping import MODEL_PROVIDER_DATAS
 from core.providers.factory.local_provider_factory import LocalProviderFactory
 
@@ -12,8 +13,9 @@ def provider_factory():
 
 
 def test_default_models_are_supported(provider_factory: LocalProviderFactory):
-    assert provider_factory._providers, "sanity"
-    for providers in provider_factory._providers.values():
+    all_providers = provider_factory.build_available_providers()
+    assert all_providers, "sanity"
+    for providers in all_providers.values():
         provider = providers[0]
         default_model = provider.default_model()
 
@@ -21,3 +23,19 @@ def test_default_models_are_supported(provider_factory: LocalProviderFactory):
         assert default_model in MODEL_PROVIDER_DATAS[provider.name()], (
             f"model {default_model} is not supported by provider {provider.name()}"
         )
+
+
+def test_providers_are_built_lazily(provider_factory: LocalProviderFactory):
+    assert not provider_factory._providers
+
+    provider = provider_factory.get_provider(Provider.OPEN_AI)
+    assert provider.name() == Provider.OPEN_AI
+    assert list(provider_factory._providers) == [Provider.OPEN_AI]
+    # Providers are only built once
+    assert provider_factory.get_provider(Provider.OPEN_AI) is provider
+
+
+def test_provider_types_cover_all_providers():
+    assert set(LocalProviderFactory.PROVIDER_TYPES) == set(Provider)
+    for provider, provider_cls in LocalProviderFactory.PROVIDER_TYPES.items():
+        assert provider_cls.name() == provider
@@ -1,4 +1,5 @@
 import json
+from collections.abc import Iterator
 from typing import Annotated, Any, Literal, Self
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
@@ -14,7 +15,7 @@ from core.providers.google.google_provider_domain import (
     internal_tool_name_to_native_tool_call,
 )
 from core.runners.runner_output import ToolCallRequestDelta
-from core.utils.token_utils import tokens_from_string
+from core.utils.token_utils import tokens_from_strings
 
 FireworksAIRole = Literal["system", "user", "assistant"]
 
@@ -112,19 +113,19 @@ class FireworksMessage(BaseModel):
             ]
         return cls(content=content, role=role, tool_calls=tool_calls)
 
-    def token_count(self, model: Model) -> int:
-        token_count = 0
-
+    def texts(self) -> Iterator[str]:
         if isinstance(self.content, str):
-            return tokens_from_string(self.content, model)
+            yield self.content
+            return
 
         for block in self.content:
             if isinstance(block, TextContent):
-                token_count += tokens_from_string(block.text, model)
+                yield block.text
             else:
                 raise UnpriceableRunError("Token counting for files is not implemented")
 
-        return token_count
+    def token_count(self, model: Model) -> int:
+        return tokens_from_strings(self.texts(), model)
 
 
 class TextResponseFormat(BaseModel):
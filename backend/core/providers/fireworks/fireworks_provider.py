@@ -40,6 +40,7 @@ from core.providers.google.google_provider_domain import (
     native_tool_name_to_internal,
 )
 from core.providers.openai.openai_domain import parse_tool_call_or_raise
+from core.utils.token_utils import tokens_from_strings
 
 _NAME_OVERRIDE_MAP = {
     Model.LLAMA_3_3_70B: "accounts/fireworks/models/llama-v3p3-70b-instruct",
@@ -336,14 +337,13 @@ class FireworksAIProvider(HTTPXProvider[FireworksConfig, CompletionResponse]):
         fireworks_boilerplate_tokens = 3
         fireworks_message_boilerplate_tokens = 4
 
-        num_tokens = fireworks_boilerplate_tokens
-
-        for message in messages:
-            domain_message = FireworksMessage.model_validate(message)
-            num_tokens += domain_message.token_count(model)
-            num_tokens += fireworks_message_boilerplate_tokens
-
-        return num_tokens
+        # Counting the tokens of all messages at once
+        texts = [text for message in messages for text in FireworksMessage.model_validate(message).texts()]
+        return (
+            fireworks_boilerplate_tokens
+            + fireworks_message_boilerplate_tokens * len(messages)
+            + tokens_from_strings(texts, model)
+        )
 
     @override
     async def _compute_prompt_audio_token_count(
@@ -0,0 +1,17 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+from core.domain.models.providers import Provider
+from core.providers.google.vertex_base_config import BLOCK_THRESHOLD
+
+
+class GoogleGeminiAPIProviderConfig(BaseModel):
+    provider: Literal[Provider.GOOGLE_GEMINI] = Provider.GOOGLE_GEMINI
+    api_key: str
+    url: str = "https://generativelanguage.googleapis.com"
+
+    default_block_threshold: BLOCK_THRESHOLD | None = None
+
+    def __str__(self):
+        return f"GeminiAPIProviderConfig(url={self.url}, api_key={self.api_key[:4]}****)"
@@ -1,29 +1,16 @@
-from typing import Any, Literal, override
-
-from pydantic import BaseModel
+from typing import Any, override
 
 from core.domain.file import File
 from core.domain.models import Model, Provider
 from core.providers._base.llm_usage import LLMUsage
 from core.providers._base.utils import get_provider_config_env
+from core.providers.google.gemini.gemini_api_config import GoogleGeminiAPIProviderConfig
 from core.providers.google.google_provider_base import GoogleProviderBase
 from core.providers.google.google_provider_domain import (
-    BLOCK_THRESHOLD,
     message_or_system_message,
 )
 
 
-class GoogleGeminiAPIProviderConfig(BaseModel):
-    provider: Literal[Provider.GOOGLE_GEMINI] = Provider.GOOGLE_GEMINI
-    api_key: str
-    url: str = "https://generativelanguage.googleapis.com"
-
-    default_block_threshold: BLOCK_THRESHOLD | None = None
-
-    def __str__(self):
-        return f"GeminiAPIProviderConfig(url={self.url}, api_key={self.api_key[:4]}****)"
-
-
 class GoogleGeminiAPIProvider(GoogleProviderBase[GoogleGeminiAPIProviderConfig]):
     model_api_versions: dict[Model, str] = {
         Model.GEMINI_2_0_FLASH_THINKING_EXP_1219: "v1alpha",
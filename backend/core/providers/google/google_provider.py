@@ -1,8 +1,9 @@
-from typing import Any, Literal, override
+from typing import Any, override
 
 from core.domain.models import Model, Provider
 from core.providers._base.llm_usage import LLMUsage
 from core.providers.google.google_provider_base import GoogleProviderBase
+from core.providers.google.google_provider_config import GoogleProviderConfig
 from core.providers.google.google_provider_domain import (
     GOOGLE_CHARS_PER_TOKEN,
     PER_TOKEN_MODELS,
@@ -33,10 +34,6 @@ _GLOBAL_MODELS = {
 }
 
 
-class GoogleProviderConfig(VertexBaseConfig):
-    provider: Literal[Provider.GOOGLE] = Provider.GOOGLE
-
-
 _MODEL_STR_OVERRIDES: dict[Model, str] = {
     Model.LLAMA_3_2_90B: "llama-3.2-90b-vision-instruct-maas",
     Model.LLAMA_3_1_405B: "llama3-405b-instruct-maas",
@@ -0,0 +1,8 @@
+from typing import Literal
+
+from core.domain.models.providers import Provider
+from core.providers.google.vertex_base_config import VertexBaseConfig
+
+
+class GoogleProviderConfig(VertexBaseConfig):
+    provider: Literal[Provider.GOOGLE] = Provider.GOOGLE
@@ -0,0 +1,17 @@
+from typing import ClassVar, Literal, override
+
+from pydantic import BaseModel, ConfigDict
+
+from core.domain.models.providers import Provider
+
+
+class GroqConfig(BaseModel):
+    provider: Literal[Provider.GROQ] = Provider.GROQ
+    api_key: str
+    url: str = "https://api.groq.com/openai/v1/chat/completions"
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(extra="allow")
+
+    @override
+    def __str__(self):
+        return f"GroqConfig(api_key={self.api_key[:4]}****)"
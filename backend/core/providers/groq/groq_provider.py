@@ -1,8 +1,8 @@
 import re
-from typing import Any, ClassVar, Literal, override
+from typing import Any, override
 
 from httpx import Response
-from pydantic import BaseModel, ConfigDict, ValidationError
+from pydantic import BaseModel, ValidationError
 
 from core.domain.file import File
 from core.domain.message import MessageDeprecated
@@ -22,6 +22,7 @@ from core.providers._base.provider_options import ProviderOptions
 from core.providers._base.streaming_context import ParsedResponse
 from core.providers._base.utils import get_provider_config_env
 from core.providers.google.google_provider_domain import native_tool_name_to_internal
+from core.providers.groq.groq_config import GroqConfig
 from core.providers.groq.groq_domain import (
     CompletionRequest,
     CompletionResponse,
@@ -33,19 +34,6 @@ from core.providers.groq.groq_domain import (
 )
 from core.providers.openai.openai_domain import parse_tool_call_or_raise
 
-
-class GroqConfig(BaseModel):
-    provider: Literal[Provider.GROQ] = Provider.GROQ
-    api_key: str
-    url: str = "https://api.groq.com/openai/v1/chat/completions"
-
-    model_config: ClassVar[ConfigDict] = ConfigDict(extra="allow")
-
-    @override
-    def __str__(self):
-        return f"GroqConfig(api_key={self.api_key[:4]}****)"
-
-
 _NAME_OVERRIDE_MAP = {
     Model.LLAMA_3_3_70B: "llama-3.3-70b-versatile",
     Model.LLAMA_3_1_8B: "llama-3.1-8b-instant",
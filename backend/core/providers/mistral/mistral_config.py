@@ -0,0 +1,15 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+from core.domain.models.providers import Provider
+
+
+class MistralAIConfig(BaseModel):
+    provider: Literal[Provider.MISTRAL_AI] = Provider.MISTRAL_AI
+
+    url: str = "https://api.mistral.ai/v1/chat/completions"
+    api_key: str
+
+    def __str__(self):
+        return f"MistralAIConfig(url={self.url}, api_key={self.api_key[:4]}****)"
@@ -1,4 +1,4 @@
-from typing import Any, Literal, override
+from typing import Any, override
 
 from httpx import Response
 from pydantic import BaseModel, ValidationError
@@ -20,6 +20,7 @@ from core.providers._base.utils import get_provider_config_env
 from core.providers.google.google_provider_domain import (
     native_tool_name_to_internal,
 )
+from core.providers.mistral.mistral_config import MistralAIConfig
 from core.utils.json_utils import safe_extract_dict_from_json
 
 from .mistral_domain import (
@@ -33,17 +34,6 @@ from .mistral_domain import (
     ResponseFormat,
 )
 
-
-class MistralAIConfig(BaseModel):
-    provider: Literal[Provider.MISTRAL_AI] = Provider.MISTRAL_AI
-
-    url: str = "https://api.mistral.ai/v1/chat/completions"
-    api_key: str
-
-    def __str__(self):
-        return f"MistralAIConfig(url={self.url}, api_key={self.api_key[:4]}****)"
-
-
 MODEL_MAP = {
     Model.MISTRAL_LARGE_2_2407: "mistral-large-2407",
 }
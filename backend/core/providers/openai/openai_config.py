@@ -0,0 +1,15 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+from core.domain.models.providers import Provider
+
+
+class OpenAIConfig(BaseModel):
+    provider: Literal[Provider.OPEN_AI] = Provider.OPEN_AI
+
+    url: str = "https://api.openai.com/v1/chat/completions"
+    api_key: str
+
+    def __str__(self):
+        return f"OpenAIConfig(url={self.url}, api_key={self.api_key[:4]}****)"
@@ -1,22 +1,11 @@
-from typing import Any, Literal, override
-
-from pydantic import BaseModel
+from typing import Any, override
 
 from core.domain.models import Model, Provider
 from core.providers._base.utils import get_provider_config_env
+from core.providers.openai.openai_config import OpenAIConfig
 from core.providers.openai.openai_provider_base import OpenAIProviderBase
 
 
-class OpenAIConfig(BaseModel):
-    provider: Literal[Provider.OPEN_AI] = Provider.OPEN_AI
-
-    url: str = "https://api.openai.com/v1/chat/completions"
-    api_key: str
-
-    def __str__(self):
-        return f"OpenAIConfig(url={self.url}, api_key={self.api_key[:4]}****)"
-
-
 class OpenAIProvider(OpenAIProviderBase[OpenAIConfig]):
     @override
     async def _request_headers(self, request: dict[str, Any], url: str, model: Model) -> dict[str, str]:
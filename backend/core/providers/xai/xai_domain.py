@@ -1,4 +1,5 @@
 import json
+from collections.abc import Iterator
 from typing import Annotated, Any, Literal, Self
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -22,7 +23,7 @@ from core.providers.google.google_provider_domain import (
 from core.runners.runner_output import ToolCallRequestDelta
 from core.utils.dicts import TwoWayDict
 from core.utils.json_utils import safe_extract_dict_from_json
-from core.utils.token_utils import tokens_from_string
+from core.utils.token_utils import tokens_from_strings
 
 XAIRole = Literal["system", "user", "assistant"]
 
@@ -170,11 +171,14 @@ class XAIToolMessage(BaseModel):
             for result in message.tool_call_results
         ]
 
-    def token_count(self, model: Model) -> int:
+    def texts(self) -> Iterator[str]:
         # Very basic implementation of the pricing of tool calls messages.
         # We'll need to double check the pricing rules for every provider
         # When working on https://linear.app/workflowai/issue/WOR-3730
-        return tokens_from_string(self.content, model)
+        yield self.content
+
+    def token_count(self, model: Model) -> int:
+        return tokens_from_strings(self.texts(), model)
 
 
 class XAIMessage(BaseModel):
@@ -216,22 +220,22 @@ class XAIMessage(BaseModel):
             ]
         return cls(content=content, role=role, tool_calls=tool_calls)
 
-    def token_count(self, model: Model) -> int:
-        token_count = 0
-
+    def texts(self) -> Iterator[str]:
         if isinstance(self.content, str):
-            return tokens_from_string(self.content, model)
+            yield self.content
+            return
 
         for block in self.content:
             if isinstance(block, TextContent):
-                token_count += tokens_from_string(block.text, model)
+                yield block.text
             elif isinstance(block, AudioContent):
                 # TODO: we should throw unpriceable run error here
                 pass
             else:
                 raise UnpriceableRunError("Token counting for files is not implemented")
 
-        return token_count
+    def token_count(self, model: Model) -> int:
+        return tokens_from_strings(self.texts(), model)
 
 
 class TextResponseFormat(BaseModel):
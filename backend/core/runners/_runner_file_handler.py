@@ -13,6 +13,9 @@ from core.providers._base.abstract_provider import AbstractProvider
 
 log = structlog.get_logger(__name__)
 
+# Stands for a content type that is known, to check whether knowing it avoids downloading a file
+_PLACEHOLDER_CONTENT_TYPE = "application/octet-stream"
+
 
 @final
 class RunnerFileHandler:
@@ -32,6 +35,23 @@ class RunnerFileHandler:
 
         return self._provider.requires_downloading_file(file, self._model)
 
+    def _should_sniff_content_type(self, file: File) -> bool:
+        # Sniffing costs a small request, it is only worth it when it avoids downloading the whole file
+        if file.data or file.content_type or not file.url:
+            return False
+        if not self._provider.requires_downloading_file(file, self._model):
+            return False
+        with_content_type = file.model_copy(update={"content_type": _PLACEHOLDER_CONTENT_TYPE})
+        return not self._provider.requires_downloading_file(with_content_type, self._model)
+
+    async def _sniff_content_types(self, files: list[File]):
+        files_to_sniff = [f for f in files if self._should_sniff_content_type(f)]
+        if not files_to_sniff:
+            return
+        async with asyncio.TaskGroup() as tg:
+            for file in files_to_sniff:
+                _ = tg.create_task(file.sniff_content_type())
+
     async def handle_files_in_messages(
         self,
         messages: Sequence[Message],
@@ -45,6 +65,7 @@ class RunnerFileHandler:
             return
 
         download_start_time = time.time()
+        await self._sniff_content_types(files)
         # TODO:
         # files = await self._convert_pdf_to_images(files, model_data)
         # self._check_support_for_files(model_data, files)
@@ -1,8 +1,7 @@
+from dataclasses import dataclass, field
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, Field
-
 from core.domain.agent import Agent
 from core.domain.agent_completion import AgentCompletion
 from core.domain.agent_input import AgentInput
@@ -15,7 +14,10 @@ from core.providers._base.llm_completion import LLMCompletion
 from core.runners.runner_output import RunnerOutput
 
 
-class AgentCompletionBuilder(BaseModel):
+# A plain dataclass and not a pydantic model: the builder is created for every completion
+# from values that are already validated and is only mutated by the runner
+@dataclass(slots=True)
+class AgentCompletionBuilder:
     id: UUID
     agent: Agent
     version: Version
@@ -26,10 +28,12 @@ class AgentCompletionBuilder(BaseModel):
 
     metadata: dict[str, Any]
 
-    llm_completions: list[LLMCompletion] = Field(default_factory=list)
+    llm_completions: list[LLMCompletion] = field(default_factory=list)
 
     file_download_seconds: float | None = None
 
+    _built_completion: AgentCompletion | None = field(default=None, init=False, repr=False)
+
     def add_metadata(self, key: str, value: Any) -> None:
         self.metadata[key] = value
 
@@ -39,8 +43,6 @@ class AgentCompletionBuilder(BaseModel):
     def record_file_download_seconds(self, seconds: float):
         self.file_download_seconds = seconds
 
-    _built_completion: AgentCompletion | None = None
-
     @property
     def completion(self):
         return self._built_completion
@@ -49,19 +51,25 @@ class AgentCompletionBuilder(BaseModel):
         if self._built_completion and not force:
             return self._built_completion
 
-        output_messages = output.to_messages()
         traces: list[Trace] = [llm_completion.to_domain() for llm_completion in self.llm_completions]
-
-        self._built_completion = AgentCompletion(
+        cost_usd = 0.0
+        duration_seconds = 0.0
+        for trace in traces:
+            cost_usd += trace.cost_usd
+            duration_seconds += trace.duration_seconds
+
+        # All the children are already validated so the completion is constructed without re-validating
+        # and copying them. The output is still validated since its id is computed by a validator
+        self._built_completion = AgentCompletion.model_construct(
             id=self.id,
             agent=self.agent,
             agent_input=self.agent_input,
-            agent_output=AgentOutput(messages=output_messages, error=error),
+            agent_output=AgentOutput(messages=output.to_messages(), error=error),
             version=self.version,
             traces=traces,
             messages=self.messages,
-            cost_usd=sum(trace.cost_usd for trace in traces),
-            duration_seconds=sum(trace.duration_seconds for trace in traces),
+            cost_usd=cost_usd,
+            duration_seconds=duration_seconds,
             metadata=self.metadata,
         )
         return self._built_completion
@@ -0,0 +1,65 @@
+from datetime import UTC, datetime
+
+from core.domain.agent import Agent
+from core.domain.agent_completion import AgentCompletion
+from core.domain.message import Message
+from core.providers._base.llm_usage import LLMUsage
+from core.runners.agent_completion_builder import AgentCompletionBuilder
+from core.runners.runner_output import RunnerOutput
+from core.utils.uuid import uuid7
+from tests.fake_models import fake_input, fake_llm_completion, fake_version
+
+
+def _builder() -> AgentCompletionBuilder:
+    return AgentCompletionBuilder(
+        id=uuid7(),
+        agent=Agent(uid=1, id="hello", name="hello", created_at=datetime(2025, 1, 1, tzinfo=UTC)),
+        version=fake_version(),
+        agent_input=fake_input(),
+        messages=[Message.with_text("Your name is John", role="system")],
+        start_time=0,
+        conversation_id=None,
+        metadata={"user_id": "user_123"},
+        llm_completions=[
+            fake_llm_completion(
+                duration_seconds=1,
+                usage=LLMUsage(
+                    prompt_token_count=10,
+                    completion_token_count=2,
+                    prompt_cost_usd=1,
+                    completion_cost_usd=2,
+                ),
+            ),
+            fake_llm_completion(duration_seconds=2.5),
+        ],
+    )
+
+
+class TestBuild:
+    def test_build_matches_validated_completion(self):
+        builder = _builder()
+        completion = builder.build(RunnerOutput(agent_output="Hello"))
+
+        assert completion.cost_usd == 3
+        assert completion.duration_seconds == 3.5
+        assert completion.agent_output.id, "output id should be computed"
+        assert completion.agent_output.messages == [Message.with_text("Hello", role="assistant")]
+
+        # Constructing without validation should yield the same completion as validating it
+        validated = AgentCompletion.model_validate(completion.model_dump())
+        assert validated == completion
+        assert validated.model_dump_json() == completion.model_dump_json()
+
+    def test_build_is_memoized(self):
+        builder = _builder()
+        completion = builder.build(RunnerOutput(agent_output="Hello"))
+        assert builder.completion is completion
+        assert builder.build(RunnerOutput(agent_output="Other")) is completion
+        assert builder.build(RunnerOutput(agent_output="Other"), force=True) is not completion
+
+    def test_append_metadata(self):
+        builder = _builder()
+        builder.append_metadata("key", 1)
+        builder.append_metadata("key", 2)
+        builder.append_metadata("user_id", "other")
+        assert builder.metadata == {"user_id": ["user_123", "other"], "key": [1, 2]}
@@ -10,8 +10,9 @@ from core.domain.exceptions import InternalError, NoProviderSupportingModelError
 from core.domain.fallback_option import FallbackOption
 from core.domain.metrics import send_counter
 from core.domain.models.model_data import FinalModelData, ModelData
+from core.domain.models.model_index import IndexedModel, ModelCapability
 from core.domain.models.providers import Provider
-from core.domain.models.utils import get_model_data
+from core.domain.models.utils import get_indexed_model
 from core.domain.tenant_data import ProviderSettings
 from core.domain.typology import IOTypology
 from core.domain.version import Version
@@ -67,7 +68,8 @@ class ProviderPipeline:
         self._version = version
 
         model, provider = sanitize_model_and_provider(version.model, version.provider)
-        self._original_model_data = get_model_data(model)
+        self._original_model = get_indexed_model(model)
+        self._original_model_data = self._original_model.data
         self._original_provider = provider
 
         self._custom_configs = custom_configs
@@ -76,6 +78,8 @@ class ProviderPipeline:
         self._force_structured_generation = version.use_structured_generation
         self._last_error_was_structured_generation = False
         self._typology = typology
+        # Capabilities a fallback model needs to support the task, None if no model supports it
+        self._required_capabilities = ModelCapability.required_for(typology)
         self._has_used_model_fallback: bool = False
         self._model_fallback_disabled = use_fallback == "never"
         self._fallback_models = use_fallback if isinstance(use_fallback, list) else None
@@ -127,7 +131,7 @@ class ProviderPipeline:
             )
         )
 
-    def _pick_fallback_model(self, e: ProviderError) -> FinalModelData | None:  # noqa: C901
+    def _pick_fallback_model(self, e: ProviderError) -> IndexedModel | None:  # noqa: C901
         """Selects the fallback model to use based on the error code"""
         if self._model_fallback_disabled:
             return None
@@ -139,7 +143,7 @@ class ProviderPipeline:
                 return None
 
             fallback_model = self._fallback_models.pop(0)
-            return get_model_data(fallback_model)
+            return get_indexed_model(fallback_model)
 
         # Below is the auto fallback logic
         # We skip if either:
@@ -167,8 +171,8 @@ class ProviderPipeline:
         if not fallback_model:
             return None
 
-        fallback_model_data = get_model_data(fallback_model)
-        if fallback_model_data.is_not_supported_reason(self._typology):
+        fallback = get_indexed_model(fallback_model)
+        if self._required_capabilities is None or not fallback.supports(self._required_capabilities):
             _logger.warning(
                 "Fallback model is not supported for the task typology",
                 extra={
@@ -179,7 +183,7 @@ class ProviderPipeline:
             )
             return None
 
-        return fallback_model_data
+        return fallback
 
     @contextmanager
     def wrap_provider_call(self, provider: AbstractProvider[Any, Any]):
@@ -314,11 +318,8 @@ class ProviderPipeline:
             return
 
         # Iterating over providers
-        for provider, provider_data in self._original_model_data.providers:
-            # We only use the override for the default pipeline
-            # We assume that
-            provider_model_data = provider_data.override(self._original_model_data)
-
+        # We only use the provider overrides for the default pipeline
+        for provider, provider_model_data in self._original_model.provider_model_datas.items():
             yield from self._single_provider_iterator(
                 providers=self._factory.get_providers(provider),
                 model_data=provider_model_data,
@@ -331,20 +332,19 @@ class ProviderPipeline:
         if self.errors:
             # Yielding the final model fallback
             # We only yield in case of an error. We could have no error if there were no providers
-            while fallback_model_data := self._pick_fallback_model(self.errors[-1]):
+            while fallback := self._pick_fallback_model(self.errors[-1]):
                 if not self._has_used_model_fallback:
                     # First time only we send a metric to count model fallback
                     send_counter(
                         "model_fallback",
                         1,
                         original_model=self._original_model_data.model,
-                        fallback_model=fallback_model_data.model,
+                        fallback_model=fallback.model,
                         error_code=self.errors[-1].code if self.errors else None,
                     )
                 self._has_used_model_fallback = True
 
-                provider, provider_data = fallback_model_data.providers[0]
-                provider_model_data = provider_data.override(fallback_model_data)
+                provider, provider_model_data = next(iter(fallback.provider_model_datas.items()))
                 yield from self._single_provider_iterator(
                     providers=self._factory.get_providers(provider),
                     model_data=provider_model_data,
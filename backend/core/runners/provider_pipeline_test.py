@@ -8,6 +8,7 @@ import pytest
 from core.domain.exceptions import NoProviderSupportingModelError
 from core.domain.models import Model, Provider
 from core.domain.models.model_data import FinalModelData, ModelData, ModelFallback
+from core.domain.models.model_index import IndexedModel
 from core.domain.models.model_provider_data import ModelProviderData
 from core.domain.tenant_data import ProviderSettings
 from core.domain.typology import IOTypology, Typology
@@ -83,6 +84,14 @@ def _final_model_data(
     return final
 
 
+def _indexed_model_data(
+    providers: list[Provider],
+    model: Model = Model.DEEPSEEK_R1_0528,
+    fallback: ModelFallback | None = None,
+):
+    return IndexedModel.build(_final_model_data(providers=providers, model=model, fallback=fallback))
+
+
 def _provider_settings(provider: Provider) -> ProviderSettings:
     _mock = Mock()
     _mock.provider = provider
@@ -108,6 +117,7 @@ def _build_pipeline(
     custom_configs: list[ProviderSettings] | None = None,
     use_fallback: Literal["never", "auto"] | list[Model] | None = None,
     is_structured_generation_enabled: bool | None = None,
+    typology: IOTypology | None = None,
 ):
     if providers is None:
         providers = [Provider.OPEN_AI, Provider.AZURE_OPEN_AI]
@@ -126,8 +136,8 @@ def _build_pipeline(
         fallback=fallback,
     )
     with patch(
-        "core.runners.provider_pipeline.get_model_data",
-        return_value=model_data,
+        "core.runners.provider_pipeline.get_indexed_model",
+        return_value=IndexedModel.build(model_data),
     ):
         return ProviderPipeline(
             agent_id="123",
@@ -139,7 +149,7 @@ def _build_pipeline(
             custom_configs=custom_configs,
             builder=provider_builder,
             factory=mock_provider_factory,
-            typology=IOTypology(input=Typology()),
+            typology=typology or IOTypology(input=Typology()),
             use_fallback=copy.deepcopy(use_fallback) if use_fallback is not None else None,
         )
 
@@ -256,8 +266,8 @@ class TestProviderIterator:
 
         # Create a model that has multiple providers of the same type
         with patch(
-            "core.runners.provider_pipeline.get_model_data",
-            return_value=_final_model_data(providers=[Provider.FIREWORKS]),
+            "core.runners.provider_pipeline.get_indexed_model",
+            return_value=_indexed_model_data(providers=[Provider.FIREWORKS]),
         ):
             pipeline = ProviderPipeline(
                 agent_id="",
@@ -296,8 +306,8 @@ class TestProviderIterator:
     ):
         # Create a model that has multiple providers of different types
         with patch(
-            "core.runners.provider_pipeline.get_model_data",
-            return_value=_final_model_data(providers=[Provider.OPEN_AI, Provider.AZURE_OPEN_AI]),
+            "core.runners.provider_pipeline.get_indexed_model",
+            return_value=_indexed_model_data(providers=[Provider.OPEN_AI, Provider.AZURE_OPEN_AI]),
         ):
             pipeline = ProviderPipeline(
                 agent_id="",
@@ -405,8 +415,8 @@ class TestProviderIterator:
     ):
         """Test model fallback when the error that is raised allow a provider fallback"""
         with patch(
-            "core.runners.provider_pipeline.get_model_data",
-            return_value=_final_model_data(
+            "core.runners.provider_pipeline.get_indexed_model",
+            return_value=_indexed_model_data(
                 model=Model.GPT_4O_MINI_2024_07_18,
                 providers=[Provider.OPEN_AI, Provider.AZURE_OPEN_AI],
                 # Anthropic fallback
@@ -470,8 +480,8 @@ class TestProviderIterator:
     ):
         """Test model fallback when the error that is raised does not allow a provider fallback"""
         with patch(
-            "core.runners.provider_pipeline.get_model_data",
-            return_value=_final_model_data(
+            "core.runners.provider_pipeline.get_indexed_model",
+            return_value=_indexed_model_data(
                 model=Model.GPT_4O_MINI_2024_07_18,
                 providers=[Provider.OPEN_AI, Provider.AZURE_OPEN_AI],
                 # Anthropic fallback
@@ -616,3 +626,26 @@ The possible providers and their associated environment variables are:
 
         providers = await _run_pipeline(pipeline, raise_at_end=False)
         assert providers == [(Provider.OPEN_AI, Model.GPT_4O_MINI_2024_07_18)]
+
+
+class TestPickFallbackModel:
+    @pytest.mark.parametrize(
+        ("typology", "expected"),
+        [
+            pytest.param(IOTypology(input=Typology()), Model.CLAUDE_4_OPUS_20250514, id="supported"),
+            # Claude does not support input audio
+            pytest.param(IOTypology(input=Typology(has_audio=True)), None, id="input audio"),
+            pytest.param(IOTypology(input=Typology(), output=Typology(has_audio=True)), None, id="output audio"),
+        ],
+    )
+    def test_typology(
+        self,
+        provider_builder: Mock,
+        mock_provider_factory: Mock,
+        typology: IOTypology,
+        expected: Model | None,
+    ):
+        pipeline = _build_pipeline(provider_builder, mock_provider_factory, typology=typology)
+
+        fallback = pipeline._pick_fallback_model(ProviderRateLimitError())  # pyright: ignore[reportPrivateUsage]
+        assert (fallback.model if fallback else None) == expected
@@ -95,11 +95,8 @@ class Runner:
         )
 
     def _merge_metadata(self, metadata: dict[str, Any] | None) -> dict[str, Any]:
-        if metadata is None:
-            return self._metadata or {}
-        if self._metadata is None:
-            return metadata
-        return {**self._metadata, **metadata}
+        # Always returning a new dict since the builder mutates its metadata in place
+        return {**(self._metadata or {}), **(metadata or {})}
 
     async def prepare_completion(
         self,
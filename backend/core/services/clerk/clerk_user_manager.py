@@ -1,3 +1,4 @@
+import time
 from collections.abc import Iterable
 from datetime import timedelta
 from typing import Any, NotRequired, TypedDict, override
@@ -8,10 +9,19 @@ from structlog import get_logger
 from core.domain.exceptions import InternalError, InvalidTokenError, ObjectNotFoundError
 from core.services.user_manager import UserManager
 from core.services.user_service import OrganizationDetails, UserDetails, UserService
+from core.utils.hash import secure_hash
 from core.utils.remote_cached import remote_cached
+from core.utils.tiered_cache import TieredCache
 
 _log = get_logger(__name__)
 
+# Validated tokens are cached at most for this duration, or until the token expires
+_OAUTH_TOKEN_TTL = timedelta(minutes=5)
+# Invalid tokens are cached for a shorter duration
+_INVALID_OAUTH_TOKEN_TTL = timedelta(minutes=1)
+# Sentinel subject stored for invalid tokens
+_INVALID_TOKEN_SUBJECT = ""
+
 
 class ClerkUserManager(UserManager, UserService):
     def __init__(self, secret_key: str):
@@ -19,14 +29,15 @@ class ClerkUserManager(UserManager, UserService):
             base_url="https://api.clerk.com/v1",
             headers={"Authorization": f"Bearer {secret_key}"},
         )
+        # token hash -> subject
+        self._oauth_token_cache = TieredCache[str](namespace="clerk.oauth_token", ttl=_OAUTH_TOKEN_TTL)
 
     async def close(self):
         await self._client.aclose()
 
-    @override
-    async def validate_oauth_token(self, token: str) -> str:
+    async def _verify_oauth_token(self, token: str) -> tuple[str, timedelta | None]:
+        """Returns the subject and the remaining validity of the token, if provided by clerk"""
         response = await self._client.post("/oauth_applications/access_tokens/verify", json={"access_token": token})
-        # TODO: add cache
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
@@ -34,7 +45,28 @@ class ClerkUserManager(UserManager, UserService):
                 raise InvalidTokenError("Invalid OAuth token") from e
             raise e
 
-        return response.json()["subject"]
+        data = response.json()
+        expiration: int | None = data.get("expiration")
+        return data["subject"], timedelta(seconds=expiration - time.time()) if expiration else None
+
+    @override
+    async def validate_oauth_token(self, token: str) -> str:
+        # Never use the raw token as a cache key
+        key = secure_hash(token)
+        cached = await self._oauth_token_cache.get(key)
+        if cached == _INVALID_TOKEN_SUBJECT:
+            raise InvalidTokenError("Invalid OAuth token")
+        if cached:
+            return cached
+
+        try:
+            subject, remaining = await self._verify_oauth_token(token)
+        except InvalidTokenError:
+            await self._oauth_token_cache.set(key, _INVALID_TOKEN_SUBJECT, ttl=_INVALID_OAUTH_TOKEN_TTL)
+            raise
+
+        await self._oauth_token_cache.set(key, subject, ttl=remaining)
+        return subject
 
     @override
     async def get_user(self, user_id: str) -> UserDetails:
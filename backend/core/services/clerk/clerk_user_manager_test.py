@@ -1,6 +1,7 @@
 import pytest
 from pytest_httpx import HTTPXMock
 
+from core.domain.exceptions import InvalidTokenError
 from core.services.clerk.clerk_user_manager import ClerkUserManager
 from core.services.user_service import UserDetails
 
@@ -39,6 +40,46 @@ class TestValidateOAuthToken:
         assert req
         assert req.headers["Authorization"] == "Bearer not_a_secret"
 
+    async def test_validate_oauth_token_is_cached(self, clerk_user_manager: ClerkUserManager, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(
+            url="https://api.clerk.com/v1/oauth_applications/access_tokens/verify",
+            json={"subject": "user_1"},
+        )
+
+        assert await clerk_user_manager.validate_oauth_token("test_token") == "user_1"
+        assert await clerk_user_manager.validate_oauth_token("test_token") == "user_1"
+
+        assert len(httpx_mock.get_requests()) == 1
+
+    async def test_invalid_oauth_token_is_cached(self, clerk_user_manager: ClerkUserManager, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(
+            url="https://api.clerk.com/v1/oauth_applications/access_tokens/verify",
+            status_code=404,
+        )
+
+        with pytest.raises(InvalidTokenError):
+            await clerk_user_manager.validate_oauth_token("test_token")
+        with pytest.raises(InvalidTokenError):
+            await clerk_user_manager.validate_oauth_token("test_token")
+
+        assert len(httpx_mock.get_requests()) == 1
+
+    async def test_expired_oauth_token_is_not_cached(
+        self,
+        clerk_user_manager: ClerkUserManager,
+        httpx_mock: HTTPXMock,
+    ):
+        httpx_mock.add_response(
+            url="https://api.clerk.com/v1/oauth_applications/access_tokens/verify",
+            json={"subject": "user_1", "expiration": 1716883200},
+            is_reusable=True,
+        )
+
+        assert await clerk_user_manager.validate_oauth_token("test_token") == "user_1"
+        assert await clerk_user_manager.validate_oauth_token("test_token") == "user_1"
+
+        assert len(httpx_mock.get_requests()) == 2
+
 
 class TestGetUserEmail:
     async def test_get_user_email(self, clerk_user_manager: ClerkUserManager, httpx_mock: HTTPXMock):
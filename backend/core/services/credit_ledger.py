@@ -0,0 +1,73 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable
+
+import structlog
+
+from core.domain.tenant_data import TenantData
+from core.services.payment_service import PaymentHandler, cache_credit_balance
+from core.storage.tenant_storage import TenantStorage
+from core.utils.timed_buffer import TimedBuffer
+
+_log = structlog.get_logger(__name__)
+
+
+class CreditLedger:
+    """Aggregates credit decrements per tenant over a short window and applies them in a single statement.
+
+    Decrementing credits once per completion creates a lot of contention on the tenant rows of
+    high volume tenants. Low credit checks and automatic payments are triggered once per flush
+    from the aggregated result."""
+
+    def __init__(
+        self,
+        tenant_storage: TenantStorage,
+        payment_handler_builder: Callable[[int], PaymentHandler],
+        flush_interval_seconds: float = 1,
+        max_pending_decrements: int = 1000,
+    ):
+        self._tenant_storage = tenant_storage
+        self._payment_handler_builder = payment_handler_builder
+        self._buffer = TimedBuffer[tuple[int, float]](
+            self._apply,
+            max_buffer_length=max_pending_decrements,
+            send_interval_seconds=flush_interval_seconds,
+        )
+        self._started = False
+
+    async def decrement(self, tenant_uid: int, credits: float) -> None:
+        if not self._started:
+            self._started = True
+            await self._buffer.start()
+        await self._buffer.add((tenant_uid, credits))
+
+    async def flush(self) -> None:
+        await self._buffer.purge()
+
+    async def close(self) -> None:
+        await self._buffer.close()
+        # Applying whatever is left before the process exits
+        await self._buffer.purge()
+
+    async def _apply(self, decrements: list[tuple[int, float]]) -> None:
+        credits: dict[int, float] = defaultdict(float)
+        for tenant_uid, amount in decrements:
+            credits[tenant_uid] += amount
+
+        try:
+            tenants = await self._tenant_storage.decrement_credits_for_tenants(credits)
+        except Exception as e:  # noqa: BLE001
+            _log.exception("Failed to apply credit decrements", exc_info=e, tenant_count=len(credits))
+            # Re-buffering the aggregated decrements so that they are applied on the next flush
+            for tenant_uid, amount in credits.items():
+                await self._buffer.add((tenant_uid, amount))
+            return
+
+        await asyncio.gather(*(self._handle_decrement(tenant) for tenant in tenants))
+
+    async def _handle_decrement(self, tenant: TenantData) -> None:
+        try:
+            await cache_credit_balance(tenant)
+            await self._payment_handler_builder(tenant.uid).handle_credit_decrement(tenant)
+        except Exception as e:  # noqa: BLE001
+            _log.exception("Failed to handle credit decrement", exc_info=e, tenant_uid=tenant.uid)
@@ -0,0 +1,84 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from core.domain.tenant_data import TenantData
+from core.services.credit_ledger import CreditLedger
+from core.services.payment_service import PaymentHandler
+
+
+@pytest.fixture
+def mock_payment_handler():
+    handler = Mock(spec=PaymentHandler)
+    handler.handle_credit_decrement = AsyncMock()
+    return handler
+
+
+@pytest.fixture
+def mock_cache_credit_balance():
+    with patch("core.services.credit_ledger.cache_credit_balance", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+@pytest.fixture
+async def ledger(mock_tenant_storage: Mock, mock_payment_handler: Mock, mock_cache_credit_balance: AsyncMock):
+    mock_tenant_storage.decrement_credits_for_tenants = AsyncMock(return_value=[])
+    ledger = CreditLedger(mock_tenant_storage, lambda _: mock_payment_handler, flush_interval_seconds=3600)
+    yield ledger
+    await ledger.close()
+
+
+class TestCreditLedger:
+    async def test_decrements_are_aggregated(
+        self,
+        ledger: CreditLedger,
+        mock_tenant_storage: Mock,
+        mock_payment_handler: Mock,
+        mock_cache_credit_balance: AsyncMock,
+    ):
+        tenants = [TenantData(uid=1, current_credits_usd=7), TenantData(uid=2, current_credits_usd=4)]
+        mock_tenant_storage.decrement_credits_for_tenants.return_value = tenants
+
+        await ledger.decrement(1, 1)
+        await ledger.decrement(2, 1)
+        await ledger.decrement(1, 2)
+        mock_tenant_storage.decrement_credits_for_tenants.assert_not_called()
+
+        await ledger.flush()
+
+        mock_tenant_storage.decrement_credits_for_tenants.assert_awaited_once_with({1: 3, 2: 1})
+        assert mock_payment_handler.handle_credit_decrement.await_count == 2
+        mock_payment_handler.handle_credit_decrement.assert_any_await(tenants[0])
+        mock_cache_credit_balance.assert_any_await(tenants[1])
+
+    async def test_failed_decrements_are_retried(self, ledger: CreditLedger, mock_tenant_storage: Mock):
+        mock_tenant_storage.decrement_credits_for_tenants.side_effect = [Exception("Database error"), []]
+
+        await ledger.decrement(1, 1)
+        await ledger.decrement(1, 2)
+        await ledger.flush()
+        await ledger.flush()
+
+        assert mock_tenant_storage.decrement_credits_for_tenants.await_count == 2
+        assert mock_tenant_storage.decrement_credits_for_tenants.await_args_list[1].args == ({1: 3},)
+
+    async def test_close_flushes(self, ledger: CreditLedger, mock_tenant_storage: Mock):
+        await ledger.decrement(1, 1)
+        await ledger.close()
+
+        mock_tenant_storage.decrement_credits_for_tenants.assert_awaited_once_with({1: 1})
+
+    async def test_payment_handler_errors_are_not_propagated(
+        self,
+        ledger: CreditLedger,
+        mock_tenant_storage: Mock,
+        mock_payment_handler: Mock,
+    ):
+        mock_tenant_storage.decrement_credits_for_tenants.return_value = [TenantData(uid=1), TenantData(uid=2)]
+        mock_payment_handler.handle_credit_decrement.side_effect = [Exception("Stripe error"), None]
+
+        await ledger.decrement(1, 1)
+        await ledger.decrement(2, 1)
+        await ledger.flush()
+
+        assert mock_payment_handler.handle_credit_decrement.await_count == 2
@@ -0,0 +1,208 @@
+import hashlib
+import math
+import os
+import re
+import time
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+import structlog
+
+from core.domain.documentation_section import DocumentationSection
+from core.services.documentation.documentation_config import DocumentationConfig
+
+_LOCAL_FILE_EXTENSIONS: tuple[str, ...] = (".mdx", ".md")
+
+# Minimum delay between two checks of the documentation files for changes
+_RELOAD_CHECK_INTERVAL_SECONDS = 5.0
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+# Query terms that appear in the path of a page are a strong signal that the page is relevant
+_PATH_TERM_BOOST = 5.0
+_WORKFLOWAI_BOOST = 100.0
+
+_TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+log = structlog.get_logger(__name__)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_REGEX.findall(text.lower())
+
+
+def substitute_variables(content: str, variables: dict[str, str]) -> str:
+    for key, value in variables.items():
+        content = content.replace(f"{{{{{key}}}}}", value)
+    return content
+
+
+def extract_summary(content: str) -> str:
+    """Extract the summary from the frontmatter of a markdown content."""
+    lines = content.split("\n")
+
+    # Look for frontmatter summary
+    if lines and lines[0].strip() == "---":
+        for i in range(1, min(20, len(lines))):  # Check first 20 lines for frontmatter
+            line = lines[i].strip()
+            if line == "---":
+                break
+            if line.startswith("summary:"):
+                return line.split("summary:", 1)[1].strip().strip("\"'")
+
+    # Fallback when no summary is found
+    return ""
+
+
+class DocumentationIndex:
+    """An inverted index over documentation sections, scored with BM25"""
+
+    def __init__(self, sections: Sequence[DocumentationSection]):
+        self._sections = sections
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._path_postings: dict[str, list[int]] = {}
+        self._workflowai_docs: list[int] = []
+
+        doc_lengths: list[int] = []
+        for doc_idx, section in enumerate(sections):
+            tokens = tokenize(section.content)
+            doc_lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                self._postings.setdefault(term, []).append((doc_idx, count))
+            for term in set(tokenize(section.file_path)):
+                self._path_postings.setdefault(term, []).append(doc_idx)
+            if "workflowai" in section.file_path.lower():
+                self._workflowai_docs.append(doc_idx)
+
+        avg_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0
+        # Length normalization only depends on the document so it is computed once
+        self._length_norms = [
+            _K1 * (1 - _B + _B * length / avg_length) if avg_length else _K1 for length in doc_lengths
+        ]
+        doc_count = len(sections)
+        self._idf = {
+            term: math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def _scores(self, query: str) -> dict[int, float]:
+        scores: dict[int, float] = {}
+        terms = set(tokenize(query))
+        for term in terms:
+            idf = self._idf.get(term)
+            if idf is not None:
+                for doc_idx, count in self._postings[term]:
+                    norm = self._length_norms[doc_idx]
+                    scores[doc_idx] = scores.get(doc_idx, 0) + idf * count * (_K1 + 1) / (count + norm)
+            for doc_idx in self._path_postings.get(term, ()):
+                scores[doc_idx] = scores.get(doc_idx, 0) + _PATH_TERM_BOOST
+
+        if "workflowai" in query.lower():
+            for doc_idx in self._workflowai_docs:
+                scores[doc_idx] = scores.get(doc_idx, 0) + _WORKFLOWAI_BOOST
+        return scores
+
+    def search(self, query: str, limit: int = 5) -> list[DocumentationSection]:
+        if not query.strip():
+            return []
+        scores = self._scores(query)
+        # Ties are broken by the order of the sections for stable results
+        ranked = sorted((doc_idx for doc_idx, score in scores.items() if score > 0), key=lambda i: (-scores[i], i))
+        return [self._sections[doc_idx] for doc_idx in ranked[:limit]]
+
+
+class _FileSignature(NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+
+
+def _documentation_files(directory: str) -> Iterable[str]:
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if not file.endswith(_LOCAL_FILE_EXTENSIONS):
+                continue
+            if file.startswith(".") or ".private" in file:  # Ignore hidden files and private pages
+                continue
+            yield os.path.join(root, file)
+
+
+def _signature(directory: str) -> tuple[_FileSignature, ...]:
+    signatures: list[_FileSignature] = []
+    for full_path in _documentation_files(directory):
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            continue
+        signatures.append(_FileSignature(full_path, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signatures))
+
+
+class DocumentationCorpus:
+    """All the documentation sections of a directory, loaded once, with their index and summaries"""
+
+    def __init__(self, sections: list[DocumentationSection], signature: tuple[_FileSignature, ...] = ()):
+        # Sorted by path to ensure consistent ordering, for example to trigger LLM provider caching
+        self.sections = sorted(sections, key=lambda x: x.file_path)
+        self.by_path = {section.file_path: section for section in self.sections}
+        self.summaries = {section.file_path: extract_summary(section.content) for section in self.sections}
+        self.index = DocumentationIndex(self.sections)
+        self.signature = signature
+
+        hasher = hashlib.sha256()
+        for section in self.sections:
+            hasher.update(section.file_path.encode())
+            hasher.update(section.content.encode())
+        # Changes whenever the content of the documentation changes
+        self.version = hasher.hexdigest()[:16]
+
+    @classmethod
+    def load(cls, config: DocumentationConfig) -> "DocumentationCorpus":
+        directory = str(config.directory)
+        signature = _signature(directory)
+        sections: list[DocumentationSection] = []
+        for file in signature:
+            relative_path = os.path.relpath(file.path, directory)
+            try:
+                with open(file.path) as f:
+                    content = substitute_variables(f.read(), config.variables)
+            except Exception as e:
+                log.exception("Error reading or processing documentation file", full_path=file.path, exc_info=e)
+                continue
+            sections.append(
+                DocumentationSection(
+                    file_path=relative_path.replace(".mdx", "").replace(".md", ""),
+                    content=content,
+                ),
+            )
+        return cls(sections, signature)
+
+
+class _CorpusEntry:
+    def __init__(self, corpus: DocumentationCorpus):
+        self.corpus = corpus
+        self.checked_at = time.monotonic()
+
+
+_corpora: dict[tuple[str, tuple[tuple[str, str], ...]], _CorpusEntry] = {}
+
+
+def documentation_corpus(config: DocumentationConfig) -> DocumentationCorpus:
+    """Returns the corpus for the config, loading it on first use and reloading it
+    when the documentation files have changed"""
+    key = (str(config.directory), tuple(sorted(config.variables.items())))
+    entry = _corpora.get(key)
+    if entry is None:
+        entry = _corpora[key] = _CorpusEntry(DocumentationCorpus.load(config))
+        return entry.corpus
+
+    now = time.monotonic()
+    if now - entry.checked_at < _RELOAD_CHECK_INTERVAL_SECONDS:
+        return entry.corpus
+    entry.checked_at = now
+    if _signature(str(config.directory)) != entry.corpus.signature:
+        log.info("Documentation files changed, reloading corpus", directory=str(config.directory))
+        entry.corpus = DocumentationCorpus.load(config)
+    return entry.corpus
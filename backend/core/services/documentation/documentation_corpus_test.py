@@ -0,0 +1,110 @@
+# pyright: reportPrivateUsage=false
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from core.domain.documentation_section import DocumentationSection
+from core.services.documentation import documentation_corpus as corpus_module
+from core.services.documentation.documentation_config import DocumentationConfig
+from core.services.documentation.documentation_corpus import (
+    DocumentationCorpus,
+    DocumentationIndex,
+    documentation_corpus,
+)
+
+
+@pytest.fixture
+def docs_config(tmp_path: Path):
+    (tmp_path / "guides").mkdir()
+    _ = (tmp_path / "guides" / "authentication.mdx").write_text(
+        '---\nsummary: "How to authenticate"\n---\nUse your API key: {{API_URL}}',
+    )
+    _ = (tmp_path / "index.md").write_text("Welcome to the documentation")
+    _ = (tmp_path / ".hidden.md").write_text("hidden")
+    _ = (tmp_path / "page.private.md").write_text("private")
+    _ = (tmp_path / "notes.txt").write_text("not documentation")
+    return DocumentationConfig(directory=tmp_path, variables={"API_URL": "https://api.anotherai.dev"})
+
+
+@pytest.fixture(autouse=True)
+def clear_corpora():
+    corpus_module._corpora.clear()
+    yield
+    corpus_module._corpora.clear()
+
+
+class TestDocumentationCorpus:
+    def test_load(self, docs_config: DocumentationConfig):
+        corpus = DocumentationCorpus.load(docs_config)
+
+        assert [s.file_path for s in corpus.sections] == ["guides/authentication", "index"]
+        assert corpus.by_path["guides/authentication"].content.endswith("https://api.anotherai.dev")
+        assert corpus.summaries == {"guides/authentication": "How to authenticate", "index": ""}
+
+    def test_version_changes_with_content(self):
+        v1 = DocumentationCorpus([DocumentationSection(file_path="a", content="hello")]).version
+        v2 = DocumentationCorpus([DocumentationSection(file_path="a", content="hello")]).version
+        v3 = DocumentationCorpus([DocumentationSection(file_path="a", content="world")]).version
+        assert v1 == v2
+        assert v1 != v3
+
+
+class TestDocumentationCorpusCache:
+    def test_loaded_once(self, docs_config: DocumentationConfig):
+        corpus = documentation_corpus(docs_config)
+        with patch.object(DocumentationCorpus, "load") as mock_load:
+            assert documentation_corpus(docs_config) is corpus
+        mock_load.assert_not_called()
+
+    def test_reloaded_when_files_change(self, docs_config: DocumentationConfig):
+        corpus = documentation_corpus(docs_config)
+
+        page = docs_config.directory / "index.md"
+        _ = page.write_text("Welcome to the updated documentation")
+        stat = page.stat()
+        os.utime(page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        # Changes are not checked for within the reload interval
+        assert documentation_corpus(docs_config) is corpus
+
+        corpus_module._corpora[next(iter(corpus_module._corpora))].checked_at -= 60
+        reloaded = documentation_corpus(docs_config)
+        assert reloaded is not corpus
+        assert reloaded.by_path["index"].content == "Welcome to the updated documentation"
+        assert reloaded.version != corpus.version
+
+    def test_not_reloaded_when_files_are_unchanged(self, docs_config: DocumentationConfig):
+        corpus = documentation_corpus(docs_config)
+        corpus_module._corpora[next(iter(corpus_module._corpora))].checked_at -= 60
+        assert documentation_corpus(docs_config) is corpus
+
+
+class TestDocumentationIndex:
+    def test_rare_terms_rank_higher(self):
+        index = DocumentationIndex(
+            [
+                DocumentationSection(file_path="a", content="models models models"),
+                DocumentationSection(file_path="b", content="models and deployments"),
+                DocumentationSection(file_path="c", content="models and more"),
+            ],
+        )
+        results = index.search("models deployments")
+        assert [s.file_path for s in results] == ["b", "a", "c"]
+
+    def test_limit(self):
+        index = DocumentationIndex([DocumentationSection(file_path=str(i), content="hello") for i in range(10)])
+        results = index.search("hello")
+        # Ties keep the order of the sections
+        assert [s.file_path for s in results] == ["0", "1", "2", "3", "4"]
+
+    def test_path_matches(self):
+        index = DocumentationIndex(
+            [
+                DocumentationSection(file_path="guides/deployments", content="Nothing here"),
+                DocumentationSection(file_path="other", content="Nothing here either"),
+            ],
+        )
+        assert [s.file_path for s in index.search("Deployments")] == ["guides/deployments"]
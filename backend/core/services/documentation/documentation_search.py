@@ -1,21 +1,50 @@
-import os
+from datetime import timedelta
 
 import structlog
 
 from core.agents.search_documentation import search_documentation_agent
 from core.domain.documentation_section import DocumentationSection
+from core.domain.metrics import send_counter
 from core.services.documentation.documentation_config import (
     DocumentationConfig,
     default_docs_config,
 )
-
-_LOCAL_FILE_EXTENSIONS: list[str] = [".mdx", ".md"]
+from core.services.documentation.documentation_corpus import (
+    DocumentationCorpus,
+    DocumentationIndex,
+    documentation_corpus,
+    extract_summary,
+    substitute_variables,
+    tokenize,
+)
+from core.utils.hash import hash_string
+from core.utils.tiered_cache import TieredCache
 
 log = structlog.get_logger(__name__)
 
 
 _DEFAULT_DOCS_CONFIG = default_docs_config()
 
+# Answers only depend on the query and the documentation so they can be cached for a long time,
+# the corpus version is part of the key so a documentation change invalidates all answers
+_ANSWER_CACHE_TTL = timedelta(hours=24)
+_answer_cache = TieredCache[list[str]](namespace="documentation.answers", ttl=_ANSWER_CACHE_TTL)
+
+_QUERY_STOP_WORDS = frozenset(
+    ("a", "an", "and", "are", "can", "do", "does", "for", "how", "i", "in", "is", "of", "on", "the", "to", "what"),
+)
+
+
+def _normalize_query(query: str) -> str:
+    """Normalizes a query so that questions that only differ by casing, punctuation, word order
+    or filler words share the same cached answer"""
+    return " ".join(sorted({token for token in tokenize(query) if token not in _QUERY_STOP_WORDS}))
+
+
+def _answer_cache_key(query: str, usage_context: str | None, corpus_version: str) -> str:
+    context_hash = hash_string(usage_context, max_length=8) if usage_context else "-"
+    return f"{corpus_version}:{context_hash}:{hash_string(_normalize_query(query))}"
+
 
 # TODO: test
 # TODO: find a better name
@@ -23,138 +52,68 @@ class DocumentationSearch:
     def __init__(self, config: DocumentationConfig = _DEFAULT_DOCS_CONFIG):
         self._config = config
 
+    def _corpus(self) -> DocumentationCorpus:
+        return documentation_corpus(self._config)
+
     def get_available_pages_descriptions(self) -> str:
         """Generate formatted descriptions of all available documentation pages for MCP tool docstring."""
-        # TODO: cache ?
-        all_sections = self.get_all_doc_sections()
+        corpus = self._corpus()
 
-        if not all_sections:
+        if not corpus.sections:
             return "No documentation pages found."
 
         # Build simple list of pages with descriptions
-        result_lines: list[str] = []
-
-        for section in sorted(all_sections, key=lambda s: s.file_path):
-            page_path = section.file_path
-            summary = self._extract_summary_from_content(section.content)
-            result_lines.append(f"     - '{page_path}' - {summary}")
-
-        return "\n".join(result_lines)
+        return "\n".join(f"     - '{path}' - {summary}" for path, summary in corpus.summaries.items())
 
     def _extract_summary_from_content(self, content: str) -> str:
         """Extract a summary from markdown content."""
-        lines = content.split("\n")
-
-        # Look for frontmatter summary
-        if lines and lines[0].strip() == "---":
-            for i in range(1, min(20, len(lines))):  # Check first 20 lines for frontmatter
-                line = lines[i].strip()
-                if line == "---":
-                    break
-                if line.startswith("summary:"):
-                    return line.split("summary:", 1)[1].strip().strip("\"'")
-
-        # Fallback when no summary is found
-        return ""
+        return extract_summary(content)
 
     def get_all_doc_sections(self) -> list[DocumentationSection]:
-        # TODO: we could load all the sections once and cache them
-        doc_sections: list[DocumentationSection] = []
-
-        for root, _, files in os.walk(self._config.directory):
-            for file in files:
-                if not file.endswith(tuple(_LOCAL_FILE_EXTENSIONS)):
-                    continue
-                if file.startswith(".") or ".private" in file:  # Ignore hidden files and private pages
-                    continue
-                full_path: str = os.path.join(root, file)
-                relative_path: str = os.path.relpath(full_path, self._config.directory)
-                try:
-                    with open(full_path) as f:
-                        content = f.read()
-                        # Apply variable substitution
-                        content = self._substitute_variables(content)
-                        doc_sections.append(
-                            DocumentationSection(
-                                file_path=relative_path.replace(".mdx", "").replace(".md", ""),
-                                content=content,
-                            ),
-                        )
-                except Exception as e:
-                    log.exception(
-                        "Error reading or processing documentation file",
-                        full_path=full_path,
-                        exc_info=e,
-                    )
-        # Sort by title to ensure consistent ordering, for example to trigger LLM provider caching
-        return sorted(doc_sections, key=lambda x: x.file_path)
-
-    def _offline_documentation_search(  # noqa: C901
+        return self._corpus().sections
+
+    def _offline_documentation_search(
         self,
         query: str,
         all_doc_sections: list[DocumentationSection],
     ) -> list[DocumentationSection]:
-        """Simple offline search using basic text matching and scoring."""
-        if not query.strip():
-            return []
-
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-
-        scored_sections = []
-
-        if "workflowai" in query_lower:
-
-            def workflowai_adjustment(file_path: str) -> int:
-                if "workflowai" in file_path:
-                    return 100
-                return 0
-        else:
-
-            def workflowai_adjustment(file_path: str) -> int:
-                return 0
-
-        for section in all_doc_sections:
-            score = 0
-            content_lower = section.content.lower()
-            path_lower = section.file_path.lower()
+        """Offline search using BM25 scoring, boosted by matches in the page paths."""
+        corpus = self._corpus()
+        # The prebuilt index is only valid for the sections of the corpus
+        index = corpus.index if all_doc_sections is corpus.sections else DocumentationIndex(all_doc_sections)
+        return index.search(query)
 
-            # Exact phrase match in content (high score)
-            if query_lower in content_lower:
-                score += 10
-
-            # Exact phrase match in file path (high score)
-            if query_lower in path_lower:
-                score += 15
-
-            # Word matches in content
-            content_words = set(content_lower.split())
-            matching_words = query_words.intersection(content_words)
-            score += len(matching_words) * 2
-
-            # Word matches in file path (weighted higher)
-            path_words = set(path_lower.split("/"))
-            path_matches = query_words.intersection(path_words)
-            score += len(path_matches) * 5
-
-            score += workflowai_adjustment(path_lower)
+    async def search_documentation_by_query(
+        self,
+        query: str,
+        usage_context: str | None = None,
+    ) -> list[DocumentationSection]:
+        corpus = self._corpus()
+        all_doc_sections: list[DocumentationSection] = corpus.sections
 
-            if score > 0:
-                scored_sections.append((section, score))
+        cache_key = _answer_cache_key(query, usage_context, corpus.version)
+        relevant_doc_sections = await _answer_cache.get(cache_key)
+        send_counter("documentation_search_answer_cache", hit=relevant_doc_sections is not None)
 
-        # Sort by score (highest first) and return top 5
-        def get_score(item: tuple[DocumentationSection, int]) -> int:
-            return item[1]
+        if relevant_doc_sections is None:
+            relevant_doc_sections = await self._search_relevant_paths(query, usage_context, all_doc_sections)
+            if relevant_doc_sections is None:
+                return self._offline_documentation_search(query, all_doc_sections)
+            await _answer_cache.set(cache_key, relevant_doc_sections)
 
-        scored_sections.sort(key=get_score, reverse=True)
-        return [section for section, _ in scored_sections[:5]]
+        relevant_paths = set(relevant_doc_sections)
+        return [
+            document_section for document_section in all_doc_sections if document_section.file_path in relevant_paths
+        ]
 
-    async def search_documentation_by_query(
+    async def _search_relevant_paths(
         self,
         query: str,
-        usage_context: str | None = None,
-    ) -> list[DocumentationSection]:
-        all_doc_sections: list[DocumentationSection] = self.get_all_doc_sections()
+        usage_context: str | None,
+        all_doc_sections: list[DocumentationSection],
+    ) -> list[str] | None:
+        """Returns the paths of the relevant sections as picked by the search agent
+        or None when the offline search should be used instead"""
 
         # Removed fallback_docs_sections as we now use offline search as fallback
 
@@ -166,18 +125,14 @@ class DocumentationSearch:
             )
         except Exception as e:
             log.exception("Error in search documentation agent, falling back to offline search", exc_info=e)
-            return self._offline_documentation_search(query, all_doc_sections)
+            return None
 
         if not result:
             log.error(
                 "search_documentation_agent did not return any parsed result, falling back to offline search",
                 query=query,
             )
-            return self._offline_documentation_search(query, all_doc_sections)
-
-        relevant_doc_sections: list[str] = (
-            result.relevant_documentation_file_paths if result and result.relevant_documentation_file_paths else []
-        )
+            return None
 
         # Log warning for cases where the agent has reported a missing doc sections
         if result.missing_doc_sections_feedback:
@@ -199,21 +154,16 @@ class DocumentationSearch:
                 "Documentation search agent has not found any relevant doc sections, falling back to offline search",
                 query=query,
             )
-            return self._offline_documentation_search(query, all_doc_sections)
+            return None
 
-        return [
-            document_section
-            for document_section in all_doc_sections
-            if document_section.file_path in relevant_doc_sections
-        ]
+        return result.relevant_documentation_file_paths or []
 
     async def get_documentation_by_path(self, pathes: list[str]) -> list[DocumentationSection]:
-        all_doc_sections: list[DocumentationSection] = self.get_all_doc_sections()
-        found_sections = [doc_section for doc_section in all_doc_sections if doc_section.file_path in pathes]
+        by_path = self._corpus().by_path
+        found_sections = [by_path[path] for path in dict.fromkeys(pathes) if path in by_path]
 
         # Check if any paths were not found
-        found_paths = {doc_section.file_path for doc_section in found_sections}
-        missing_paths = set(pathes) - found_paths
+        missing_paths = {path for path in pathes if path not in by_path}
 
         if missing_paths:
             log.error("Documentation not found", paths=missing_paths)
@@ -222,9 +172,7 @@ class DocumentationSearch:
 
     def _substitute_variables(self, content: str) -> str:
         """Substitute variables in documentation content."""
-        for key, value in self._config.variables.items():
-            content = content.replace(f"{{{{{key}}}}}", value)
-        return content
+        return substitute_variables(content, self._config.variables)
 
     async def search_documentation_offline(self, query: str) -> list[DocumentationSection]:
         """Direct offline search without using the LLM agent."""
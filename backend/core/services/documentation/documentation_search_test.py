@@ -1,13 +1,17 @@
 # pyright: reportPrivateUsage=false
 
 
+from datetime import timedelta
 from pathlib import Path
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from core.agents.search_documentation import SearchDocumentationOutput
 from core.domain.documentation_section import DocumentationSection
 from core.services.documentation.documentation_config import DocumentationConfig
-from core.services.documentation.documentation_search import DocumentationSearch
+from core.services.documentation.documentation_search import DocumentationSearch, _normalize_query
+from core.utils.tiered_cache import TieredCache
 
 
 @pytest.fixture
@@ -144,3 +148,52 @@ class TestOfflineDocumentationSearch:
         results = documentation_search._offline_documentation_search("Migrate from WorkflowAI to AnotherAI", sections)
         assert len(results) > 0
         assert results[0].file_path.endswith("migrate-from-workflowai")
+
+
+class TestNormalizeQuery:
+    def test_equivalent_queries(self):
+        assert _normalize_query("How do I create an API key?") == _normalize_query("create api key")
+        assert _normalize_query("api key create") == _normalize_query("Create  API-key")
+
+    def test_different_queries(self):
+        assert _normalize_query("create api key") != _normalize_query("delete api key")
+
+
+class TestSearchDocumentationByQuery:
+    @pytest.fixture(autouse=True)
+    def answer_cache(self):
+        cache = TieredCache[list[str]](namespace="test", ttl=timedelta(minutes=1))
+        with patch("core.services.documentation.documentation_search._answer_cache", cache):
+            yield cache
+
+    @pytest.fixture
+    def mock_agent(self):
+        with patch(
+            "core.services.documentation.documentation_search.search_documentation_agent",
+            new_callable=AsyncMock,
+        ) as mock:
+            yield mock
+
+    async def test_answers_are_cached(self, documentation_search: DocumentationSearch, mock_agent: AsyncMock):
+        path = documentation_search.get_all_doc_sections()[0].file_path
+        mock_agent.return_value = SearchDocumentationOutput(relevant_documentation_file_paths=[path])
+
+        results = await documentation_search.search_documentation_by_query("How do I create an API key?", "mcp")
+        assert [s.file_path for s in results] == [path]
+
+        results = await documentation_search.search_documentation_by_query("create API key", "mcp")
+        assert [s.file_path for s in results] == [path]
+        mock_agent.assert_awaited_once()
+
+        # The usage context is part of the key
+        _ = await documentation_search.search_documentation_by_query("create API key", "other")
+        assert mock_agent.await_count == 2
+
+    async def test_fallbacks_are_not_cached(self, documentation_search: DocumentationSearch, mock_agent: AsyncMock):
+        mock_agent.side_effect = Exception("LLM error")
+
+        results = await documentation_search.search_documentation_by_query("api keys")
+        assert results
+
+        _ = await documentation_search.search_documentation_by_query("api keys")
+        assert mock_agent.await_count == 2
@@ -1,28 +1,85 @@
-from difflib import get_close_matches
+import asyncio
+import os
+from functools import cache
 
 import structlog
 
 from core.agents.suggest_model import suggest_model as suggest_model_agent
+from core.domain.models.model_data_mapping import MODEL_ALIASES
 from core.domain.models.models import Model
+from core.utils.fuzzy_matcher import FuzzyMatch, FuzzyMatcher
 
 _log = structlog.get_logger(__name__)
 
+# The LLM suggestion is only used when no local suggestion was found
+_USE_SUGGEST_MODEL_AGENT = os.environ.get("SUGGEST_MODEL_AGENT_ENABLED") == "true"
+_SUGGEST_MODEL_AGENT_TIMEOUT_SECONDS = 5
 
-async def suggest_model(model: str, deployments: list[str]) -> Model | None:
+_SUGGESTION_CUTOFF = 0.5
+
+
+@cache
+def _model_matcher() -> FuzzyMatcher[str]:
+    # Model ids take precedence over aliases
+    return FuzzyMatcher(
+        [
+            *((model.value, model.value) for model in Model),
+            *((alias, model.value) for alias, model in MODEL_ALIASES.items()),
+        ],
+    )
+
+
+def _match_model(model: str) -> FuzzyMatch[str] | None:
+    best = _model_matcher().best_match(model, cutoff=_SUGGESTION_CUTOFF)
+    # Handles provider or agent prefixes, e.g. openai/gpt-4o-mni
+    if "/" in model and (suffix := model.rsplit("/", 1)[1]):
+        suffix_match = _model_matcher().best_match(suffix, cutoff=_SUGGESTION_CUTOFF)
+        if suffix_match and (not best or suffix_match.score > best.score):
+            best = suffix_match
+    return best
+
+
+def _match_deployment(model: str, deployments: list[str]) -> FuzzyMatch[str] | None:
+    if not deployments:
+        return None
+    matcher = FuzzyMatcher((deployment, f"anotherai/deployment/{deployment}") for deployment in deployments)
+    return matcher.best_match(model, cutoff=_SUGGESTION_CUTOFF)
+
+
+def local_suggest_model(model: str, deployments: list[str]) -> str | None:
+    """Returns the closest model id or deployment to the provided string, without any IO"""
+    candidates = [m for m in (_match_model(model), _match_deployment(model, deployments)) if m]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda m: m.score).value
+
+
+async def _agent_suggest_model(model: str, deployments: list[str]) -> str | None:
     try:
-        suggested_model = await suggest_model_agent(model, [*list(Model), *deployments])
-        return Model(suggested_model)
+        async with asyncio.timeout(_SUGGEST_MODEL_AGENT_TIMEOUT_SECONDS):
+            suggested = await suggest_model_agent(model, [*list(Model), *deployments])
     except Exception:  # noqa: BLE001
-        _log.exception(
-            "Error suggesting model",
-            model=model,
-        )
-
-    suggestion = get_close_matches(model, list(Model), n=1, cutoff=0.5)
-    if not suggestion:
-        _log.warning(
-            "No similar model found for {model}",
-            model=model,
-        )
+        _log.exception("Error suggesting model", model=model)
+        return None
+    if not suggested:
         return None
-    return Model(suggestion[0])
+    if match := _model_matcher().best_match(suggested, cutoff=1):
+        return match.value
+    if suggested in deployments:
+        return f"anotherai/deployment/{suggested}"
+    _log.warning("Agent suggested an unknown model", model=model, suggested=suggested)
+    return None
+
+
+async def suggest_model(model: str, deployments: list[str], use_agent: bool | None = None) -> str | None:
+    if suggestion := local_suggest_model(model, deployments):
+        return suggestion
+
+    if use_agent if use_agent is not None else _USE_SUGGEST_MODEL_AGENT:
+        return await _agent_suggest_model(model, deployments)
+
+    _log.warning(
+        "No similar model found for {model}",
+        model=model,
+    )
+    return None
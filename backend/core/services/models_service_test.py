@@ -0,0 +1,58 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from core.domain.models.models import Model
+from core.services.models_service import local_suggest_model, suggest_model
+
+
+@pytest.fixture
+def mock_suggest_model_agent():
+    with patch("core.services.models_service.suggest_model_agent", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+class TestLocalSuggestModel:
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ("gpt4o", Model.GPT_4O_LATEST),
+            ("gpt-4o-mni", Model.GPT_4O_MINI_LATEST),
+            ("GPT_4O", Model.GPT_4O_LATEST),
+            ("openai/gpt-4.1-mni", Model.GPT_41_MINI_LATEST),
+        ],
+    )
+    def test_models(self, model: str, expected: Model):
+        assert local_suggest_model(model, []) == expected.value
+
+    def test_deployment(self):
+        assert local_suggest_model("my-agnt:prod", ["my-agent:prod", "my-agent:dev"]) == (
+            "anotherai/deployment/my-agent:prod"
+        )
+
+    def test_no_match(self):
+        assert local_suggest_model("blablabla", ["my-agent:prod"]) is None
+
+
+class TestSuggestModel:
+    async def test_local_match_does_not_call_agent(self, mock_suggest_model_agent: AsyncMock):
+        assert await suggest_model("gpt4o", [], use_agent=True) == Model.GPT_4O_LATEST.value
+        mock_suggest_model_agent.assert_not_awaited()
+
+    async def test_no_match_without_agent(self, mock_suggest_model_agent: AsyncMock):
+        assert await suggest_model("blablabla", [], use_agent=False) is None
+        mock_suggest_model_agent.assert_not_awaited()
+
+    async def test_agent_fallback(self, mock_suggest_model_agent: AsyncMock):
+        mock_suggest_model_agent.return_value = "my-deployment"
+        assert await suggest_model("blablabla", ["my-deployment"], use_agent=True) == (
+            "anotherai/deployment/my-deployment"
+        )
+
+    async def test_agent_unknown_suggestion(self, mock_suggest_model_agent: AsyncMock):
+        mock_suggest_model_agent.return_value = "not-a-model"
+        assert await suggest_model("blablabla", [], use_agent=True) is None
+
+    async def test_agent_error(self, mock_suggest_model_agent: AsyncMock):
+        mock_suggest_model_agent.side_effect = Exception("Agent error")
+        assert await suggest_model("blablabla", [], use_agent=True) is None
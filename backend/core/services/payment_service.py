@@ -1,12 +1,33 @@
+from datetime import timedelta
 from typing import Protocol
 
 import structlog
 
 from core.domain.tenant_data import TenantData
 from core.storage.tenant_storage import TenantStorage
+from core.utils.tiered_cache import TieredCache
 
 _log = structlog.get_logger(__name__)
 
+# Balances as of the last applied credit decrement or top up, shared between workers and the API so that
+# the pre request credit check does not depend on how fresh the authenticated tenant is
+_CREDIT_BALANCE_TTL = timedelta(seconds=30)
+# No in-process tier: a top up refreshes the shared balance and must be visible to all processes right away
+_credit_balance_cache = TieredCache[float](namespace="credit_balance", ttl=_CREDIT_BALANCE_TTL, local_capacity=0)
+
+
+async def cache_credit_balance(tenant: TenantData) -> None:
+    """Stores the balance of the tenant, to call every time the credits of a tenant change"""
+    await _credit_balance_cache.set(str(tenant.uid), tenant.current_credits_usd)
+
+
+async def with_cached_credit_balance(tenant: TenantData) -> TenantData:
+    """Returns the tenant with the last known credit balance, if any"""
+    balance = await _credit_balance_cache.get(str(tenant.uid))
+    if balance is None or balance == tenant.current_credits_usd:
+        return tenant
+    return tenant.model_copy(update={"current_credits_usd": balance})
+
 
 class PaymentHandler(Protocol):
     async def handle_credit_decrement(self, tenant: TenantData) -> None: ...
@@ -26,5 +47,6 @@ class PaymentService:
 
     async def decrement_credits(self, credits: float) -> None:
         new_data = await self._tenant_storage.decrement_credits(credits=credits)
+        await cache_credit_balance(new_data)
         if self._payment_handler:
             await self._payment_handler.handle_credit_decrement(new_data)
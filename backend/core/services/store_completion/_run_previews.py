@@ -8,7 +8,7 @@ from core.domain.agent_input import AgentInput
 from core.domain.agent_output import AgentOutput
 from core.domain.message import Message
 from core.domain.tool_call import ToolCallRequest
-from core.utils.previews import DEFAULT_PREVIEW_MAX_LEN, compute_preview
+from core.utils.previews import DEFAULT_PREVIEW_MAX_LEN, compute_preview, file_preview
 
 _log = get_logger(__name__)
 
@@ -27,8 +27,10 @@ def _message_preview(message: Message, max_len: int, role: str):
     role = role.capitalize()
 
     content = message.content[0]
-    if content.file:
-        return f"{role}: {compute_preview(content.file, max_len=max_len)}"
+    if file := content.file:
+        # Not dumping the file, which can contain large base64 data, when its preview is known
+        preview = file_preview(file.content_type, storage_url=file.storage_url, url=file.url, data=file.data)
+        return f"{role}: {preview or compute_preview(file, max_len=max_len)}"
 
     if content.text:
         return f"{role}: {compute_preview(content.text, max_len=max_len)}"
@@ -1,6 +1,8 @@
 # pyright: reportPrivateUsage=false
 
 
+from unittest.mock import patch
+
 from core.domain.file import File
 from core.domain.message import Message, MessageContent
 from core.domain.tool_call import ToolCallRequest, ToolCallResult
@@ -240,3 +242,11 @@ class TestInputPreview:
         variables = {"value": "Hello, world!"}
 
         assert _input_preview(variables, [messages]) == 'value: "Hello, world!" | User: Hello, world!'
+
+
+class TestMessagePreviewWithFile:
+    def test_file_data_is_not_dumped(self):
+        file = File(data="a" * 1_000_000, content_type="audio/wav")
+        messages = [Message(content=[MessageContent(file=file)], role="user")]
+        with patch.object(File, "model_dump", side_effect=AssertionError("should not be called")):
+            assert _messages_list_preview(messages) == "User: [[audio:]]"
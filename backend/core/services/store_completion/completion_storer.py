@@ -10,7 +10,6 @@ from core.storage.agent_storage import AgentStorage
 from core.storage.completion_storage import CompletionStorage
 from core.storage.file_storage import FileStorage
 from core.utils.coroutines import capture_errors
-from core.utils.hash import hash_string
 
 log = structlog.get_logger(__name__)
 
@@ -73,7 +72,7 @@ class CompletionStorer:
 
 
 def _file_cache_key(file: File) -> str:
-    return file.url or hash_string(file.data or "")
+    return file.url or file.data_hash() or ""
 
 
 def _file_iterator(completion: AgentCompletion) -> Iterator[File]:
@@ -17,7 +17,7 @@ from core.domain.exceptions import (
 )
 from core.domain.tenant_data import TenantData
 from core.services.email_service import EmailService
-from core.services.payment_service import PaymentHandler
+from core.services.payment_service import PaymentHandler, cache_credit_balance
 from core.storage.tenant_storage import AutomaticPayment, TenantStorage
 from core.utils.background import add_background_task
 from core.utils.fields import datetime_factory
@@ -212,9 +212,10 @@ class StripeService(PaymentHandler):
             parsed_metadata = _IntentMetadata.model_validate(metadata)
             if parsed_metadata.trigger == "automatic":
                 await self._tenant_storage.unlock_payment_for_success(amount)
-                return
-            # Otherwise we just need to add the credits
-            await self._tenant_storage.add_credits(amount)
+                tenant = None
+            else:
+                # Otherwise we just need to add the credits
+                tenant = await self._tenant_storage.add_credits(amount)
         except Exception as e:
             # Wrap everything in an InternalError to make sure it's easy to spot
             raise InternalError(
@@ -222,6 +223,19 @@ class StripeService(PaymentHandler):
                 extra={"metadata": metadata, "amount": amount},
             ) from e
 
+        # Outside of the try block, the credits were added so the webhook must not fail
+        try:
+            await self._refresh_credit_balance(tenant)
+        except Exception as e:  # noqa: BLE001
+            _log.exception("Failed to refresh the cached credit balance", exc_info=e)
+
+    async def _refresh_credit_balance(self, tenant: TenantData | None):
+        # The cached balance is only written on decrements so without a refresh, credit checks
+        # would keep rejecting requests until the cached balance expires
+        if tenant is None:
+            tenant = await self._tenant_storage.current_tenant()
+        await cache_credit_balance(tenant)
+
     async def _handle_payment_requires_action(self, metadata: dict[str, str]):
         parsed_metadata = _IntentMetadata.model_validate(metadata)
         if parsed_metadata.trigger == "automatic":
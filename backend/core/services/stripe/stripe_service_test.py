@@ -436,6 +436,59 @@ class TestStripeWebhook:
         mock_tenant_storage.add_credits.assert_not_called()
 
 
+class TestHandlePaymentSuccess:
+    @pytest.fixture
+    def mock_cache_credit_balance(self):
+        with patch("core.services.stripe.stripe_service.cache_credit_balance") as mock:
+            yield mock
+
+    async def test_manual_payment_refreshes_balance(
+        self,
+        stripe_service: StripeService,
+        mock_tenant_storage: Mock,
+        mock_cache_credit_balance: Mock,
+    ):
+        tenant = fake_tenant(current_credits_usd=10.0)
+        mock_tenant_storage.add_credits.return_value = tenant
+
+        await stripe_service._handle_payment_success({"tenant": "test-tenant", "tenant_uid": "1"}, 10.0)
+
+        mock_cache_credit_balance.assert_awaited_once_with(tenant)
+
+    async def test_automatic_payment_refreshes_balance(
+        self,
+        stripe_service: StripeService,
+        mock_tenant_storage: Mock,
+        mock_cache_credit_balance: Mock,
+    ):
+        tenant = fake_tenant(current_credits_usd=10.0)
+        mock_tenant_storage.current_tenant.return_value = tenant
+
+        await stripe_service._handle_payment_success(
+            {"tenant": "test-tenant", "tenant_uid": "1", "trigger": "automatic"},
+            10.0,
+        )
+
+        mock_tenant_storage.unlock_payment_for_success.assert_called_once_with(10.0)
+        mock_cache_credit_balance.assert_awaited_once_with(tenant)
+
+    async def test_refresh_failure_is_not_raised(
+        self,
+        stripe_service: StripeService,
+        mock_tenant_storage: Mock,
+        mock_cache_credit_balance: Mock,
+    ):
+        mock_tenant_storage.current_tenant.side_effect = Exception("boom")
+
+        await stripe_service._handle_payment_success(
+            {"tenant": "test-tenant", "tenant_uid": "1", "trigger": "automatic"},
+            10.0,
+        )
+
+        mock_tenant_storage.unlock_payment_for_success.assert_called_once_with(10.0)
+        mock_cache_credit_balance.assert_not_called()
+
+
 class TestHandleCreditDecrement:
     @pytest.fixture
     def test_org(self, mock_tenant_storage: AsyncMock):
@@ -1,62 +1,141 @@
-import base64
 import hashlib
-import mimetypes
-from typing import override
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from typing import IO, override
 
 from azure.core.exceptions import ResourceExistsError
 from azure.core.pipeline.transport import AioHttpTransport
 from azure.storage.blob.aio import BlobClient, BlobServiceClient
 
 from core.domain.file import File
-from core.storage.file_storage import CouldNotStoreFileError, FileStorage
+from core.storage.file_storage import CouldNotStoreFileError, FileStorage, content_addressed_key, spool
+
+# Blobs larger than this are uploaded as blocks in parallel
+_MAX_SINGLE_PUT_SIZE = 4 * 1024 * 1024
+_MAX_BLOCK_SIZE = 4 * 1024 * 1024
+_MAX_UPLOAD_CONCURRENCY = 4
+# Checking for existence costs a round trip so it is only worth it when the upload is large
+_EXISTENCE_CHECK_MIN_SIZE = 1024 * 1024
+
+
+def build_blob_service_client(connection_string: str) -> BlobServiceClient:
+    return BlobServiceClient.from_connection_string(
+        connection_string,
+        # TODO: refine these settings after monitoring performance
+        transport=AioHttpTransport(
+            connection_timeout=300.0,
+            read_timeout=300.0,
+            retries=3,
+            maximum_valid_request_size=500 * 1024 * 1024,
+        ),
+        max_single_put_size=_MAX_SINGLE_PUT_SIZE,
+        max_block_size=_MAX_BLOCK_SIZE,
+    )
+
+
+class AzureBlobFileStorageBuilder:
+    """Builds file storages that share a single, long lived, blob service client
+    so that uploads reuse the same connection pool"""
+
+    def __init__(self, connection_string: str, container_name: str):
+        self._connection_string = connection_string
+        self._container_name = container_name
+        self._blob_service_client: BlobServiceClient | None = None
+
+    def _client(self) -> BlobServiceClient:
+        # Created lazily since the transport must be created within the running event loop
+        if self._blob_service_client is None:
+            self._blob_service_client = build_blob_service_client(self._connection_string)
+        return self._blob_service_client
+
+    def __call__(self, tenant_uid: int) -> "AzureBlobFileStorage":
+        return AzureBlobFileStorage(
+            connection_string=self._connection_string,
+            container_name=self._container_name,
+            tenant_uid=tenant_uid,
+            blob_service_client=self._client(),
+        )
+
+    async def close(self) -> None:
+        if self._blob_service_client:
+            await self._blob_service_client.close()
+            self._blob_service_client = None
 
 
 class AzureBlobFileStorage(FileStorage):
-    def __init__(self, connection_string: str, container_name: str, tenant_uid: int):
+    def __init__(
+        self,
+        connection_string: str,
+        container_name: str,
+        tenant_uid: int,
+        blob_service_client: BlobServiceClient | None = None,
+    ):
         self.connection_string = connection_string
         self.container_name = container_name
         self.tenant_uid = tenant_uid
+        self._blob_service_client = blob_service_client
 
     async def _get_blob_service_client(self) -> BlobServiceClient:
-        return BlobServiceClient.from_connection_string(
-            self.connection_string,
-            # TODO: refine these settings after monitoring performance
-            transport=AioHttpTransport(
-                connection_timeout=300.0,
-                read_timeout=300.0,
-                retries=3,
-                maximum_valid_request_size=500 * 1024 * 1024,
-            ),
-        )
+        return build_blob_service_client(self.connection_string)
 
-    @override
-    async def store_file(self, file: File, folder: str) -> str:
-        if not file.data:
-            await file.download()
-        if not file.data:
-            raise CouldNotStoreFileError("File data is required")
+    @asynccontextmanager
+    async def _blob_service(self) -> AsyncIterator[BlobServiceClient]:
+        if self._blob_service_client:
+            yield self._blob_service_client
+            return
+        # No shared client, using a client for this operation only
+        async with await self._get_blob_service_client() as blob_service_client:
+            yield blob_service_client
 
-        bs = base64.b64decode(file.data.encode())
-        content_hash = hashlib.sha256(bs).hexdigest()
-        extension = mimetypes.guess_extension(file.content_type) if file.content_type else None
-        blob_name = f"{self.tenant_uid}/{folder}/{content_hash}{extension or ''}"
+    async def _upload(self, blob_client: BlobClient, data: bytes | IO[bytes], size: int, content_type: str | None):
+        if size >= _EXISTENCE_CHECK_MIN_SIZE and await blob_client.exists():
+            # Blobs are content addressed so an existing blob has the same content
+            return
+        # If the file already exists, we don't need to do anything
+        with suppress(ResourceExistsError):
+            await blob_client.upload_blob(
+                data,
+                length=size,
+                content_type=content_type,
+                overwrite=False,
+                max_concurrency=_MAX_UPLOAD_CONCURRENCY,
+            )
 
-        async with await self._get_blob_service_client() as blob_service_client:
+    async def _store(
+        self,
+        content_hash: str,
+        data: bytes | IO[bytes],
+        size: int,
+        content_type: str | None,
+        folder: str,
+    ) -> str:
+        blob_name = f"{self.tenant_uid}/{content_addressed_key(folder, content_hash, content_type)}"
+        async with self._blob_service() as blob_service_client:
             try:
                 blob_client: BlobClient = blob_service_client.get_blob_client(
                     container=self.container_name,
                     blob=blob_name,
                 )
-
-                try:
-                    await blob_client.upload_blob(
-                        bs,
-                        content_type=file.content_type,
-                        overwrite=False,
-                    )
-                    return blob_client.url  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
-                except ResourceExistsError:
-                    # If the file already exists, we don't need to do anything
-                    return blob_client.url  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+                await self._upload(blob_client, data, size, content_type)
+                return blob_client.url  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
             except Exception as e:
                 raise CouldNotStoreFileError("Error while uploading blob") from e
+
+    @override
+    async def store_file(self, file: File, folder: str) -> str:
+        if not file.data:
+            await file.download()
+        content = file.content_bytes()
+        if not content:
+            raise CouldNotStoreFileError("File data is required")
+
+        return await self.store_bytes(content, file.content_type, folder)
+
+    @override
+    async def store_bytes(self, data: bytes, content_type: str | None, folder: str) -> str:
+        return await self._store(hashlib.sha256(data).hexdigest(), data, len(data), content_type, folder)
+
+    @override
+    async def store_stream(self, chunks: AsyncIterable[bytes], content_type: str | None, folder: str) -> str:
+        async with spool(chunks) as spooled:
+            return await self._store(spooled.sha256, spooled.file, spooled.size, content_type, folder)
@@ -1,10 +1,13 @@
 import base64
+import hashlib
+from unittest.mock import AsyncMock, Mock
 
 import httpx
 import pytest
+from azure.core.exceptions import ResourceExistsError
 
 from core.domain.file import File
-from core.storage.azure.azure_blob_file_storage import AzureBlobFileStorage
+from core.storage.azure.azure_blob_file_storage import AzureBlobFileStorage, AzureBlobFileStorageBuilder
 from tests.utils import fixture_bytes
 
 _TEST_AZURE_BLOB_DSN_TEST = "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
@@ -61,3 +64,95 @@ async def test_store_file(azure_blob_storage: AzureBlobFileStorage):
         response = await client.get(url)
     response = response.raise_for_status()
     assert response.content == file_data
+
+
+@pytest.fixture
+def mock_blob_client():
+    blob_client = Mock()
+    blob_client.url = "https://blob/url"
+    blob_client.exists = AsyncMock(return_value=False)
+    blob_client.upload_blob = AsyncMock()
+    return blob_client
+
+
+@pytest.fixture
+def mock_blob_service_client(mock_blob_client: Mock):
+    blob_service_client = Mock()
+    blob_service_client.get_blob_client.return_value = mock_blob_client
+    return blob_service_client
+
+
+@pytest.fixture
+def mocked_blob_storage(mock_blob_service_client: Mock):
+    return AzureBlobFileStorage(
+        connection_string=_TEST_AZURE_BLOB_DSN_TEST,
+        container_name=_TEST_AZURE_BLOB_CONTAINER,
+        tenant_uid=1,
+        blob_service_client=mock_blob_service_client,
+    )
+
+
+class TestStoreFileWithSharedClient:
+    async def test_small_file_skips_existence_check(
+        self,
+        mocked_blob_storage: AzureBlobFileStorage,
+        mock_blob_client: Mock,
+    ):
+        url = await mocked_blob_storage.store_file(
+            File(data=base64.b64encode(b"hello").decode(), content_type="image/png"),
+            "folder",
+        )
+        assert url == "https://blob/url"
+        mock_blob_client.exists.assert_not_awaited()
+        mock_blob_client.upload_blob.assert_awaited_once()
+
+    async def test_large_existing_file_is_not_uploaded(
+        self,
+        mocked_blob_storage: AzureBlobFileStorage,
+        mock_blob_client: Mock,
+    ):
+        mock_blob_client.exists.return_value = True
+        data = base64.b64encode(b"a" * 2 * 1024 * 1024).decode()
+
+        url = await mocked_blob_storage.store_file(File(data=data, content_type="image/png"), "folder")
+        assert url == "https://blob/url"
+        mock_blob_client.upload_blob.assert_not_awaited()
+
+    async def test_already_exists_error_is_ignored(
+        self,
+        mocked_blob_storage: AzureBlobFileStorage,
+        mock_blob_client: Mock,
+    ):
+        mock_blob_client.upload_blob.side_effect = ResourceExistsError("exists")
+
+        url = await mocked_blob_storage.store_file(
+            File(data=base64.b64encode(b"hello").decode(), content_type="image/png"),
+            "folder",
+        )
+        assert url == "https://blob/url"
+
+    async def test_store_stream(
+        self,
+        mocked_blob_storage: AzureBlobFileStorage,
+        mock_blob_client: Mock,
+        mock_blob_service_client: Mock,
+    ):
+        async def _chunks():
+            yield b"hello"
+            yield b"world"
+
+        url = await mocked_blob_storage.store_stream(_chunks(), "image/png", "folder")
+        assert url == "https://blob/url"
+
+        blob_name = mock_blob_service_client.get_blob_client.call_args.kwargs["blob"]
+        assert blob_name == f"1/folder/{hashlib.sha256(b'helloworld').hexdigest()}.png"
+        assert mock_blob_client.upload_blob.call_args.kwargs["length"] == 10
+
+
+async def test_builder_shares_client():
+    builder = AzureBlobFileStorageBuilder(_TEST_AZURE_BLOB_DSN_TEST, _TEST_AZURE_BLOB_CONTAINER)
+    storage1 = builder(1)
+    storage2 = builder(2)
+    assert storage1._blob_service_client is storage2._blob_service_client  # pyright: ignore[reportPrivateUsage]
+    assert storage2.tenant_uid == 2
+    await builder.close()
@@ -5,11 +5,13 @@ from uuid import UUID
 
 import structlog
 from pydantic import BaseModel, Field, TypeAdapter, field_serializer, field_validator
+from pydantic_core import from_json
 
 from core.domain.agent import Agent
 from core.domain.agent_completion import AgentCompletion
 from core.domain.agent_input import AgentInput
 from core.domain.agent_output import AgentOutput
+from core.domain.error import Error
 from core.domain.inference_usage import InferenceUsage
 from core.domain.message import Message
 from core.domain.trace import LLMTrace, ToolTrace, Trace
@@ -179,14 +181,20 @@ class ClickhouseCompletion(BaseModel):
         )
 
     def _domain_version(self) -> Version:
-        payload: dict[str, Any] = _from_stringified_json(self.version) or {}
+        if not self.version:
+            return Version.model_validate({"id": self.version_id, "model": self.version_model or None})
+        # Validating the JSON directly parses it in a single pass without building intermediate dicts
+        version = Version.model_validate_json(self.version)
+        # The dedicated columns take precedence over the serialized version
         if self.version_id:
-            payload["id"] = self.version_id
+            version.id = self.version_id
         if self.version_model:
-            payload["model"] = self.version_model
-        return Version.model_validate(payload)
+            version.model = self.version_model
+        return version
 
     def to_domain(self, agent: Agent | None = None) -> AgentCompletion:
+        # JSON columns are decoded eagerly. Columns that were not selected keep their empty default
+        # and are never decoded, so callers that do not need the large columns should exclude them
         agent = agent or Agent(id=self.agent_id, uid=0)
 
         return AgentCompletion(
@@ -298,8 +306,9 @@ def _from_stringified_json(data: str) -> Any:
     if not data:
         return None
     try:
-        return json.loads(data)
-    except json.JSONDecodeError:
+        # pydantic's JSON parser is an order of magnitude faster than json.loads
+        return from_json(data)
+    except ValueError:
         return data
 
 
@@ -311,10 +320,19 @@ def _sanitize_metadata_value(value: Any) -> str:
     return json.dumps(value)
 
 
+# First characters of a JSON document that is not a string
+_JSON_VALUE_START = frozenset('{["-0123456789tfn')
+
+
 def _from_sanitized_metadata_value(value: str) -> Any:
+    # Most metadata values are plain strings, checking the first character avoids
+    # raising and catching a decode error for each of them
+    stripped = value.lstrip()
+    if not stripped or stripped[0] not in _JSON_VALUE_START:
+        return value
     try:
-        return json.loads(value)
-    except json.JSONDecodeError:
+        return from_json(value)
+    except ValueError:
         return value
 
 
@@ -356,5 +374,5 @@ def _output_to_domain(output_messages: str, output_error: str, preview: str, id:
         "preview": preview,
     }
     payload["messages"] = parse_messages(output_messages)
-    payload["error"] = _from_stringified_json(output_error)
+    payload["error"] = Error.model_validate_json(output_error) if output_error else None
     return AgentOutput.model_validate(payload)
@@ -1,9 +1,20 @@
 # pyright: reportPrivateUsage=false
 
 from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import patch
 from uuid import UUID
 
-from core.storage.clickhouse._models._ch_completion import DEFAULT_EXCLUDE, ClickhouseCompletion, _Trace
+import pytest
+
+from core.domain.agent_output import AgentOutput
+from core.domain.error import Error
+from core.storage.clickhouse._models._ch_completion import (
+    DEFAULT_EXCLUDE,
+    ClickhouseCompletion,
+    _Trace,
+    from_sanitized_metadata,
+)
 from tests.fake_models import fake_completion, fake_llm_trace
 
 
@@ -139,12 +150,71 @@ class TestClickhouseCompletion:
         ch_completion = ClickhouseCompletion.from_domain(1, completion)
         assert ch_completion.model_fields_set == set(ClickhouseCompletion.model_fields)
 
+    def test_to_domain_with_error(self):
+        completion = fake_completion(
+            status="failure",
+            agent_output=AgentOutput(error=Error(code="timeout", message="Timed out", status_code=504)),
+        )
+        domain = ClickhouseCompletion.from_domain(1, completion).to_domain(agent=completion.agent)
+        assert domain.status == "failure"
+        assert domain.agent_output.error == completion.agent_output.error
+
+    def test_version_columns_take_precedence(self):
+        ch_completion = ClickhouseCompletion.from_domain(1, fake_completion())
+        ch_completion.version_id = "other_version_id"
+        ch_completion.version_model = "other-model"
+
+        version = ch_completion.to_domain().version
+        assert version.id == "other_version_id"
+        assert version.model == "other-model"
+        assert version.temperature == 0.5
+
+    def test_version_columns_only(self):
+        ch_completion = ClickhouseCompletion(version_id="version_id", version_model="gpt-4o")
+        version = ch_completion.to_domain().version
+        assert version.id == "version_id"
+        assert version.model == "gpt-4o"
+
+    def test_excluded_columns_are_not_decoded(self):
+        stored = ClickhouseCompletion.from_domain(1, fake_completion()).model_dump()
+        selected = ClickhouseCompletion.select(exclude=DEFAULT_EXCLUDE)
+        ch_completion = ClickhouseCompletion.model_validate({k: stored[k] for k in selected})
+
+        with patch("core.storage.clickhouse._models._ch_completion._Messages.validate_json") as mock_validate:
+            domain = ch_completion.to_domain()
+            mock_validate.assert_not_called()
+
+        assert domain.messages == []
+        assert domain.traces == []
+        assert domain.agent_input.messages is None
+        assert domain.agent_output.messages is None
+
 
 def test_default_exclude():
     field_names = set(ClickhouseCompletion.model_fields.keys())
     assert DEFAULT_EXCLUDE.issubset(field_names)
 
 
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        pytest.param("hello", "hello", id="string"),
+        pytest.param("", "", id="empty"),
+        pytest.param("1", 1, id="int"),
+        pytest.param("-1.5", -1.5, id="float"),
+        pytest.param("true", True, id="bool"),
+        pytest.param("null", None, id="null"),
+        pytest.param("[1,2]", [1, 2], id="array"),
+        pytest.param('{"a":1}', {"a": 1}, id="object"),
+        pytest.param('"quoted"', "quoted", id="json string"),
+        pytest.param("tomorrow", "tomorrow", id="invalid json"),
+        pytest.param("{not json", "{not json", id="invalid object"),
+    ],
+)
+def test_from_sanitized_metadata(value: str, expected: Any):
+    assert from_sanitized_metadata({"key": value}) == {"key": expected}
+
+
 class TestTrace:
     def test_exhaustive(self):
         trace = fake_llm_trace()
@@ -1,5 +1,7 @@
+import asyncio
 import re
-from collections.abc import Iterable, Iterator, Sequence
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Sequence
+from datetime import timedelta
 from typing import Any, NamedTuple, cast, final, override
 from uuid import UUID
 
@@ -19,14 +21,22 @@ from core.storage.clickhouse._models._ch_completion import ClickhouseCompletion
 from core.storage.clickhouse._models._ch_experiment import ClickhouseExperiment
 from core.storage.clickhouse._models._ch_field_utils import data_and_columns, zip_columns
 from core.storage.clickhouse._utils import clone_client, sanitize_query, sanitize_readonly_privileges
-from core.storage.completion_storage import CompletionField, CompletionStorage
+from core.storage.completion_storage import CompletionField, CompletionStorage, ExportFormat
 from core.utils.iter_utils import safe_map
 from core.utils.strings import remove_urls
+from core.utils.uuid import uuid7_generation_time
 
 _log = structlog.get_logger(__name__)
 
 _MAX_MEMORY_USAGE = 3 * 1024 * 1024 * 1024  # 3GB
 _MAX_EXECUTION_TIME = 60  # 60 seconds
+_MAX_EXPORT_EXECUTION_TIME = 600  # 10 minutes
+_EXPORT_CHUNK_SIZE = 1024 * 1024
+
+_EXPORT_FORMATS: dict[ExportFormat, str] = {
+    "ndjson": "JSONEachRow",
+    "parquet": "Parquet",
+}
 
 
 class ParsedClickhouseError(NamedTuple):
@@ -79,9 +89,16 @@ class ClickhouseClient(CompletionStorage):
         )
         return completion
 
+    def _zip_completions(self, result: QueryResult, rows: Sequence[Sequence[Any]]) -> list[dict[str, Any]]:
+        return zip_columns(cast(Sequence[str], result.column_names), rows, nested_fields={"annotations", "traces"})
+
     def _map_completion(self, result: QueryResult, row: Sequence[Any]):
-        zipped = zip_columns(cast(Sequence[str], result.column_names), [row], nested_fields={"annotations", "traces"})
-        return ClickhouseCompletion.model_validate(zipped[0]).to_domain()
+        return ClickhouseCompletion.model_validate(self._zip_completions(result, [row])[0]).to_domain()
+
+    def _map_completions(self, result: QueryResult, rows: Sequence[Sequence[Any]]) -> list[AgentCompletion]:
+        # Zipping all rows at once so that column names are resolved once per result
+        zipped = self._zip_completions(result, rows)
+        return safe_map(zipped, lambda row: ClickhouseCompletion.model_validate(row).to_domain(), logger=_log)
 
     @override
     async def completions_by_ids(
@@ -92,22 +109,34 @@ class ClickhouseClient(CompletionStorage):
         if not completions_ids:
             return []
 
-        uuids = {f"v{i}": uuid for i, uuid in enumerate(completions_ids)}
-
         raw_exclude: set[str] = (
             {"input_variables", "input_messages", "output_messages", "traces"}
             if exclude is None
             else set(_map_fields(exclude))
         )
-        values = [f"({{{k}:UUID}}, UUIDv7ToDateTime({{{k}:UUID}}))" for k in uuids]
         selects = ClickhouseCompletion.select(exclude=raw_exclude)
+        # Ids are passed as a single array parameter and the date range of the ids bounds the primary key
+        # (tenant_uid, toDate(UUIDv7ToDateTime(id))) so that only the relevant partitions are read
+        # The range is widened by a day on each side in case the server is not in UTC
+        dates = [uuid7_generation_time(completion_id).date() for completion_id in completions_ids]
         query = f"""
-            SELECT {", ".join(selects)} FROM completions WHERE (id, created_at) IN ({", ".join(values)})
+            SELECT {", ".join(selects)} FROM completions
+            WHERE tenant_uid = {{tenant_uid:UInt32}}
+            AND toDate(UUIDv7ToDateTime(id)) BETWEEN {{min_date:Date}} AND {{max_date:Date}}
+            AND id IN {{ids:Array(UUID)}}
             """  # noqa: S608
-        result = await self._client.query(query, parameters=uuids)
+        result = await self._client.query(
+            query,
+            parameters={
+                "tenant_uid": self.tenant_uid,
+                "min_date": min(dates) - timedelta(days=1),
+                "max_date": max(dates) + timedelta(days=1),
+                # UUIDs are only quoted when formatted as strings
+                "ids": [str(completion_id) for completion_id in completions_ids],
+            },
+        )
 
-        rows = cast(list[Sequence[Any]], result.result_rows)
-        return safe_map(rows, lambda row: self._map_completion(result, row), logger=_log)
+        return self._map_completions(result, cast(list[Sequence[Any]], result.result_rows))
 
     @override
     async def completions_by_id(
@@ -130,22 +159,14 @@ class ClickhouseClient(CompletionStorage):
     async def _readonly_client(self):
         return await clone_client(self._client, self.tenant_uid)
 
-    @override
-    async def raw_query(self, query: str) -> list[dict[str, Any]]:
+    async def _readonly_request[T](self, request: Callable[[AsyncClient], Awaitable[T]]) -> T:
         # We are safe to use a raw query from the client here since the query is executed with a client
         # that is restricted to read only operations and a specific tenant_uid filter
-        query = sanitize_query(query)
         readonly_client = await self._readonly_client()
-        # We could also set these restrictions at the user level
-        query_settings: dict[str, Any] = {
-            "readonly": 1,
-            "max_memory_usage": _MAX_MEMORY_USAGE,
-            "max_execution_time": _MAX_EXECUTION_TIME,
-        }
 
         async def _perform_query():
             try:
-                return await readonly_client.query(query, settings=query_settings)
+                return await request(readonly_client)
             except DatabaseError as e:
                 err = _extract_clickhouse_error(str(e))
                 if err.code in {"497"}:
@@ -157,16 +178,46 @@ class ClickhouseClient(CompletionStorage):
                 ) from None
 
         try:
-            result = await _perform_query()
+            return await _perform_query()
         except DatabaseError:
             # Can happen after a new table was created, in which case we try sanitizing the privileges again
             await sanitize_readonly_privileges(self._client, self.tenant_uid, user=None)  # using default tenant user
-            result = await _perform_query()
+            return await _perform_query()
+
+    @override
+    async def raw_query(self, query: str) -> list[dict[str, Any]]:
+        query = sanitize_query(query)
+        # We could also set these restrictions at the user level
+        query_settings: dict[str, Any] = {
+            "readonly": 1,
+            "max_memory_usage": _MAX_MEMORY_USAGE,
+            "max_execution_time": _MAX_EXECUTION_TIME,
+        }
+
+        result = await self._readonly_request(lambda client: client.query(query, settings=query_settings))
 
         column_names = cast(tuple[str, ...], result.column_names)
 
         return [dict(zip(column_names, row, strict=False)) for row in result.result_rows]
 
+    @override
+    async def export_query(self, query: str, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        query = sanitize_query(query)
+        query_settings: dict[str, Any] = {
+            "readonly": 1,
+            "max_memory_usage": _MAX_MEMORY_USAGE,
+            "max_execution_time": _MAX_EXPORT_EXECUTION_TIME,
+        }
+        # Rows are serialized by ClickHouse and streamed as is, they are never materialized in Python
+        stream = await self._readonly_request(
+            lambda client: client.raw_stream(query, settings=query_settings, fmt=_EXPORT_FORMATS[fmt]),
+        )
+        try:
+            while chunk := await asyncio.to_thread(stream.read, _EXPORT_CHUNK_SIZE):
+                yield chunk
+        finally:
+            stream.close()
+
     @override
     async def get_version_by_id(self, agent_id: str, version_id: str) -> tuple[Version, UUID]:
         result = await self._client.query(
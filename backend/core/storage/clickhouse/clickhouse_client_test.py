@@ -29,6 +29,7 @@ from core.storage.clickhouse.clickhouse_client import (
     ClickhouseClient,
     _extract_clickhouse_error,
 )
+from core.storage.completion_storage import ExportFormat
 from core.utils.uuid import uuid7
 from tests.fake_models import fake_annotation, fake_completion, fake_experiment
 from tests.utils import fixtures_json
@@ -274,6 +275,45 @@ class TestCompletionsByIds:
         result = await client.completions_by_ids([])
         assert result == []
 
+    async def test_completions_by_ids_across_days(self, client: ClickhouseClient):
+        day_ms = 24 * 3600 * 1000
+        completions = [
+            fake_completion(id=uuid7(ms=lambda: 10 * day_ms, rand=lambda: 1)),
+            fake_completion(id=uuid7(ms=lambda: 12 * day_ms + 1, rand=lambda: 2)),
+            fake_completion(id=uuid7(ms=lambda: 20 * day_ms - 1, rand=lambda: 3)),
+        ]
+        for completion in completions:
+            _ = await client.store_completion(completion, _insert_settings)
+
+        result = await client.completions_by_ids([completions[0].id, completions[2].id])
+        assert {c.id for c in result} == {completions[0].id, completions[2].id}
+
+    async def test_completions_by_ids_other_tenant(self, client: ClickhouseClient):
+        completion = fake_completion()
+        _ = await client.store_completion(completion, _insert_settings)
+
+        other_client = ClickhouseClient(client._client, 2)
+        assert await other_client.completions_by_ids([completion.id]) == []
+
+    async def test_completions_by_ids_projection(self, client: ClickhouseClient):
+        completion = fake_completion()
+        _ = await client.store_completion(completion, _insert_settings)
+
+        result = await client.completions_by_ids(
+            [completion.id],
+            exclude={"version", "messages", "metadata", "input_variables", "input_messages", "output_messages"},
+        )
+        assert len(result) == 1
+        assert result[0].version.id == completion.version.id
+        assert result[0].version.model == completion.version.model
+        # Excluded columns are not decoded
+        assert result[0].version.temperature is None
+        assert result[0].metadata is None
+        assert result[0].agent_input.preview == completion.agent_input.preview
+        assert result[0].agent_input.variables is None
+        # Traces were not excluded
+        assert result[0].traces == completion.traces
+
     async def test_completions_by_ids_nonexistent_id(self, client: ClickhouseClient):
         # Use a valid UUID that doesn't exist in the database
         nonexistent_id = UUID(int=12345)
@@ -728,6 +768,35 @@ LIMIT 1 BY input_id
         assert e.value.details["error_type"] == error_type
 
 
+class TestExportQuery:
+    async def _export(self, client: ClickhouseClient, query: str, fmt: ExportFormat = "ndjson") -> bytes:
+        return b"".join([chunk async for chunk in client.export_query(query, fmt)])
+
+    async def test_export_ndjson(self, client: ClickhouseClient):
+        completions = [fake_completion(id_rand=i) for i in range(1, 4)]
+        for completion in completions:
+            await client.store_completion(completion, _insert_settings)
+
+        exported = await self._export(client, "SELECT id, agent_id FROM completions ORDER BY id")
+
+        rows = [json.loads(line) for line in exported.splitlines()]
+        assert [row["id"] for row in rows] == [str(c.id) for c in completions]
+        assert all(row["agent_id"] == completions[0].agent.id for row in rows)
+
+    async def test_export_parquet(self, client: ClickhouseClient):
+        await client.store_completion(fake_completion(id_rand=1), _insert_settings)
+
+        exported = await self._export(client, "SELECT id FROM completions", "parquet")
+        # Parquet files start and end with the PAR1 magic number
+        assert exported[:4] == b"PAR1"
+        assert exported[-4:] == b"PAR1"
+
+    async def test_invalid_query(self, client: ClickhouseClient):
+        with pytest.raises(InvalidQueryError) as e:
+            _ = await self._export(client, "SELECT * FROM non_existent_table")
+        assert e.value.details["error_type"] == "UNKNOWN_TABLE"
+
+
 class TestGetVersionById:
     async def test_get_version_by_id_success(self, client: ClickhouseClient):
         """Test successful retrieval of version by ID"""
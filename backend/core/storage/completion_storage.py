@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator
 from typing import Any, Literal, Protocol
 from uuid import UUID
 
@@ -6,7 +7,20 @@ from core.domain.annotation import Annotation
 from core.domain.experiment import Experiment
 from core.domain.version import Version
 
-type CompletionField = Literal["traces", "agent_id"]
+# Columns that can be excluded or included when fetching completions
+# Excluding the large JSON columns avoids transferring and decoding them
+type CompletionField = Literal[
+    "traces",
+    "agent_id",
+    "version",
+    "input_variables",
+    "input_messages",
+    "output_messages",
+    "messages",
+    "metadata",
+]
+
+type ExportFormat = Literal["ndjson", "parquet"]
 
 
 class CompletionStorage(Protocol):
@@ -30,6 +44,10 @@ class CompletionStorage(Protocol):
 
     async def raw_query(self, query: str) -> list[dict[str, Any]]: ...
 
+    def export_query(self, query: str, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        """Streams the result of a raw query serialized in the given format, without loading it in memory"""
+        ...
+
     async def get_version_by_id(self, agent_id: str, version_id: str) -> tuple[Version, UUID]: ...
 
     async def cached_completion(
@@ -1,7 +1,15 @@
-from typing import Protocol
+import hashlib
+import mimetypes
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+from typing import IO, NamedTuple, Protocol
 
 from core.domain.file import File
 
+# Streamed content larger than this is written to disk while it is hashed
+_SPOOL_MAX_MEMORY_SIZE = 1024 * 1024
+
 
 class CouldNotStoreFileError(Exception):
     pass
@@ -9,3 +17,36 @@ class CouldNotStoreFileError(Exception):
 
 class FileStorage(Protocol):
     async def store_file(self, file: File, folder: str) -> str: ...
+
+    async def store_bytes(self, data: bytes, content_type: str | None, folder: str) -> str: ...
+
+    async def store_stream(self, chunks: AsyncIterable[bytes], content_type: str | None, folder: str) -> str:
+        """Stores content that is not available in memory. Errors raised while iterating
+        over the chunks are propagated as is."""
+        ...
+
+
+def content_addressed_key(folder: str, content_hash: str, content_type: str | None) -> str:
+    extension = mimetypes.guess_extension(content_type) if content_type else None
+    return f"{folder}/{content_hash}{extension or ''}"
+
+
+class SpooledContent(NamedTuple):
+    file: IO[bytes]
+    sha256: str
+    size: int
+
+
+@asynccontextmanager
+async def spool(chunks: AsyncIterable[bytes]) -> AsyncIterator[SpooledContent]:
+    """Writes the chunks to a spooled temporary file while computing their sha256 so that content
+    addressed uploads do not have to hold the full content in memory"""
+    hasher = hashlib.sha256()
+    size = 0
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY_SIZE) as spooled:
+        async for chunk in chunks:
+            hasher.update(chunk)
+            _ = spooled.write(chunk)
+            size += len(chunk)
+        _ = spooled.seek(0)
+        yield SpooledContent(spooled, hasher.hexdigest(), size)
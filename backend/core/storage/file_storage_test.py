@@ -0,0 +1,28 @@
+import hashlib
+from collections.abc import AsyncIterator
+
+from core.storage.file_storage import content_addressed_key, spool
+
+
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def test_content_addressed_key():
+    assert content_addressed_key("folder", "abc", "image/png") == "folder/abc.png"
+    assert content_addressed_key("folder", "abc", None) == "folder/abc"
+
+
+class TestSpool:
+    async def test_spool(self):
+        async with spool(_chunks(b"hello", b" ", b"world")) as spooled:
+            assert spooled.sha256 == hashlib.sha256(b"hello world").hexdigest()
+            assert spooled.size == 11
+            assert spooled.file.read() == b"hello world"
+
+    async def test_spool_rolls_over_to_disk(self):
+        chunk = b"a" * 512 * 1024
+        async with spool(_chunks(chunk, chunk, chunk)) as spooled:
+            assert spooled.size == 3 * len(chunk)
+            assert spooled.file.read() == chunk * 3
@@ -1,4 +1,5 @@
 import json
+import time
 from collections.abc import Iterable, Sequence
 from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
@@ -10,6 +11,12 @@ from asyncpg.pool import PoolConnectionProxy
 from pydantic import BaseModel, BeforeValidator, PlainSerializer
 
 from core.domain.exceptions import DuplicateValueError, ObjectNotFoundError
+from core.storage.psql._psql_pool import acquire_unscoped, pool_stats, scope_to_tenant
+from core.utils.lru.lru_cache import LRUCache
+
+# Agent slugs are immutable and agents are only deleted with their tenant so the
+# (tenant uid, slug) -> agent uid mapping can be cached for the lifetime of the process
+_agent_uid_cache = LRUCache[tuple[int, str], int](capacity=10_000)
 
 
 class PsqlBaseStorage:
@@ -29,10 +36,26 @@ class PsqlBaseStorage:
             yield self._map_value(arg)
 
     @asynccontextmanager
-    async def _connect(self):
-        async with self._pool.acquire() as conn, conn.transaction():
-            # Set local variable for RLS
-            _ = await conn.execute(f"SET app.tenant_uid = {int(self._tenant_uid)}")
+    async def _connect(self, transaction: bool = True):
+        """Acquires a connection scoped to the tenant for RLS.
+
+        Reads can skip the transaction, which saves the BEGIN and COMMIT round trips."""
+        start = time.monotonic()
+        async with self._pool.acquire() as conn:
+            pool_stats.record_wait(time.monotonic() - start)
+            await scope_to_tenant(conn, self._tenant_uid)
+            if not transaction:
+                yield conn
+                return
+            async with conn.transaction():
+                yield conn
+
+    @asynccontextmanager
+    async def _connect_unscoped(self):
+        """Acquires a connection that is not scoped to any tenant, for tables that are not protected by RLS"""
+        start = time.monotonic()
+        async with acquire_unscoped(self._pool) as conn:
+            pool_stats.record_wait(time.monotonic() - start)
             yield conn
 
     @classmethod
@@ -79,7 +102,16 @@ class PsqlBaseStorage:
             raise DuplicateValueError("Duplicate object") from e
         return executed
 
+    def _cached_agent_uid(self, agent_id: str) -> int | None:
+        return _agent_uid_cache.peek((self._tenant_uid, agent_id))
+
+    def _cache_agent_uid(self, agent_id: str, agent_uid: int) -> None:
+        _agent_uid_cache[(self._tenant_uid, agent_id)] = agent_uid
+
     async def _agent_uid(self, conn: PoolConnectionProxy, agent_id: str) -> int:
+        if (cached := self._cached_agent_uid(agent_id)) is not None:
+            return cached
+
         agent_row = await conn.fetchrow(
             "SELECT uid FROM agents WHERE slug = $1",
             agent_id,
@@ -88,17 +120,31 @@ class PsqlBaseStorage:
         if agent_row is None:
             raise ObjectNotFoundError(object_type="agent")
 
+        self._cache_agent_uid(agent_id, agent_row["uid"])
         return agent_row["uid"]
 
     async def _agent_uids(self, conn: PoolConnectionProxy, agent_ids: set[str]) -> dict[str, int]:
         if not agent_ids:
             return {}
 
+        uids: dict[str, int] = {}
+        missing: list[str] = []
+        for agent_id in agent_ids:
+            if (cached := self._cached_agent_uid(agent_id)) is not None:
+                uids[agent_id] = cached
+            else:
+                missing.append(agent_id)
+        if not missing:
+            return uids
+
         agent_rows = await conn.fetch(
             "SELECT uid, slug FROM agents WHERE slug = ANY($1)",
-            agent_ids,
+            missing,
         )
-        return {row["slug"]: row["uid"] for row in agent_rows}
+        for row in agent_rows:
+            self._cache_agent_uid(row["slug"], row["uid"])
+            uids[row["slug"]] = row["uid"]
+        return uids
 
     async def _agent_ids(self, conn: PoolConnectionProxy, agent_uids: set[int]) -> dict[int, str]:
         if not agent_uids:
@@ -2,6 +2,7 @@
 
 
 from typing import Any
+from unittest.mock import AsyncMock, Mock
 
 import asyncpg
 import pytest
@@ -12,6 +13,7 @@ from core.domain.exceptions import ObjectNotFoundError
 from core.storage.psql._psql_base_storage import PsqlBaseStorage, _deserialize_json, psql_serialize_json
 from core.storage.psql.psql_agent_storage import PsqlAgentsStorage
 from core.storage.psql.psql_experiment_storage import PsqlExperimentStorage
+from core.utils.fields import id_uint32
 from tests.fake_models import fake_experiment
 
 
@@ -67,6 +69,35 @@ class TestAgentUid:
             await base_storage._agent_uid(purged_psql_tenant_conn, "nonexistent")
 
 
+class TestAgentUidCache:
+    @pytest.fixture
+    def storage(self):
+        # Using a random tenant uid to avoid sharing the cache with other tests
+        return PsqlBaseStorage(tenant_uid=id_uint32(), pool=Mock())
+
+    async def test_agent_uid_is_cached(self, storage: PsqlBaseStorage):
+        conn = Mock()
+        conn.fetchrow = AsyncMock(return_value={"uid": 1})
+
+        assert await storage._agent_uid(conn, "agent1") == 1
+        assert await storage._agent_uid(conn, "agent1") == 1
+        conn.fetchrow.assert_awaited_once()
+
+    async def test_agent_uids_only_fetches_missing(self, storage: PsqlBaseStorage):
+        storage._cache_agent_uid("agent1", 1)
+        conn = Mock()
+        conn.fetch = AsyncMock(return_value=[{"uid": 2, "slug": "agent2"}])
+
+        assert await storage._agent_uids(conn, {"agent1", "agent2"}) == {"agent1": 1, "agent2": 2}
+        conn.fetch.assert_awaited_once_with("SELECT uid, slug FROM agents WHERE slug = ANY($1)", ["agent2"])
+        assert storage._cached_agent_uid("agent2") == 2
+
+    def test_cache_is_scoped_by_tenant(self, storage: PsqlBaseStorage):
+        storage._cache_agent_uid("agent1", 1)
+        other = PsqlBaseStorage(tenant_uid=storage._tenant_uid + 1, pool=Mock())
+        assert other._cached_agent_uid("agent1") is None
+
+
 class TestAgentUids:
     async def test_agent_uid_existing_agent(
         self,
@@ -0,0 +1,151 @@
+import asyncio
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import asyncpg
+from asyncpg.pool import PoolConnectionProxy
+from structlog import get_logger
+
+from core.domain.metrics import send_gauge
+
+_log = get_logger(__name__)
+
+
+class PsqlConnection(asyncpg.Connection):
+    """A connection that remembers the tenant it is scoped to.
+
+    The tenant setting is a session setting that is preserved when the connection is returned
+    to the pool, so scoping a connection only requires a round trip when it was last used by
+    another tenant. Since the setting outlives the release, connections must either be scoped
+    or acquired with acquire_unscoped, otherwise they would run with the scope of the previous tenant."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._scoped_tenant_uid: int | None = None
+
+    async def scope_to_tenant(self, tenant_uid: int) -> None:
+        if self._scoped_tenant_uid == tenant_uid:
+            pool_stats.scope_hits += 1
+            return
+        _ = await self.execute(f"SET app.tenant_uid = {int(tenant_uid)}")
+        self._scoped_tenant_uid = tenant_uid
+        pool_stats.scope_misses += 1
+
+    async def unscope(self) -> None:
+        if self._scoped_tenant_uid is None:
+            return
+        # Queries that rely on the tenant setting fail when it is not set
+        _ = await self.execute("RESET app.tenant_uid")
+        self._scoped_tenant_uid = None
+
+
+async def _reset_connection(conn: asyncpg.Connection) -> None:
+    # asyncpg rolls back open transactions before calling the reset function
+    # The default reset also executes a RESET ALL, which would clear the tenant setting, and releases
+    # cursors, LISTEN registrations and advisory locks which we do not use.
+    # The tenant setting is cleared when the connection is acquired without a tenant, see acquire_unscoped
+    pass
+
+
+class PsqlPoolStats:
+    """In process statistics about the usage of the pool, reset every time metrics are sent"""
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.scope_hits = 0
+        self.scope_misses = 0
+
+    def record_wait(self, wait_seconds: float) -> None:
+        self.acquisitions += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def reset(self) -> None:
+        self.__init__()
+
+
+pool_stats = PsqlPoolStats()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+_STATEMENT_CACHE_SIZE = _env_int("PSQL_STATEMENT_CACHE_SIZE", 1024)
+
+
+async def create_psql_pool(dsn: str) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        dsn=dsn,
+        min_size=_env_int("PSQL_POOL_MIN_SIZE", 2),
+        max_size=_env_int("PSQL_POOL_MAX_SIZE", 10),
+        # Queries are built from a small set of templates so the cache of prepared statements is very effective
+        statement_cache_size=_STATEMENT_CACHE_SIZE,
+        connection_class=PsqlConnection,
+        # The asyncpg stubs type reset as a sync function but it is awaited
+        reset=_reset_connection,  # pyright: ignore[reportArgumentType]
+    )
+
+
+def send_pool_metrics(pool: asyncpg.Pool) -> None:
+    stats = pool_stats
+    acquisitions = stats.acquisitions
+    send_gauge("psql_pool_size", pool.get_size())
+    send_gauge("psql_pool_idle_size", pool.get_idle_size())
+    send_gauge("psql_pool_max_size", pool.get_max_size())
+    send_gauge("psql_statement_cache_size", _STATEMENT_CACHE_SIZE)
+    send_gauge("psql_pool_acquisitions", acquisitions)
+    send_gauge("psql_pool_wait_avg", stats.total_wait_seconds / acquisitions if acquisitions else 0)
+    send_gauge("psql_pool_wait_max", stats.max_wait_seconds)
+    scoped = stats.scope_hits + stats.scope_misses
+    send_gauge("psql_tenant_scope_hit_ratio", stats.scope_hits / scoped if scoped else 1)
+    stats.reset()
+
+
+class PsqlPoolMonitor:
+    """Periodically sends the pool metrics"""
+
+    def __init__(self, pool: asyncpg.Pool, interval_seconds: float = 60):
+        self._pool = pool
+        self._interval_seconds = interval_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+            try:
+                send_pool_metrics(self._pool)
+            except Exception as e:  # noqa: BLE001
+                _log.exception("Failed to send psql pool metrics", exc_info=e)
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+async def scope_to_tenant(conn: Any, tenant_uid: int) -> None:
+    """Sets the tenant used by row level security policies on the connection"""
+    # Pools that are not created via create_psql_pool use the default connection class
+    if scope := getattr(conn, "scope_to_tenant", None):
+        await scope(tenant_uid)
+        return
+    _ = await conn.execute(f"SET app.tenant_uid = {int(tenant_uid)}")
+
+
+@asynccontextmanager
+async def acquire_unscoped(pool: asyncpg.Pool) -> AsyncIterator[PoolConnectionProxy]:
+    """Acquires a connection that is not scoped to any tenant, clearing the scope left by a previous tenant"""
+    async with pool.acquire() as conn:
+        # Pools that are not created via create_psql_pool reset the connections on release
+        if unscope := getattr(conn, "unscope", None):
+            await unscope()
+        yield conn
@@ -0,0 +1,99 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from core.storage.psql._psql_pool import (
+    PsqlConnection,
+    PsqlPoolStats,
+    acquire_unscoped,
+    pool_stats,
+    scope_to_tenant,
+    send_pool_metrics,
+)
+
+
+class TestScopeToTenant:
+    async def test_uses_connection_scope(self):
+        conn = Mock()
+        conn.scope_to_tenant = AsyncMock()
+
+        await scope_to_tenant(conn, 1)
+        conn.scope_to_tenant.assert_awaited_once_with(1)
+        conn.execute.assert_not_called()
+
+    async def test_default_connection(self):
+        conn = Mock(spec=["execute"])
+        conn.execute = AsyncMock()
+
+        await scope_to_tenant(conn, 1)
+        conn.execute.assert_awaited_once_with("SET app.tenant_uid = 1")
+
+
+def _scoped_connection(tenant_uid: int | None) -> Mock:
+    conn = Mock(_scoped_tenant_uid=tenant_uid, execute=AsyncMock())
+    conn.unscope = lambda: PsqlConnection.unscope(conn)  # pyright: ignore[reportArgumentType]
+    return conn
+
+
+def _pool(conn: Mock) -> Mock:
+    @asynccontextmanager
+    async def _acquire():
+        yield conn
+
+    return Mock(acquire=_acquire)
+
+
+class TestAcquireUnscoped:
+    async def test_clears_previous_scope(self):
+        conn = _scoped_connection(1)
+        async with acquire_unscoped(_pool(conn)) as acquired:
+            assert acquired is conn
+        conn.execute.assert_awaited_once_with("RESET app.tenant_uid")
+        assert conn._scoped_tenant_uid is None
+
+    async def test_unscoped_connection(self):
+        conn = _scoped_connection(None)
+        async with acquire_unscoped(_pool(conn)):
+            pass
+        conn.execute.assert_not_called()
+
+    async def test_default_connection(self):
+        conn = Mock(spec=["execute"])
+        async with acquire_unscoped(_pool(conn)) as acquired:
+            assert acquired is conn
+
+
+class TestPsqlPoolStats:
+    def test_record_wait(self):
+        stats = PsqlPoolStats()
+        stats.record_wait(0.1)
+        stats.record_wait(0.3)
+        assert stats.acquisitions == 2
+        assert stats.total_wait_seconds == pytest.approx(0.4)
+        assert stats.max_wait_seconds == 0.3
+
+        stats.reset()
+        assert stats.acquisitions == 0
+        assert stats.max_wait_seconds == 0
+
+
+def test_send_pool_metrics():
+    pool = Mock()
+    pool.get_size.return_value = 5
+    pool.get_idle_size.return_value = 3
+    pool.get_max_size.return_value = 10
+    pool_stats.reset()
+    pool_stats.record_wait(0.2)
+    pool_stats.scope_hits = 3
+    pool_stats.scope_misses = 1
+
+    with patch("core.storage.psql._psql_pool.send_gauge") as mock_send_gauge:
+        send_pool_metrics(pool)
+
+    gauges = {call.args[0]: call.args[1] for call in mock_send_gauge.call_args_list}
+    assert gauges["psql_pool_size"] == 5
+    assert gauges["psql_pool_idle_size"] == 3
+    assert gauges["psql_pool_wait_max"] == 0.2
+    assert gauges["psql_tenant_scope_hit_ratio"] == 0.75
+    assert pool_stats.acquisitions == 0
@@ -1,10 +1,12 @@
 import asyncpg
 import pytest
 
+from core.storage.psql._psql_pool import acquire_unscoped, scope_to_tenant
+
 
 @pytest.fixture
 async def inserted_tenant(purged_psql: asyncpg.Pool) -> int:
-    async with purged_psql.acquire() as conn:
+    async with acquire_unscoped(purged_psql) as conn:
         uid = await conn.fetchval("INSERT INTO tenants (slug) VALUES ('test') RETURNING uid")
 
     return uid
@@ -13,7 +15,7 @@ async def inserted_tenant(purged_psql: asyncpg.Pool) -> int:
 @pytest.fixture
 async def purged_psql_tenant_conn(purged_psql: asyncpg.Pool, inserted_tenant: int):
     async with purged_psql.acquire() as conn:
-        _ = await conn.execute(f"SET app.tenant_uid = {inserted_tenant}")
+        await scope_to_tenant(conn, inserted_tenant)
         yield conn
 
 
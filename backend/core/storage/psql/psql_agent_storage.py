@@ -1,7 +1,5 @@
 from typing import override
 
-from asyncpg import UniqueViolationError
-
 from core.domain.agent import Agent
 from core.domain.exceptions import DuplicateValueError, ObjectNotFoundError
 from core.storage.agent_storage import AgentStorage
@@ -13,25 +11,41 @@ class PsqlAgentsStorage(PsqlBaseStorage, AgentStorage):
     @override
     async def store_agent(self, agent: Agent) -> None:
         if agent.uid == 0:
+            # Agents are stored for every completion so most calls are for existing agents
+            if (cached := self._cached_agent_uid(agent.id)) is not None:
+                agent.uid = cached
+                return
             agent.uid = id_uint32()
 
-        try:
-            async with self._connect() as connection:
-                _ = await connection.execute(
-                    """
-                        INSERT INTO agents (uid, slug, name)
-                        VALUES ($1, $2, $3)
-                        """,
-                    agent.uid,
-                    agent.id,
-                    agent.name,
+        async with self._connect() as connection:
+            # Returns the uid of the inserted agent or of the existing agent with the same slug
+            agent_uid = await connection.fetchval(
+                """
+                WITH inserted AS (
+                    INSERT INTO agents (uid, slug, name)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT DO NOTHING
+                    RETURNING uid
                 )
-        except UniqueViolationError:
-            try:
-                async with self._connect() as connection:
-                    agent.uid = await self._agent_uid(connection, agent.id)
-            except ObjectNotFoundError:
-                raise DuplicateValueError("Agent already exists") from None
+                SELECT uid FROM inserted
+                UNION ALL
+                SELECT uid FROM agents WHERE slug = $2
+                LIMIT 1
+                """,
+                agent.uid,
+                agent.id,
+                agent.name,
+            )
+            if agent_uid is None:
+                # Either the uid is already used or the agent was created concurrently and
+                # is not visible in the statement's snapshot
+                try:
+                    agent_uid = await self._agent_uid(connection, agent.id)
+                except ObjectNotFoundError:
+                    raise DuplicateValueError("Agent already exists") from None
+
+        agent.uid = agent_uid
+        self._cache_agent_uid(agent.id, agent_uid)
 
     @override
     async def get_agent(self, agent_id: str) -> Agent:
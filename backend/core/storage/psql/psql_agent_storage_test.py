@@ -1,8 +1,11 @@
+# pyright: reportPrivateUsage=false
+
 import asyncpg
 import pytest
 
 from core.domain.agent import Agent
 from core.domain.exceptions import ObjectNotFoundError
+from core.storage.psql._psql_base_storage import _agent_uid_cache
 from core.storage.psql.psql_agent_storage import PsqlAgentsStorage
 
 
@@ -31,3 +34,15 @@ class TestStoreAgent:
         assert agent2.uid != 0
         # The same UID should be used
         assert agent2.uid == agent.uid
+
+    async def test_store_existing_agent_not_cached(self, agent_storage: PsqlAgentsStorage):
+        agent = Agent(uid=0, id="test", name="Test Agent")
+        await agent_storage.store_agent(agent)
+
+        # Simulating another process that does not have the agent in cache
+        del _agent_uid_cache[(agent_storage._tenant_uid, "test")]
+
+        agent2 = Agent(uid=0, id="test", name="Test Agent")
+        await agent_storage.store_agent(agent2)
+        assert agent2.uid == agent.uid
+        assert agent_storage._cached_agent_uid("test") == agent.uid
@@ -92,7 +92,7 @@ class PsqlDeploymentStorage(PsqlBaseStorage, DeploymentStorage):
         return " AND ".join(where), arguments
 
     async def count_deployments(self, agent_id: str | None, include_archived: bool) -> int:
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             agent_uid = await self._agent_uid(connection, agent_id) if agent_id else None
             where, arguments = self._where_deployments(connection, 1, agent_uid, include_archived, None)
             count = await connection.fetchval(
@@ -110,7 +110,7 @@ class PsqlDeploymentStorage(PsqlBaseStorage, DeploymentStorage):
         include_archived: bool,
         limit: int,
     ) -> AsyncIterable[Deployment]:
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             agent_uid = await self._agent_uid(connection, agent_id) if agent_id else None
             where, arguments = self._where_deployments(connection, 2, agent_uid, include_archived, created_before)
             rows = await connection.fetch(
@@ -128,13 +128,13 @@ class PsqlDeploymentStorage(PsqlBaseStorage, DeploymentStorage):
                 yield self._validate(_DeploymentRow, row).to_domain()
 
     async def list_deployment_ids(self) -> AsyncIterable[str]:
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             rows = await connection.fetch("SELECT slug FROM deployments WHERE deleted_at IS NULL")
             for row in rows:
                 yield row["slug"]
 
     async def get_deployment(self, deployment_id: str) -> Deployment:
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             row = await connection.fetchrow(
                 """
                 SELECT deployments.*, agents.slug AS agent_slug FROM deployments
@@ -120,7 +120,7 @@ class PsqlExperimentStorage(PsqlBaseStorage, ExperimentStorage):
         OFFSET $2
         """  # noqa: S608 # OK here since where is defined above
 
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             rows = await connection.fetch(
                 query,
                 limit,
@@ -139,7 +139,7 @@ class PsqlExperimentStorage(PsqlBaseStorage, ExperimentStorage):
         WHERE {where} AND e.deleted_at IS NULL
         """  # noqa: S608 # OK here since where is defined above
 
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             count = await connection.fetchval(query, *arguments)
             return count or 0
 
@@ -206,7 +206,7 @@ class PsqlExperimentStorage(PsqlBaseStorage, ExperimentStorage):
         input_ids: Collection[str] | None = None,
     ) -> Experiment:
         # TODO:
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             row = await connection.fetchrow(
                 """
                 SELECT e.*, a.slug as agent_slug
@@ -603,7 +603,7 @@ class PsqlExperimentStorage(PsqlBaseStorage, ExperimentStorage):
         input_ids: Collection[str] | None = None,
         include: set[ExperimentOutputFields] | None = None,
     ) -> list[ExperimentOutput]:
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             experiment_uid = await self._experiment_uid(connection, experiment_id)
             return await self._list_experiment_completions(
                 connection,
@@ -35,7 +35,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
         return cls._validate(_TenantRow, row).to_domain()
 
     async def _tenant_where(self, where: str, *args: Any) -> TenantData:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await connection.fetchrow(
                 f"""
                 SELECT * FROM tenants
@@ -61,7 +61,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def tenant_by_api_key(self, api_key: str) -> TenantData:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await connection.fetchrow(
                 """
                 SELECT tenants.* FROM tenants LEFT JOIN api_keys ON tenants.uid = api_keys.tenant_uid
@@ -75,7 +75,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def create_tenant(self, tenant: TenantData) -> TenantData:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             with self._wrap_errors():
                 row = await connection.fetchrow(
                     """
@@ -104,7 +104,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
         # basically migrating the owner id tenant to an organization
         if not org_slug:
             org_slug = slugify(org_id)
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             try:
                 row = await connection.fetchrow(
                     """
@@ -129,7 +129,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def update_tenant_slug(self, slug: str) -> TenantData:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await connection.fetchrow(
                 """
                 UPDATE tenants SET slug = $1 WHERE uid = $2 RETURNING *
@@ -159,7 +159,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
             hashed_key=hashed_key,
         )
 
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await self._insert(connection, insert_row, "api_keys")
             if not row:
                 raise InternalError("Failed to create API key")
@@ -176,7 +176,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def delete_api_key(self, api_key_id: str) -> None:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             await connection.execute(
                 """
                 DELETE FROM api_keys WHERE slug = $1 AND tenant_uid = $2
@@ -187,7 +187,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def update_api_key_last_used_at(self, api_key_id: str, last_used_at: datetime) -> None:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             await connection.execute(
                 """
                 UPDATE api_keys SET last_used_at = $1 WHERE slug = $2 AND tenant_uid = $3
@@ -199,7 +199,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def list_api_keys(self) -> list[APIKey]:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             rows = await connection.fetch(
                 """
                 SELECT * FROM api_keys WHERE tenant_uid = $1
@@ -214,7 +214,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def decrement_credits(self, credits: float):
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await connection.fetchrow(
                 """
                 UPDATE tenants SET current_credits_usd = current_credits_usd - $1 WHERE uid = $2 RETURNING *
@@ -226,9 +226,26 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
                 raise ObjectNotFoundError(f"Tenant with uid {self._tenant_uid} not found")
             return self._validate(_TenantRow, row).to_domain()
 
+    @override
+    async def decrement_credits_for_tenants(self, credits: dict[int, float]) -> list[TenantData]:
+        if not credits:
+            return []
+        async with self._connect_unscoped() as connection:
+            rows = await connection.fetch(
+                """
+                UPDATE tenants SET current_credits_usd = tenants.current_credits_usd - d.credits
+                FROM unnest($1::bigint[], $2::float8[]) AS d(uid, credits)
+                WHERE tenants.uid = d.uid
+                RETURNING tenants.*
+                """,
+                list(credits.keys()),
+                list(credits.values()),
+            )
+            return [self._validate(_TenantRow, row).to_domain() for row in rows]
+
     @override
     async def set_customer_id(self, customer_id: str) -> TenantData:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await connection.fetchrow(
                 """
                 UPDATE tenants SET stripe_customer_id = $1 WHERE uid = $2 RETURNING *
@@ -242,7 +259,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def clear_payment_failure(self):
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             uid = await connection.fetchval(
                 """
                 UPDATE tenants SET
@@ -262,7 +279,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def update_automatic_payment(self, automatic_payment: AutomaticPayment | None) -> None:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             if automatic_payment is None:
                 uid = await connection.fetchval(
                     """
@@ -294,7 +311,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def attempt_lock_for_payment(self) -> TenantData | None:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await connection.fetchrow(
                 """
                 UPDATE tenants SET locked_for_payment = TRUE
@@ -309,7 +326,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def add_credits(self, credits: float) -> TenantData:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await connection.fetchrow(
                 """
                 UPDATE tenants SET current_credits_usd = current_credits_usd + $1 WHERE uid = $2 RETURNING *
@@ -323,7 +340,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def unlock_payment_for_success(self, amount: float) -> None:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             uid = await connection.fetchval(
                 """
                 UPDATE tenants SET
@@ -345,7 +362,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
         code: Literal["internal", "payment_failed"],
         failure_reason: str,
     ):
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             uid = await connection.fetchval(
                 """
                 UPDATE tenants SET
@@ -366,7 +383,7 @@ class PsqlTenantStorage(PsqlBaseStorage, TenantStorage):
 
     @override
     async def check_unlocked_payment_failure(self) -> TenantData.PaymentFailure | None:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await connection.fetchrow(
                 """
                 SELECT locked_for_payment, payment_failure_date, payment_failure_code, payment_failure_reason
@@ -518,6 +518,26 @@ class TestDecrementCredits:
             await tenant_storage.decrement_credits(10.0)
 
 
+class TestDecrementCreditsForTenants:
+    async def test_success(self, tenant_storage: PsqlTenantStorage, purged_psql: asyncpg.Pool) -> None:
+        tenant1 = await _insert_tenant(purged_psql, "tenant1", "owner1", current_credits_usd=100.0)
+        tenant2 = await _insert_tenant(purged_psql, "tenant2", "owner2", current_credits_usd=10.0)
+
+        result = await tenant_storage.decrement_credits_for_tenants({tenant1.uid: 25.0, tenant2.uid: 0.5, 99999: 1.0})
+
+        assert sorted((t.uid, t.current_credits_usd) for t in result) == [(tenant1.uid, 75.0), (tenant2.uid, 9.5)]
+
+        async with purged_psql.acquire() as conn:
+            rows = await conn.fetch("SELECT uid, current_credits_usd FROM tenants ORDER BY uid")
+            assert [(row["uid"], row["current_credits_usd"]) for row in rows] == [
+                (tenant1.uid, 75.0),
+                (tenant2.uid, 9.5),
+            ]
+
+    async def test_empty(self, tenant_storage: PsqlTenantStorage) -> None:
+        assert await tenant_storage.decrement_credits_for_tenants({}) == []
+
+
 class TestTenantByUID:
     async def test_success(self, tenant_storage: PsqlTenantStorage, purged_psql: asyncpg.Pool):
         inserted_tenant = await _insert_tenant(purged_psql, "uid-tenant", "owner123")
@@ -17,7 +17,7 @@ class PsqlUserStorage(PsqlBaseStorage, UserStorage):
 
     @override
     async def last_used_organization(self, user_id: str) -> TenantData:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             row = await connection.fetchrow(
                 "SELECT tenants.* FROM users LEFT JOIN tenants ON users.last_used_organization_uid = tenants.uid WHERE users.user_id = $1",
                 user_id,
@@ -28,7 +28,7 @@ class PsqlUserStorage(PsqlBaseStorage, UserStorage):
 
     @override
     async def set_last_used_organization(self, user_id: str, organization_id: str | None) -> None:
-        async with self._pool.acquire() as connection:
+        async with self._connect_unscoped() as connection:
             where_query = "org_id = $1" if organization_id else "org_id IS NULL and owner_id = $1"
 
             uid: int | None = await connection.fetchval(
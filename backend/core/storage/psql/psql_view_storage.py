@@ -41,13 +41,13 @@ class PsqlViewStorage(PsqlBaseStorage, ViewStorage):
 
     @override
     async def list_views(self) -> list[View]:
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             rows = await connection.fetch("SELECT * FROM views WHERE deleted_at IS NULL")
             return safe_map(rows, lambda x: self._validate(_ViewRow, x).to_domain(None), _log)
 
     @override
     async def list_view_folders(self, include_views: bool = True) -> list[ViewFolder]:
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             rows = await connection.fetch("SELECT * FROM view_folders WHERE deleted_at IS NULL")
 
             if include_views:
@@ -149,7 +149,7 @@ class PsqlViewStorage(PsqlBaseStorage, ViewStorage):
 
     @override
     async def retrieve_view(self, view_id: str) -> View:
-        async with self._connect() as connection:
+        async with self._connect(transaction=False) as connection:
             row = await connection.fetchrow(
                 """
                 SELECT views.*, view_folders.slug as folder_slug FROM views
@@ -1,8 +1,7 @@
 import asyncio
-import base64
 import hashlib
-import mimetypes
-from typing import NamedTuple, override
+from collections.abc import AsyncIterable
+from typing import IO, NamedTuple, override
 from urllib.parse import parse_qs, urlparse
 
 import boto3
@@ -10,7 +9,7 @@ import structlog
 from botocore.exceptions import ClientError
 
 from core.domain.file import File
-from core.storage.file_storage import CouldNotStoreFileError, FileStorage
+from core.storage.file_storage import CouldNotStoreFileError, FileStorage, content_addressed_key, spool
 
 _log = structlog.get_logger(__name__)
 
@@ -35,32 +34,56 @@ class S3FileStorage(FileStorage):
             ContentType=content_type,
         )
 
+    def _upload_fileobj(self, key: str, fileobj: IO[bytes], content_type: str):
+        # Uses multipart uploads for large files
+        self._s3_client.upload_fileobj(
+            fileobj,
+            self._config.bucket_name,
+            f"{self._tenant_uid}/{key}",
+            ExtraArgs={"ContentType": content_type},
+        )
+
     @override
     async def store_file(self, file: File, folder: str) -> str:
-        # Generate a unique filename using content hash
         if not file.data:
             await file.download()
-        if not file.data:
+        content = file.content_bytes()
+        if not content:
             raise CouldNotStoreFileError("File data is required")
 
-        bs = base64.b64decode(file.data.encode())
-        content_hash = hashlib.sha256(bs).hexdigest()
-
-        extension = mimetypes.guess_extension(file.content_type) if file.content_type else None
-        key = f"{folder}/{content_hash}{extension or ''}"
+        return await self.store_bytes(content, file.content_type, folder)
 
+    @override
+    async def store_bytes(self, data: bytes, content_type: str | None, folder: str) -> str:
+        # Generate a unique filename using content hash
+        key = content_addressed_key(folder, hashlib.sha256(data).hexdigest(), content_type)
         try:
             await asyncio.get_running_loop().run_in_executor(
                 None,
                 self._put_object,
                 key,
-                bs,
-                file.content_type or "application/octet-stream",
+                data,
+                content_type or "application/octet-stream",
             )
-
-            return self._url(key)
         except ClientError as e:
             raise CouldNotStoreFileError("Failed to store file in S3") from e
+        return self._url(key)
+
+    @override
+    async def store_stream(self, chunks: AsyncIterable[bytes], content_type: str | None, folder: str) -> str:
+        async with spool(chunks) as spooled:
+            key = content_addressed_key(folder, spooled.sha256, content_type)
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    self._upload_fileobj,
+                    key,
+                    spooled.file,
+                    content_type or "application/octet-stream",
+                )
+            except ClientError as e:
+                raise CouldNotStoreFileError("Failed to store file in S3") from e
+        return self._url(key)
 
     def _url(self, key: str) -> str:
         return f"{self._config.external_host}/{self._config.bucket_name}/{self._tenant_uid}/{key}"
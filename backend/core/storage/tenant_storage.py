@@ -30,6 +30,11 @@ class TenantStorage(Protocol):
     async def update_api_key_last_used_at(self, api_key_id: str, last_used_at: datetime) -> None: ...
 
     async def decrement_credits(self, credits: float) -> TenantData: ...
+    async def decrement_credits_for_tenants(self, credits: dict[int, float]) -> list[TenantData]:
+        """Decrements the credits of multiple tenants in a single statement, ignoring the tenant uid
+        of the storage. Returns the updated tenants, unknown tenants are skipped"""
+        ...
+
     async def set_customer_id(self, customer_id: str) -> TenantData: ...
     async def clear_payment_failure(self): ...
     async def update_automatic_payment(self, automatic_payment: AutomaticPayment | None) -> None: ...
@@ -1,5 +1,15 @@
 import asyncio
 import io
+import struct
+from collections.abc import Callable, Iterator
+from typing import BinaryIO, NamedTuple
+
+# Size of the beginning of the file read to find the headers
+_HEAD_SIZE = 16 * 1024
+# Size of the end of the file read to find the last OGG page
+_OGG_TAIL_SIZE = 64 * 1024
+# Margin for the data included in the size of the file that is not audio, e.g. tags and headers
+_SIZE_MARGIN = 1.05
 
 
 def _ffmpeg_format_from_content_type(content_type: str) -> str:
@@ -10,13 +20,366 @@ def _ffmpeg_format_from_content_type(content_type: str) -> str:
             return content_type.split("/")[1]
 
 
-def _audio_duration_seconds_sync(data: bytes, content_type: str) -> float:
+def _audio_duration_seconds_sync(data: bytes | BinaryIO, content_type: str) -> float:
     from pydub import AudioSegment
 
     _format = _ffmpeg_format_from_content_type(content_type)
-    segment = AudioSegment.from_file(io.BytesIO(data), _format)
+    if isinstance(data, bytes):
+        data = io.BytesIO(data)
+    else:
+        _ = data.seek(0)
+    segment = AudioSegment.from_file(data, _format)
     return len(segment) / 1000
 
 
-async def audio_duration_seconds(data: bytes, content_type: str) -> float:
+def _stream_size(stream: BinaryIO) -> int:
+    size = stream.seek(0, io.SEEK_END)
+    _ = stream.seek(0)
+    return size
+
+
+def _read_at(stream: BinaryIO, offset: int, size: int) -> bytes:
+    _ = stream.seek(offset)
+    return stream.read(size)
+
+
+def _bounded(duration: float, audio_size: int, max_bitrate: int) -> float | None:
+    """Returns the duration declared in the headers, or None if it is shorter than the time needed to play
+    audio_size bytes at the maximum bitrate of the format, in which case the headers are not trusted"""
+    if duration * _SIZE_MARGIN < audio_size * 8 / max_bitrate:
+        return None
+    return duration
+
+
+# ------------------------------------------------------------
+# WAV
+
+
+_WAV_PCM = 1
+_WAV_FLOAT = 3
+_WAV_EXTENSIBLE = 0xFFFE
+# Sample rates above the ones supported by audio hardware would only shorten the duration
+_WAV_MAX_SAMPLE_RATE = 768_000
+
+
+def _wav_duration(stream: BinaryIO, head: bytes, size: int) -> float | None:
+    audio_format = sample_rate = byte_rate = block_align = 0
+    fact_samples = None
+    offset = 12
+    while offset + 8 <= size:
+        chunk_header = head[offset : offset + 8] if offset + 8 <= len(head) else _read_at(stream, offset, 8)
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+        match chunk_id:
+            case b"fmt ":
+                audio_format, _, sample_rate, byte_rate, block_align = struct.unpack(
+                    "<HHIIH",
+                    head[offset + 8 : offset + 22],
+                )
+                if audio_format == _WAV_EXTENSIBLE and chunk_size >= 40:
+                    # The actual format is the first 2 bytes of the sub format GUID
+                    (audio_format,) = struct.unpack("<H", head[offset + 32 : offset + 34])
+            case b"fact":
+                (fact_samples,) = struct.unpack("<I", head[offset + 8 : offset + 12])
+            case b"data":
+                if not byte_rate or not sample_rate or sample_rate > _WAV_MAX_SAMPLE_RATE:
+                    return None
+                # Streamed WAV files can have a placeholder data size
+                data_size = min(chunk_size, size - offset - 8)
+                if audio_format in (_WAV_PCM, _WAV_FLOAT):
+                    # The size of uncompressed samples is known so the fact chunk is not needed and is ignored
+                    return data_size / byte_rate if byte_rate == sample_rate * block_align else None
+                if fact_samples is not None:
+                    return _bounded(fact_samples / sample_rate, data_size, byte_rate * 8)
+                return data_size / byte_rate
+            case _:
+                pass
+        # Chunks are word aligned
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+# ------------------------------------------------------------
+# MP3
+
+# Bitrates in kbps, indexed by [MPEG 1][layer - 1][bitrate index]
+_MP3_BITRATES = {
+    True: (
+        (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    ),
+    False: (
+        (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    ),
+}
+# Sample rates indexed by the version bits of the header, 1 is reserved
+_MP3_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),  # MPEG 2.5
+    2: (22050, 24000, 16000),  # MPEG 2
+    3: (44100, 48000, 32000),  # MPEG 1
+}
+
+
+class _MP3Frame(NamedTuple):
+    bitrate: int  # kbps
+    sample_rate: int
+    samples_per_frame: int
+    side_info_size: int
+    # Highest bitrate of the version and layer, in kbps
+    max_bitrate: int
+    size: int
+
+
+def _mp3_frame_header(header: bytes) -> _MP3Frame | None:
+    """Returns None if the bytes are not a valid frame header"""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = 4 - ((header[1] >> 1) & 0x03)
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    mono = header[3] >> 6 == 3
+    padding = (header[2] >> 1) & 0x01
+    bitrates = _MP3_BITRATES[mpeg1][layer - 1]
+    bitrate = bitrates[bitrate_index]
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    samples_per_frame = 384 if layer == 1 else 1152 if layer == 2 or mpeg1 else 576
+    side_info_size = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    # Layer I pads frames with 4 byte slots
+    size = samples_per_frame // 8 * bitrate * 1000 // sample_rate + padding * (4 if layer == 1 else 1)
+    return _MP3Frame(bitrate, sample_rate, samples_per_frame, side_info_size, max(bitrates), size)
+
+
+def _id3v2_size(head: bytes) -> int:
+    if not head.startswith(b"ID3") or len(head) < 10:
+        return 0
+    # Sizes are stored as synchsafe integers, 7 bits per byte
+    size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+    footer = 10 if head[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _xing_frame_count(frame: bytes, side_info_size: int) -> tuple[int, int] | None:
+    """Returns the number of frames and the number of samples added by the encoder
+    from a Xing / Info header, used by most encoders for VBR files"""
+    offset = 4 + side_info_size
+    if frame[offset : offset + 4] not in (b"Xing", b"Info"):
+        return None
+    (flags,) = struct.unpack(">I", frame[offset + 4 : offset + 8])
+    if not flags & 0x01:
+        return None
+    (frames,) = struct.unpack(">I", frame[offset + 8 : offset + 12])
+
+    # Skipping the byte count, table of contents and quality fields to get to the LAME tag
+    lame_offset = offset + 12 + (4 if flags & 0x02 else 0) + (100 if flags & 0x04 else 0) + (4 if flags & 0x08 else 0)
+    if frame[lame_offset : lame_offset + 4] not in (b"LAME", b"Lavf", b"Lavc"):
+        return frames, 0
+    # Encoder delay and padding are 12 bits each
+    delays = int.from_bytes(frame[lame_offset + 21 : lame_offset + 24], "big")
+    return frames, (delays >> 12) + (delays & 0xFFF)
+
+
+def _vbri_frame_count(frame: bytes) -> int | None:
+    # The VBRI header is always 32 bytes after the frame header
+    if frame[36:40] != b"VBRI":
+        return None
+    (frames,) = struct.unpack(">I", frame[50:54])
+    return frames
+
+
+def _mp3_duration(stream: BinaryIO, head: bytes, size: int) -> float | None:
+    # Offset of the head in the file
+    base = 0
+    start = _id3v2_size(head)
+    if start + 4 > len(head):
+        # Large ID3 tags, e.g. with a cover image
+        base, head, start = start, _read_at(stream, start, _HEAD_SIZE), 0
+
+    sync = head.find(b"\xff", start)
+    while sync != -1:
+        if header := _mp3_frame_header(head[sync : sync + 4]):
+            break
+        sync = head.find(b"\xff", sync + 1)
+    else:
+        return None
+
+    # Size of the frames, without the ID3v2 tag at the beginning or the ID3v1 tag at the end of the file
+    audio_size = size - base - sync
+    if audio_size > 128 and _read_at(stream, size - 128, 3) == b"TAG":
+        audio_size -= 128
+
+    max_bitrate = header.max_bitrate * 1000
+    frame = head[sync : sync + 256]
+    if xing := _xing_frame_count(frame, header.side_info_size):
+        frames, encoder_samples = xing
+        duration = (frames * header.samples_per_frame - encoder_samples) / header.sample_rate
+        return _bounded(duration, audio_size, max_bitrate)
+    if frames := _vbri_frame_count(frame):
+        return _bounded(frames * header.samples_per_frame / header.sample_rate, audio_size, max_bitrate)
+
+    # Without a VBR header the file is constant bitrate so the duration is proportional to its size.
+    # The following frame must have the same bitrate, otherwise the bitrate of the first frame is not trusted
+    if header.size < audio_size:
+        next_offset = sync + header.size
+        next_header = (
+            head[next_offset : next_offset + 4]
+            if next_offset + 4 <= len(head)
+            else _read_at(stream, base + next_offset, 4)
+        )
+        next_frame = _mp3_frame_header(next_header)
+        if next_frame is None or next_frame.bitrate != header.bitrate:
+            return None
+    return audio_size * 8 / (header.bitrate * 1000)
+
+
+# ------------------------------------------------------------
+# FLAC
+
+
+def _flac_duration(stream: BinaryIO, head: bytes, size: int) -> float | None:
+    # STREAMINFO is always the first metadata block
+    if head[4] & 0x7F != 0:
+        return None
+    # Sample rate (20 bits), channels (3 bits), bits per sample (5 bits) and total samples (36 bits)
+    (packed,) = struct.unpack(">Q", head[18:26])
+    sample_rate = packed >> 44
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate or not total_samples:
+        # The total number of samples is unknown
+        return None
+    return total_samples / sample_rate
+
+
+# ------------------------------------------------------------
+# OGG
+
+
+# Highest bitrate of a single Opus stream
+_OPUS_MAX_BITRATE = 510_000
+# Highest quality stereo Vorbis is about 500kbps
+_VORBIS_MAX_BITRATE = 640_000
+
+
+def _ogg_duration(stream: BinaryIO, head: bytes, size: int) -> float | None:
+    segment_count = head[26]
+    packet = head[27 + segment_count : 27 + segment_count + 19]
+    if packet.startswith(b"OpusHead"):
+        # Opus granule positions are always at 48kHz and include the pre-skip
+        (pre_skip,) = struct.unpack("<H", packet[10:12])
+        sample_rate = 48000
+        max_bitrate = _OPUS_MAX_BITRATE
+    elif packet.startswith(b"\x01vorbis"):
+        (sample_rate,) = struct.unpack("<I", packet[12:16])
+        pre_skip = 0
+        max_bitrate = _VORBIS_MAX_BITRATE
+    else:
+        return None
+
+    # The granule position of the last page is the total number of samples
+    tail_start = max(0, size - _OGG_TAIL_SIZE)
+    tail = _read_at(stream, tail_start, _OGG_TAIL_SIZE)
+    page = tail.rfind(b"OggS")
+    while page != -1:
+        if tail[page + 4] == 0 and len(tail) >= page + 14:
+            (granule,) = struct.unpack("<q", tail[page + 6 : page + 14])
+            # -1 is used for pages in which no packet ends
+            if granule >= 0:
+                return _bounded(max(granule - pre_skip, 0) / sample_rate, size, max_bitrate)
+        page = tail.rfind(b"OggS", 0, page)
+    return None
+
+
+# ------------------------------------------------------------
+# MP4 / M4A
+
+
+def _mp4_boxes(stream: BinaryIO, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """Yields the type, payload start and end of the boxes between start and end"""
+    offset = start
+    while offset + 8 <= end:
+        box_size, box_type = struct.unpack(">I4s", _read_at(stream, offset, 8))
+        header_size = 8
+        if box_size == 1:
+            (box_size,) = struct.unpack(">Q", stream.read(8))
+            header_size = 16
+        elif box_size == 0:
+            # The box extends to the end of the file
+            box_size = end - offset
+        if box_size < header_size:
+            return
+        yield box_type, offset + header_size, offset + box_size
+        offset += box_size
+
+
+# Highest bitrate of stereo AAC, files with a higher bitrate such as lossless ALAC are decoded
+_MP4_MAX_BITRATE = 576_000
+
+
+def _mp4_duration(stream: BinaryIO, head: bytes, size: int) -> float | None:
+    # The moov box can be at the end of the file, boxes are skipped without reading their content
+    for box_type, start, end in _mp4_boxes(stream, 0, size):
+        if box_type != b"moov":
+            continue
+        for child_type, child_start, _ in _mp4_boxes(stream, start, end):
+            if child_type != b"mvhd":
+                continue
+            mvhd = _read_at(stream, child_start, 32)
+            # Version 1 uses 64 bit times and duration
+            if mvhd[0] == 1:
+                timescale, duration = struct.unpack(">IQ", mvhd[20:32])
+            else:
+                timescale, duration = struct.unpack(">II", mvhd[12:20])
+            return _bounded(duration / timescale, size, _MP4_MAX_BITRATE) if timescale else None
+        return None
+    return None
+
+
+_DurationParser = Callable[[BinaryIO, bytes, int], float | None]
+
+
+def _duration_parser(head: bytes) -> _DurationParser | None:
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return _wav_duration
+    if head.startswith(b"fLaC"):
+        return _flac_duration
+    if head.startswith(b"OggS"):
+        return _ogg_duration
+    if head[4:8] == b"ftyp":
+        return _mp4_duration
+    if head.startswith(b"ID3") or _mp3_frame_header(head[:4]):
+        return _mp3_duration
+    return None
+
+
+def audio_duration_from_headers(data: bytes | BinaryIO) -> float | None:
+    """Computes the duration of an audio file from the headers of its container, without decoding it.
+
+    Supports WAV, MP3, FLAC, OGG (Opus and Vorbis) and MP4 / M4A. Only the first kilobytes of the file
+    are read, except for OGG and MP4 files for which the end of the file or the box headers are read.
+    Returns None when the format is not supported, the headers do not include the duration or the duration
+    they declare is not consistent with the size of the file."""
+
+    stream = io.BytesIO(data) if isinstance(data, bytes) else data
+    try:
+        size = _stream_size(stream)
+        head = stream.read(_HEAD_SIZE)
+        parser = _duration_parser(head)
+        if parser is None:
+            return None
+        duration = parser(stream, head, size)
+    except (struct.error, IndexError, ValueError):
+        return None
+    # Same precision as the decoded duration
+    return round(duration, 3) if duration is not None else None
+
+
+async def audio_duration_seconds(data: bytes | BinaryIO, content_type: str) -> float:
+    if (duration := audio_duration_from_headers(data)) is not None:
+        return duration
+    # Decoding the file with ffmpeg as a last resort
     return await asyncio.to_thread(_audio_duration_seconds_sync, data, content_type)
@@ -1,7 +1,10 @@
+import struct
+from unittest.mock import patch
+
 import pytest
 
-from core.utils.audio import audio_duration_seconds
-from tests.utils import fixture_bytes
+from core.utils.audio import audio_duration_from_headers, audio_duration_seconds
+from tests.utils import fixture_bytes, fixture_path
 
 
 class TestAudioDurationSeconds:
@@ -23,3 +26,137 @@ class TestAudioDurationSeconds:
         bs = fixture_bytes("files/sample.flac")
         dur = await audio_duration_seconds(bs, "audio/flac")
         assert dur == 8.916
+
+
+def _ogg_page(payload: bytes, granule: int) -> bytes:
+    return b"OggS\x00\x00" + struct.pack("<qIIIB", granule, 1, 0, 0, 1) + bytes([len(payload)]) + payload
+
+
+def _mp4_box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", len(payload) + 8, box_type) + payload
+
+
+def _wav(
+    data_size: int,
+    audio_format: int = 1,
+    byte_rate: int = 32000,
+    block_align: int = 2,
+    fact_samples: int | None = None,
+) -> bytes:
+    # Mono 16kHz
+    fmt = struct.pack("<4sIHHIIHH", b"fmt ", 16, audio_format, 1, 16000, byte_rate, block_align, 16)
+    fact = struct.pack("<4sII", b"fact", 4, fact_samples) if fact_samples is not None else b""
+    chunks = fmt + fact + struct.pack("<4sI", b"data", data_size) + b"\x00" * data_size
+    return struct.pack("<4sI4s", b"RIFF", len(chunks) + 4, b"WAVE") + chunks
+
+
+# MPEG 1 layer III, 128kbps, 44.1kHz
+_MP3_FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+
+
+def _xing_mp3(frames: int) -> bytes:
+    xing = b"\xff\xfb\x90\x00" + b"\x00" * 32 + b"Xing" + struct.pack(">II", 1, frames)
+    return xing + b"\x00" * (len(_MP3_FRAME) - len(xing)) + _MP3_FRAME * 100
+
+
+class TestAudioDurationFromHeaders:
+    @pytest.mark.parametrize(
+        ("fixture", "expected"),
+        [
+            pytest.param("test.wav", 3, id="wav"),
+            pytest.param("sample.mp3", 10.043, id="mp3"),
+            pytest.param("sample.flac", 8.916, id="flac"),
+        ],
+    )
+    def test_fixtures(self, fixture: str, expected: float):
+        # Same durations as the ones computed by decoding the files
+        assert audio_duration_from_headers(fixture_bytes("files", fixture)) == expected
+
+    def test_stream(self):
+        with open(fixture_path("files", "sample.mp3"), "rb") as f:
+            assert audio_duration_from_headers(f) == 10.043
+
+    def test_ogg_opus(self):
+        opus_head = b"OpusHead\x01\x02" + struct.pack("<HIhB", 312, 48000, 0, 0)
+        data = _ogg_page(opus_head, 0) + _ogg_page(b"\x00" * 100, 48000 * 2) + _ogg_page(b"\x00" * 100, 48000 * 5 + 312)
+        assert audio_duration_from_headers(data) == 5
+
+    def test_ogg_vorbis(self):
+        vorbis_head = b"\x01vorbis" + struct.pack("<IBI", 0, 2, 44100) + b"\x00" * 15
+        data = _ogg_page(vorbis_head, 0) + _ogg_page(b"\x00" * 100, 44100 * 3 // 2)
+        assert audio_duration_from_headers(data) == 1.5
+
+    def test_m4a_with_moov_at_the_end(self):
+        mvhd = _mp4_box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 12345) + b"\x00" * 80)
+        data = (
+            _mp4_box(b"ftyp", b"M4A \x00\x00\x00\x00")
+            + _mp4_box(b"mdat", b"\x00" * 50_000)
+            + _mp4_box(b"moov", mvhd + _mp4_box(b"trak", b""))
+        )
+        assert audio_duration_from_headers(data) == 12.345
+
+    def test_cbr_mp3_without_vbr_header(self):
+        data = _MP3_FRAME * 100
+        assert audio_duration_from_headers(data) == round(len(data) * 8 / 128_000, 3)
+
+    def test_pcm_wav_ignores_fact(self):
+        assert audio_duration_from_headers(_wav(60 * 32000)) == 60
+        assert audio_duration_from_headers(_wav(60 * 32000, fact_samples=1)) == 60
+
+    def test_compressed_wav_with_fact(self):
+        # IMA ADPCM, 4 bits per sample
+        data = _wav(60 * 8000, audio_format=0x11, byte_rate=8000, block_align=256, fact_samples=60 * 16000)
+        assert audio_duration_from_headers(data) == 60
+
+    def test_xing_mp3(self):
+        assert audio_duration_from_headers(_xing_mp3(101)) == round(101 * 1152 / 44100, 3)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            pytest.param(_wav(60 * 32000, byte_rate=32000 * 1000), id="wav byte rate"),
+            pytest.param(
+                _wav(60 * 8000, audio_format=0x11, byte_rate=8000, block_align=256, fact_samples=1),
+                id="wav fact",
+            ),
+            pytest.param(_xing_mp3(1), id="xing frame count"),
+            pytest.param(b"\xff\xfb\xe0\x00" + b"\x00" * 413 + _MP3_FRAME * 100, id="mp3 first frame bitrate"),
+            pytest.param(
+                _ogg_page(b"OpusHead\x01\x02" + struct.pack("<HIhB", 312, 48000, 0, 0), 0)
+                + _ogg_page(b"\x00" * 255, 0) * 1000
+                + _ogg_page(b"\x00" * 100, 48000),
+                id="ogg last granule",
+            ),
+            pytest.param(
+                _mp4_box(b"ftyp", b"M4A \x00\x00\x00\x00")
+                + _mp4_box(b"mdat", b"\x00" * 1_000_000)
+                + _mp4_box(b"moov", _mp4_box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 1) + b"\x00" * 80)),
+                id="mp4 mvhd",
+            ),
+        ],
+    )
+    def test_inconsistent_headers(self, data: bytes):
+        assert audio_duration_from_headers(data) is None
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            pytest.param(b"", id="empty"),
+            pytest.param(b"hello world" * 10, id="unknown"),
+            pytest.param(b"fLaC\x00\x00\x00\x22", id="truncated flac"),
+        ],
+    )
+    def test_unsupported(self, data: bytes):
+        assert audio_duration_from_headers(data) is None
+
+    async def test_fallback_to_decoding(self):
+        with patch("core.utils.audio._audio_duration_seconds_sync", return_value=4.2) as mock_decode:
+            assert await audio_duration_seconds(b"hello world", "audio/aac") == 4.2
+            assert await audio_duration_seconds(fixture_bytes("files", "test.wav"), "audio/wav") == 3
+        mock_decode.assert_called_once_with(b"hello world", "audio/aac")
+
+    async def test_fallback_to_decoding_with_inconsistent_headers(self):
+        data = _xing_mp3(1)
+        with patch("core.utils.audio._audio_duration_seconds_sync", return_value=4.2) as mock_decode:
+            assert await audio_duration_seconds(data, "audio/mpeg") == 4.2
+        mock_decode.assert_called_once_with(data, "audio/mpeg")
@@ -0,0 +1,189 @@
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+
+import httpx
+import structlog
+
+from core.domain.exceptions import InvalidFileError
+from core.domain.metrics import send_counter, send_duration
+from core.utils.files import guess_content_type
+
+log = structlog.get_logger(__name__)
+
+_RETRIABLE_ERRORS = (
+    httpx.ConnectTimeout,
+    httpx.ReadTimeout,
+    httpx.ReadError,
+    httpx.ConnectError,
+    httpx.RemoteProtocolError,
+)
+# Enough bytes to guess the content type from the file signature
+_SNIFF_SIZE = 64
+# Content types that do not say anything about the file
+_GENERIC_CONTENT_TYPES = {"application/octet-stream", "binary/octet-stream"}
+# Size of the response body included in errors
+_ERROR_BODY_SIZE = 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, str(default)))
+
+
+class DownloadedFile(NamedTuple):
+    content: bytes
+    # The content type returned by the server, if any
+    content_type: str | None
+
+
+def _content_type_header(response: httpx.Response) -> str | None:
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    if not content_type or content_type in _GENERIC_CONTENT_TYPES:
+        return None
+    return content_type
+
+
+class _HostSlots:
+    def __init__(self, max_concurrency: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.users = 0
+
+
+class FileDownloader:
+    """Downloads files with a shared connection pool so that files from the same host reuse connections.
+
+    Responses are streamed and downloads are aborted as soon as they exceed the maximum size.
+    The number of concurrent downloads per host is limited to avoid being rate limited by CDNs."""
+
+    def __init__(
+        self,
+        max_size: int = _env_int("FILE_DOWNLOAD_MAX_BYTES", 50 * 1024 * 1024),
+        max_concurrency_per_host: int = _env_int("FILE_DOWNLOAD_MAX_CONCURRENCY_PER_HOST", 16),
+        retries: int = 2,
+    ):
+        self._max_size = max_size
+        self._max_concurrency_per_host = max_concurrency_per_host
+        self._retries = retries
+        self._http_client: httpx.AsyncClient | None = None
+        self._hosts: dict[str, _HostSlots] = {}
+
+    def _client(self) -> httpx.AsyncClient:
+        # Created lazily since the connection pool must be created within the running event loop
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read=30.0, connect=10.0, pool=10.0, write=10.0),
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=30),
+            )
+        return self._http_client
+
+    async def close(self) -> None:
+        if self._http_client:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        host = httpx.URL(url).host
+        slots = self._hosts.get(host)
+        if slots is None:
+            slots = self._hosts[host] = _HostSlots(self._max_concurrency_per_host)
+        slots.users += 1
+        try:
+            async with slots.semaphore:
+                yield
+        finally:
+            slots.users -= 1
+            if not slots.users:
+                # Not keeping a semaphore for every host ever downloaded from
+                del self._hosts[host]
+
+    async def _read_error_body(self, response: httpx.Response) -> str:
+        body = b""
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) >= _ERROR_BODY_SIZE:
+                break
+        return body[:_ERROR_BODY_SIZE].decode(errors="replace")
+
+    async def _read(self, response: httpx.Response, url: str) -> bytes:
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self._max_size:
+            raise InvalidFileError(
+                f"File is larger than the maximum size of {self._max_size} bytes",
+                file_url=url,
+                details={"content_length": int(content_length)},
+            )
+
+        content = bytearray()
+        async for chunk in response.aiter_bytes():
+            content += chunk
+            if len(content) > self._max_size:
+                raise InvalidFileError(f"File is larger than the maximum size of {self._max_size} bytes", file_url=url)
+        return bytes(content)
+
+    async def _download_once(self, url: str) -> DownloadedFile:
+        async with self._client().stream("GET", url) as response:
+            if response.status_code != 200:
+                raise InvalidFileError(
+                    f"Failed to download file: {response.status_code}",
+                    file_url=url,
+                    details={
+                        "response_status_code": response.status_code,
+                        "response_body": await self._read_error_body(response),
+                    },
+                )
+            return DownloadedFile(await self._read(response, url), _content_type_header(response))
+
+    async def _download_with_retries(self, url: str, retries: int) -> DownloadedFile:
+        try:
+            return await self._download_once(url)
+        except _RETRIABLE_ERRORS as e:
+            if retries <= 0:
+                raise InvalidFileError(f"Failed to download file: {e}", capture=False) from e
+            return await self._download_with_retries(url, retries - 1)
+
+    async def download(self, url: str) -> DownloadedFile:
+        start = time.time()
+        success = False
+        try:
+            async with self._host_slot(url):
+                downloaded = await self._download_with_retries(url, self._retries)
+            success = True
+            send_counter("file_download_bytes", value=len(downloaded.content))
+            return downloaded
+        finally:
+            send_duration("file_download_seconds", time.time() - start, success=success)
+
+    async def sniff_content_type(self, url: str) -> str | None:
+        """Guesses the content type of a file without downloading it, first from the headers of a HEAD
+        request then from the first bytes of the file. Returns None when the content type is unknown."""
+        try:
+            async with self._host_slot(url):
+                response = await self._client().head(url)
+                if response.status_code == 200 and (content_type := _content_type_header(response)):
+                    return content_type
+
+                async with self._client().stream(
+                    "GET",
+                    url,
+                    headers={"Range": f"bytes=0-{_SNIFF_SIZE - 1}"},
+                ) as response:
+                    if response.status_code not in (200, 206):
+                        return None
+                    head = b""
+                    # Servers that do not support ranges send the whole file, only the first bytes are read
+                    async for chunk in response.aiter_bytes():
+                        head += chunk
+                        if len(head) >= _SNIFF_SIZE:
+                            break
+                    return guess_content_type(head) or _content_type_header(response)
+        except httpx.HTTPError as e:
+            log.warning("Failed to sniff content type", url=url, exc_info=e)
+            return None
+
+
+# Shared by all file downloads of the process
+file_downloader = FileDownloader()
@@ -0,0 +1,99 @@
+# pyright: reportPrivateUsage=false
+
+import asyncio
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from core.domain.exceptions import InvalidFileError
+from core.utils.file_downloader import FileDownloader
+
+_URL = "https://cdn.example.com/image.png"
+_PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+
+
+@pytest.fixture
+async def downloader():
+    downloader = FileDownloader(max_size=1024, max_concurrency_per_host=2)
+    yield downloader
+    await downloader.close()
+
+
+class TestDownload:
+    async def test_download(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(url=_URL, content=_PNG, headers={"content-type": "image/png; charset=binary"})
+
+        downloaded = await downloader.download(_URL)
+        assert downloaded.content == _PNG
+        assert downloaded.content_type == "image/png"
+        assert not downloader._hosts
+
+    async def test_generic_content_type_is_ignored(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(url=_URL, content=_PNG, headers={"content-type": "application/octet-stream"})
+        assert (await downloader.download(_URL)).content_type is None
+
+    async def test_too_large_content_length(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(url=_URL, content=b"a" * 2048)
+        with pytest.raises(InvalidFileError, match="larger than the maximum size"):
+            _ = await downloader.download(_URL)
+
+    async def test_too_large_stream(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        # No content length, the size is only known while reading the stream
+        httpx_mock.add_response(
+            url=_URL,
+            stream=httpx.ByteStream(b"a" * 2048),
+            headers={"transfer-encoding": "chunked"},
+        )
+        with pytest.raises(InvalidFileError, match="larger than the maximum size"):
+            _ = await downloader.download(_URL)
+
+    async def test_error_status(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(url=_URL, status_code=404, text="not found")
+        with pytest.raises(InvalidFileError, match="404") as e:
+            _ = await downloader.download(_URL)
+        assert e.value.details["response_body"] == "not found"
+
+    async def test_retries(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        httpx_mock.add_exception(httpx.ConnectError("connection failed"), url=_URL)
+        httpx_mock.add_response(url=_URL, content=_PNG)
+        assert (await downloader.download(_URL)).content == _PNG
+
+    async def test_retries_exhausted(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        httpx_mock.add_exception(httpx.ConnectError("connection failed"), url=_URL, is_reusable=True)
+        with pytest.raises(InvalidFileError, match="connection failed"):
+            _ = await downloader.download(_URL)
+        assert len(httpx_mock.get_requests()) == 3
+
+    async def test_concurrency_per_host(self, downloader: FileDownloader):
+        running = 0
+        max_running = 0
+
+        async def _download():
+            nonlocal running, max_running
+            async with downloader._host_slot(_URL):
+                running += 1
+                max_running = max(max_running, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        _ = await asyncio.gather(*(_download() for _ in range(5)))
+        assert max_running == 2
+        assert not downloader._hosts
+
+
+class TestSniffContentType:
+    async def test_from_head(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(url=_URL, method="HEAD", headers={"content-type": "image/png"})
+        assert await downloader.sniff_content_type(_URL) == "image/png"
+
+    async def test_from_first_bytes(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(url=_URL, method="HEAD", status_code=405)
+        httpx_mock.add_response(url=_URL, method="GET", status_code=206, content=_PNG[:64])
+
+        assert await downloader.sniff_content_type(_URL) == "image/png"
+        assert httpx_mock.get_requests()[-1].headers["range"] == "bytes=0-63"
+
+    async def test_unknown(self, downloader: FileDownloader, httpx_mock: HTTPXMock):
+        httpx_mock.add_exception(httpx.ConnectError("connection failed"), url=_URL, method="HEAD")
+        assert await downloader.sniff_content_type(_URL) is None
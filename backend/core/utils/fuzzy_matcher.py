@@ -0,0 +1,86 @@
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from difflib import SequenceMatcher
+from typing import NamedTuple
+
+_SEPARATORS_REGEXP = re.compile(r"[\s_]+")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercases and replaces whitespaces and underscores with dashes so that
+    'GPT_4o', 'gpt 4o' and 'gpt-4o' are considered identical"""
+    return _SEPARATORS_REGEXP.sub("-", name.strip().lower())
+
+
+def _trigrams(normalized: str) -> frozenset[str]:
+    # Padding so that short strings and string boundaries still produce trigrams
+    padded = f"  {normalized} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class FuzzyMatch[T](NamedTuple):
+    value: T
+    key: str
+    score: float
+
+
+class FuzzyMatcher[T]:
+    """An in-memory fuzzy matcher over a set of names.
+
+    Candidates are retrieved via a trigram inverted index and ranked by their trigram
+    similarity. The top candidates are then re-ranked using a sequence matcher ratio, which
+    is more precise but too expensive to compute for every key."""
+
+    def __init__(self, entries: Iterable[tuple[str, T]], rerank_size: int = 5):
+        self._keys: list[str] = []
+        self._values: list[T] = []
+        self._trigrams: list[frozenset[str]] = []
+        self._exact: dict[str, int] = {}
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        self._rerank_size = rerank_size
+
+        for key, value in entries:
+            normalized = normalize_name(key)
+            if not normalized or normalized in self._exact:
+                continue
+            idx = len(self._keys)
+            self._exact[normalized] = idx
+            self._keys.append(normalized)
+            self._values.append(value)
+            grams = _trigrams(normalized)
+            self._trigrams.append(grams)
+            for gram in grams:
+                self._postings[gram].append(idx)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def best_match(self, query: str, cutoff: float = 0.5) -> FuzzyMatch[T] | None:
+        """Returns the closest entry to the query, or None if no entry has a score above the cutoff"""
+        normalized = normalize_name(query)
+        if not normalized:
+            return None
+        if (idx := self._exact.get(normalized)) is not None:
+            return FuzzyMatch(self._values[idx], self._keys[idx], 1.0)
+
+        query_grams = _trigrams(normalized)
+        shared: dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for idx in self._postings.get(gram, ()):
+                shared[idx] += 1
+        if not shared:
+            return None
+
+        # Dice coefficient over trigrams
+        candidates = sorted(
+            ((2 * count / (len(query_grams) + len(self._trigrams[idx])), idx) for idx, count in shared.items()),
+            reverse=True,
+        )[: self._rerank_size]
+
+        best: FuzzyMatch[T] | None = None
+        for _, idx in candidates:
+            score = SequenceMatcher(None, normalized, self._keys[idx]).ratio()
+            if score >= cutoff and (best is None or score > best.score):
+                best = FuzzyMatch(self._values[idx], self._keys[idx], score)
+        return best
@@ -0,0 +1,60 @@
+import pytest
+
+from core.utils.fuzzy_matcher import FuzzyMatcher, normalize_name
+
+
+@pytest.fixture
+def matcher():
+    return FuzzyMatcher(
+        [
+            ("gpt-4o-latest", "gpt-4o-latest"),
+            ("gpt-4o-mini-latest", "gpt-4o-mini-latest"),
+            ("gpt-4o", "gpt-4o-latest"),
+            ("gpt-4o-mini", "gpt-4o-mini-latest"),
+            ("claude-sonnet-4-latest", "claude-sonnet-4-latest"),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("GPT_4o", "gpt-4o"),
+        ("  gpt 4o ", "gpt-4o"),
+        ("gpt-4o", "gpt-4o"),
+    ],
+)
+def test_normalize_name(name: str, expected: str):
+    assert normalize_name(name) == expected
+
+
+class TestBestMatch:
+    def test_exact(self, matcher: FuzzyMatcher[str]):
+        match = matcher.best_match("GPT_4O")
+        assert match
+        assert match.value == "gpt-4o-latest"
+        assert match.score == 1.0
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("gpt4o", "gpt-4o-latest"),
+            ("gpt-4o-mni", "gpt-4o-mini-latest"),
+            ("claude-sonnet", "claude-sonnet-4-latest"),
+        ],
+    )
+    def test_fuzzy(self, matcher: FuzzyMatcher[str], query: str, expected: str):
+        match = matcher.best_match(query)
+        assert match
+        assert match.value == expected
+
+    @pytest.mark.parametrize("query", ["", "llama", "xyz"])
+    def test_no_match(self, matcher: FuzzyMatcher[str], query: str):
+        assert matcher.best_match(query) is None
+
+    def test_first_entry_wins_for_duplicate_keys(self):
+        matcher = FuzzyMatcher([("a-model", 1), ("A_MODEL", 2)])
+        assert len(matcher) == 1
+        match = matcher.best_match("a-model")
+        assert match
+        assert match.value == 1
@@ -1,4 +1,5 @@
 import json
+import re
 from typing import Any
 
 from core.domain.exceptions import JSONSchemaValidationError
@@ -46,3 +47,87 @@ def safe_extract_dict_from_json(o: Any) -> dict[str, Any] | None:
         return None
     except (json.JSONDecodeError, TypeError):
         return None
+
+
+# Characters that can appear outside of strings in a valid JSON, other than brackets and quotes.
+# Includes the NaN and Infinity literals accepted by json.loads
+_JSON_SCALAR_CHARS = re.compile(r"[\s,:+\-.0-9eEtrufalsnNIiy]*")
+_JSON_WHITESPACE = re.compile(r"\s*")
+_JSON_STRING_SPECIAL_CHARS = re.compile(r'["\\]')
+_JSON_CLOSING_BRACKETS = {"}": "{", "]": "["}
+
+
+class JSONPrefixValidator:
+    """Checks incrementally that a streamed text can still be the prefix of a valid JSON.
+
+    Only the structure is checked, i.e. brackets, strings and characters outside of strings,
+    so a text that passes can still fail to parse once complete. A text that fails can never
+    become valid, so it can be rejected before the end of the stream.
+    Each chunk is scanned once, skipping the content of strings and scalars with regexes."""
+
+    __slots__ = ("_bracket_stack", "_done", "_is_escaping", "_is_within_quotes", "is_valid")
+
+    def __init__(self):
+        self._bracket_stack: list[str] = []
+        self._is_within_quotes = False
+        self._is_escaping = False
+        # True when the root container was closed
+        self._done = False
+        self.is_valid = True
+
+    def _skip_string(self, chunk: str, pos: int) -> int:
+        """Returns the position after the closing quote or the length of the chunk if the string
+        continues in the next chunk"""
+        if self._is_escaping:
+            self._is_escaping = False
+            pos += 1
+        while match := _JSON_STRING_SPECIAL_CHARS.search(chunk, pos):
+            if match.group() == '"':
+                self._is_within_quotes = False
+                return match.end()
+            if match.end() == len(chunk):
+                self._is_escaping = True
+                return len(chunk)
+            # Skipping the escaped char
+            pos = match.end() + 1
+        return len(chunk)
+
+    def _feed_char(self, c: str) -> bool:
+        if c == '"':
+            self._is_within_quotes = True
+            return True
+        if c in "{[":
+            self._bracket_stack.append(c)
+            return True
+        if opening := _JSON_CLOSING_BRACKETS.get(c):
+            if not self._bracket_stack or self._bracket_stack.pop() != opening:
+                return False
+            self._done = not self._bracket_stack
+            return True
+        return False
+
+    def feed(self, chunk: str) -> bool:
+        """Processes the next chunk of the text, returns False if the text can not be valid anymore"""
+        if not self.is_valid:
+            return False
+
+        pos = 0
+        length = len(chunk)
+        while pos < length:
+            if self._is_within_quotes:
+                pos = self._skip_string(chunk, pos)
+                continue
+            if self._done:
+                # Only whitespace is allowed after the root container
+                if _JSON_WHITESPACE.match(chunk, pos).end() != length:  # pyright: ignore[reportOptionalMemberAccess]
+                    self.is_valid = False
+                break
+            pos = _JSON_SCALAR_CHARS.match(chunk, pos).end()  # pyright: ignore[reportOptionalMemberAccess]
+            if pos == length:
+                break
+            if not self._feed_char(chunk[pos]):
+                self.is_valid = False
+                break
+            pos += 1
+
+        return self.is_valid
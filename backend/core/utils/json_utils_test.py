@@ -1,8 +1,14 @@
+import json
 from typing import Any
 
 import pytest
 
-from core.utils.json_utils import extract_json_str, parse_tolerant_json, safe_extract_dict_from_json
+from core.utils.json_utils import (
+    JSONPrefixValidator,
+    extract_json_str,
+    parse_tolerant_json,
+    safe_extract_dict_from_json,
+)
 
 
 @pytest.mark.parametrize(
@@ -113,3 +119,48 @@ class TestSafeExtractDictFromJson:
         result = safe_extract_dict_from_json(42)
 
         assert result is None
+
+
+def _feed_by_chunks(text: str, chunk_size: int) -> bool:
+    validator = JSONPrefixValidator()
+    return all(validator.feed(text[i : i + chunk_size]) for i in range(0, len(text), chunk_size))
+
+
+class TestJSONPrefixValidator:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+    @pytest.mark.parametrize(
+        "value",
+        [
+            {"a": [1, -2.5e-3, {"b": 'x\\"y\né'}], "c": None, "d": True, "e": False},
+            {"brackets": "}]{[", "escaped": "\\"},
+            [],
+            "hello",
+            1,
+        ],
+    )
+    def test_valid(self, value: Any, chunk_size: int):
+        assert _feed_by_chunks(json.dumps(value, ensure_ascii=False), chunk_size)
+
+    def test_valid_prefix(self):
+        assert _feed_by_chunks('{"a": [1, {"b": "hel', 1)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '{"a": 1]',
+            '{"a": 1}}',
+            '{"a": 1} x',
+            '{"a": <',
+            "]",
+            '{"a": "\\\\"}x',
+        ],
+    )
+    def test_invalid(self, text: str):
+        assert not _feed_by_chunks(text, 1)
+        assert not _feed_by_chunks(text, len(text))
+
+    def test_invalid_is_final(self):
+        validator = JSONPrefixValidator()
+        assert not validator.feed("}")
+        assert not validator.feed("{}")
+        assert not validator.is_valid
@@ -1,20 +1,63 @@
 import logging
+from collections.abc import Iterator
 from typing import Any
 
 from pydantic import BaseModel
 
 
-class _MaxLenReachedError(Exception):
-    pass
+def _url_preview(content_type: str, url: str):
+    if len(url) > 100:
+        return url[:20] + "..."
+    match content_type.split("/")[0]:
+        case "image":
+            prefix = "img"
+        case "audio":
+            prefix = "audio"
+        case _:
+            prefix = "file"
+    return f"[[{prefix}:{url}]]"
+
+
+# TODO: this really should not be here
+def file_preview(content_type: Any, storage_url: Any = None, url: Any = None, data: Any = None) -> str | None:
+    """The preview of a file or None if the values do not describe a file. Accepts any value
+    since they can come from arbitrary dicts"""
+    if not content_type or not isinstance(content_type, str):
+        return None
+
+    if storage_url and isinstance(storage_url, str):
+        url = storage_url
+    elif url and isinstance(url, str):
+        pass
+    elif data and isinstance(data, str):
+        # Not displaying any data here
+        url = ""
+    else:
+        return None
+
+    return _url_preview(content_type.split("/")[0], url)
+
+
+# A token of the preview or a container that should be expanded in place
+type _Token = str | dict[str, Any] | list[Any]
 
 
 class _Agg:
+    """Builds a preview iteratively, stopping as soon as the maximum length is reached.
+
+    Containers are expanded lazily with a stack of iterators so the cost of a preview depends on
+    max_len and not on the size of the value. Leaves are sliced before being stringified so that
+    large strings, e.g. base64 data or long texts, are never copied in full."""
+
     def __init__(self, remaining: int):
         self.agg: list[str] = []
         self.remaining = remaining
         self._max_len_reached = False
 
     def _stringify(self, value: Any) -> str:
+        if isinstance(value, str):
+            # Only the characters that can fit in the preview are needed
+            return value[: self.remaining + 1].replace("\n", " ")
         if isinstance(value, float):
             return f"{round(value, 2)}".rstrip("0").rstrip(".")
         if value is None:
@@ -23,17 +66,21 @@ class _Agg:
             return "true" if value else "false"
         return str(value).replace("\n", " ")
 
-    def append(self, val: Any, cut_on_max_len: bool = True):
-        s = self._stringify(val)
+    def _quoted(self, value: str) -> str:
+        return f'"{value[: self.remaining].replace("\n", " ")}"'
+
+    def append(self, s: str, cut_on_max_len: bool = True) -> bool:
+        """Appends a string to the preview, returns False when the maximum length is reached"""
         if self.remaining < len(s):
-            if cut_on_max_len:
-                s = s[: self.remaining]
-            self.agg.append(s)
-            raise _MaxLenReachedError
+            self.agg.append(s[: self.remaining] if cut_on_max_len else s)
+            self._max_len_reached = True
+            return False
         self.agg.append(s)
         self.remaining -= len(s)
         if self.remaining == 0:
-            raise _MaxLenReachedError
+            self._max_len_reached = True
+            return False
+        return True
 
     def __str__(self) -> str:
         raw = "".join(self.agg)
@@ -41,86 +88,71 @@ class _Agg:
             return raw + "..."
         return raw
 
-    def _append_any(self, value: Any):
-        if isinstance(value, dict):
-            self._append_dict(value, brackets=True)  # pyright: ignore [reportUnknownArgumentType]
-        elif isinstance(value, list):
-            self.append("[")
-            self._append_list(value)  # pyright: ignore [reportUnknownArgumentType]
-            self.append("]")
+    def _value_tokens(self, value: Any) -> Iterator[_Token]:
+        if isinstance(value, dict | list):
+            yield value  # pyright: ignore [reportReturnType]
         elif isinstance(value, str):
-            self.append(f'"{value}"')
-        else:
-            self.append(value)
-
-    @classmethod
-    def url_preview(cls, content_type: str, url: str):
-        if len(url) > 100:
-            return url[:20] + "..."
-        match content_type.split("/")[0]:
-            case "image":
-                prefix = "img"
-            case "audio":
-                prefix = "audio"
-            case _:
-                prefix = "file"
-        return f"[[{prefix}:{url}]]"
-
-    # TODO: this really should not be here
-    @classmethod
-    def _file_preview(cls, d: dict[str, Any]):
-        content_type = d.get("content_type")
-        if not content_type or not isinstance(content_type, str):
-            return None
-
-        if (storage_url := d.get("storage_url")) and isinstance(storage_url, str):
-            url = storage_url
-        elif (url := d.get("url")) and isinstance(url, str):
-            pass
-        elif (data := d.get("data")) and isinstance(data, str):
-            # Not displaying any data here
-            url = ""
+            yield self._quoted(value)
         else:
-            return None
+            yield self._stringify(value)
 
-        return cls.url_preview(content_type.split("/")[0], url)
-
-    def _append_dict(self, d: dict[str, Any], brackets: bool):
-        # For simplification, we consider that any dict
-        # with a "content_type" key is a file and should have a specific preview
-        if file_preview := self._file_preview(d):
-            self.append(file_preview, cut_on_max_len=False)
-            return
+    def _dict_tokens(self, d: dict[str, Any], brackets: bool) -> Iterator[_Token]:
         if brackets:
-            self.append("{")
-
+            yield "{"
         for i, (k, v) in enumerate(d.items()):
             if i > 0:
-                self.append(", ")
-            self.append(k)
-            self.append(": ")
-            self._append_any(v)
-
+                yield ", "
+            yield self._stringify(k)
+            yield ": "
+            yield from self._value_tokens(v)
         if brackets:
-            self.append("}")
+            yield "}"
 
-    def _append_list(self, arr: list[Any]):
+    def _list_tokens(self, arr: list[Any], brackets: bool) -> Iterator[_Token]:
+        if brackets:
+            yield "["
         for i, v in enumerate(arr):
             if i > 0:
-                self.append(", ")
-            self._append_any(v)
+                yield ", "
+            yield from self._value_tokens(v)
+        if brackets:
+            yield "]"
+
+    def _expand(self, container: dict[str, Any] | list[Any], brackets: bool) -> Iterator[_Token] | None:
+        """Returns the tokens of a container or None if the maximum length was reached"""
+        if isinstance(container, list):
+            return self._list_tokens(container, brackets)
+        # For simplification, we consider that any dict
+        # with a "content_type" key is a file and should have a specific preview
+        if preview := file_preview(
+            container.get("content_type"),
+            storage_url=container.get("storage_url"),
+            url=container.get("url"),
+            data=container.get("data"),
+        ):
+            return None if not self.append(preview, cut_on_max_len=False) else iter(())
+        return self._dict_tokens(container, brackets)
 
     def build(self, value: Any):
-        try:
-            # Not use _any_preview to avoid adding quotes to strings, etc.
-            if isinstance(value, dict):
-                self._append_dict(value, brackets=False)  # pyright: ignore [reportUnknownArgumentType]
-            elif isinstance(value, list):
-                self._append_list(value)  # pyright: ignore [reportUnknownArgumentType]
+        # Not using _value_tokens at the root to avoid adding quotes and brackets
+        if not isinstance(value, dict | list):
+            _ = self.append(self._stringify(value))
+            return str(self)
+
+        root = self._expand(value, brackets=False)  # pyright: ignore [reportUnknownArgumentType]
+        stack = [root] if root is not None else []
+        while stack:
+            token = next(stack[-1], None)
+            if token is None:
+                _ = stack.pop()
+            elif isinstance(token, str):
+                if not self.append(token):
+                    break
             else:
-                self.append(value)
-        except _MaxLenReachedError:
-            self._max_len_reached = True
+                tokens = self._expand(token, brackets=True)
+                if tokens is None:
+                    break
+                stack.append(tokens)
 
         return str(self)
 
@@ -71,3 +71,28 @@ def test_compute_preview_default_limit():
 )
 def test_compute_preview_file(file_payload: dict[str, Any], expected: str):
     assert compute_preview({"file": file_payload}, max_len=10) == "file: " + expected
+
+
+class TestComputePreviewLargeValues:
+    def test_deeply_nested(self):
+        value: dict[str, Any] = {}
+        nested = value
+        for _ in range(10_000):
+            nested["a"] = {}
+            nested = nested["a"]
+        nested["a"] = "b"
+        # Would exceed the recursion limit if the preview was built recursively
+        assert compute_preview(value, max_len=20) == "a: {a: {a: {a: {a: {..."
+
+    def test_large_list(self):
+        assert compute_preview({"items": list(range(10_000_000))}, max_len=20) == "items: [0, 1, 2, 3, ..."
+
+    def test_large_string(self):
+        value = "abc\n" * 1_000_000
+        assert compute_preview(value, max_len=10) == "abc abc ab..."
+        assert compute_preview({"text": value}, max_len=10) == 'text: "abc...'
+
+    def test_exact_length(self):
+        assert compute_preview("abc", max_len=3) == "abc..."
+        assert compute_preview({"a": "bc"}, max_len=7) == 'a: "bc"...'
+        assert compute_preview({"a": "bc"}, max_len=8) == 'a: "bc"'
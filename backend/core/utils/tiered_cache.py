@@ -0,0 +1,82 @@
+import pickle
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+
+from structlog import get_logger
+
+from core.utils import remote_cached
+from core.utils.lru.lru_cache import TLRUCache
+from core.utils.remote_cached import RemoteCache
+
+_log = get_logger(__name__)
+
+
+class _RemoteEntry(NamedTuple):
+    value: Any
+    # The remote entry expiration, so that the value is not kept longer in the local cache
+    expires_at: datetime
+
+
+class TieredCache[T]:
+    """A two level cache: an in-process TLRU cache in front of the shared remote cache.
+
+    Values are pickled with their expiration when stored in the remote cache, a value fetched from the
+    remote cache is kept locally until the remote entry expires at the latest. Errors from the remote
+    cache are logged and never propagated, a remote failure is treated as a miss."""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: timedelta,
+        local_capacity: int = 1000,
+        remote: RemoteCache | None = None,
+    ):
+        self._namespace = namespace
+        self._ttl = ttl
+        self._local = TLRUCache[str, T](capacity=local_capacity, ttl=lambda _, __: ttl)
+        self._remote = remote
+
+    @property
+    def _remote_cache(self) -> RemoteCache:
+        # Resolved at call time since the shared cache is only set once the lifecycle dependencies are built
+        return self._remote or remote_cached.shared_cache
+
+    def _remote_key(self, key: str) -> str:
+        return f"{self._namespace}:{key}"
+
+    async def get(self, key: str) -> T | None:
+        if (value := self._local.get(key)) is not None:
+            return value
+
+        try:
+            raw = await self._remote_cache.get(self._remote_key(key))
+        except Exception as e:  # noqa: BLE001
+            _log.exception("Could not get cached value", exc_info=e, namespace=self._namespace)
+            return None
+        if not raw:
+            return None
+        try:
+            entry = pickle.loads(raw)  # noqa: S301
+        except Exception as e:  # noqa: BLE001
+            _log.exception("Could not deserialize cached value", exc_info=e, namespace=self._namespace)
+            return None
+        if not isinstance(entry, _RemoteEntry):
+            # Stored before expirations were included
+            return None
+        remaining = entry.expires_at - datetime.now(UTC)
+        if remaining <= timedelta(0):
+            return None
+        remote_value: T = entry.value
+        self._local.setex(key, min(remaining, self._ttl), remote_value)
+        return remote_value
+
+    async def set(self, key: str, value: T, ttl: timedelta | None = None) -> None:
+        ttl = min(ttl, self._ttl) if ttl else self._ttl
+        if ttl <= timedelta(0):
+            return
+        self._local.setex(key, ttl, value)
+        try:
+            entry = _RemoteEntry(value, datetime.now(UTC) + ttl)
+            await self._remote_cache.setex(self._remote_key(key), ttl, pickle.dumps(entry))
+        except Exception as e:  # noqa: BLE001
+            _log.exception("Could not set cached value", exc_info=e, namespace=self._namespace)
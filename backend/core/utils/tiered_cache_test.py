@@ -0,0 +1,101 @@
+# pyright: reportPrivateUsage=false
+
+import pickle
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from freezegun import freeze_time
+
+from core.utils.remote_cached import RemoteCache
+from core.utils.tiered_cache import TieredCache, _RemoteEntry
+
+
+def _remote_entry(value: str, ttl: timedelta = timedelta(minutes=1)) -> bytes:
+    return pickle.dumps(_RemoteEntry(value, datetime.now(UTC) + ttl))
+
+
+def _stored_entry(mock_remote: Mock) -> _RemoteEntry:
+    return pickle.loads(mock_remote.setex.await_args.args[2])  # noqa: S301
+
+
+@pytest.fixture
+def mock_remote():
+    remote = Mock(spec=RemoteCache)
+    remote.get = AsyncMock(return_value=None)
+    remote.setex = AsyncMock()
+    return remote
+
+
+@pytest.fixture
+def cache(mock_remote: Mock):
+    return TieredCache[str](namespace="test", ttl=timedelta(minutes=1), remote=mock_remote)
+
+
+class TestTieredCache:
+    async def test_local_hit_skips_remote(self, cache: TieredCache[str], mock_remote: Mock):
+        with freeze_time("2025-01-01T00:00:00Z"):
+            await cache.set("key", "value")
+            mock_remote.setex.assert_awaited_once()
+            assert mock_remote.setex.await_args.args[:2] == ("test:key", timedelta(minutes=1))
+            assert _stored_entry(mock_remote) == ("value", datetime(2025, 1, 1, 0, 1, tzinfo=UTC))
+
+            assert await cache.get("key") == "value"
+            mock_remote.get.assert_not_awaited()
+
+    async def test_remote_hit_populates_local(self, cache: TieredCache[str], mock_remote: Mock):
+        mock_remote.get.return_value = _remote_entry("value")
+
+        assert await cache.get("key") == "value"
+        assert await cache.get("key") == "value"
+        mock_remote.get.assert_awaited_once_with("test:key")
+
+    async def test_remote_hit_is_not_kept_after_remote_expiration(self, cache: TieredCache[str], mock_remote: Mock):
+        with freeze_time("2025-01-01T00:00:00Z") as frozen:
+            mock_remote.get.return_value = _remote_entry("value", ttl=timedelta(seconds=5))
+            assert await cache.get("key") == "value"
+
+            # The local TTL is a minute but the remote entry expired
+            frozen.tick(timedelta(seconds=6))
+            mock_remote.get.return_value = None
+            assert await cache.get("key") is None
+        assert mock_remote.get.await_count == 2
+
+    async def test_expired_remote_entry_is_a_miss(self, cache: TieredCache[str], mock_remote: Mock):
+        mock_remote.get.return_value = _remote_entry("value", ttl=timedelta(seconds=-1))
+        assert await cache.get("key") is None
+
+    async def test_remote_value_without_expiration_is_a_miss(self, cache: TieredCache[str], mock_remote: Mock):
+        mock_remote.get.return_value = pickle.dumps("value")
+        assert await cache.get("key") is None
+
+    async def test_miss(self, cache: TieredCache[str], mock_remote: Mock):
+        assert await cache.get("key") is None
+
+    async def test_remote_errors_are_not_propagated(self, cache: TieredCache[str], mock_remote: Mock):
+        mock_remote.get.side_effect = Exception("Cache connection error")
+        mock_remote.setex.side_effect = Exception("Cache write error")
+
+        assert await cache.get("key") is None
+        await cache.set("key", "value")
+        # Still cached locally
+        assert await cache.get("key") == "value"
+
+    async def test_ttl_is_capped(self, cache: TieredCache[str], mock_remote: Mock):
+        await cache.set("key", "value", ttl=timedelta(hours=1))
+        mock_remote.setex.assert_awaited_once()
+        assert mock_remote.setex.await_args.args[:2] == ("test:key", timedelta(minutes=1))
+
+    async def test_non_positive_ttl_is_not_cached(self, cache: TieredCache[str], mock_remote: Mock):
+        await cache.set("key", "value", ttl=timedelta(seconds=-10))
+
+        mock_remote.setex.assert_not_awaited()
+        assert await cache.get("key") is None
+
+    async def test_without_local_tier(self, mock_remote: Mock):
+        cache = TieredCache[str](namespace="test", ttl=timedelta(minutes=1), remote=mock_remote, local_capacity=0)
+        await cache.set("key", "value")
+        mock_remote.get.return_value = _remote_entry("other")
+
+        assert await cache.get("key") == "other"
+        mock_remote.get.assert_awaited_once_with("test:key")
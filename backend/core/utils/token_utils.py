@@ -1,6 +1,18 @@
+import functools
+import os
+from collections.abc import Iterable
+
 from tiktoken import Encoding, encoding_for_model, get_encoding
 
+# Above this number of characters, texts are encoded in parallel. tiktoken releases the GIL while encoding
+# so large prompts are split across threads instead of blocking a single core
+_PARALLEL_MIN_CHARS = int(os.environ.get("TOKEN_COUNT_PARALLEL_MIN_CHARS", str(256 * 1024)))
+_PARALLEL_THREADS = 4
+
 
+# Resolving the encoding of a model goes through prefix lookups and raises for unknown models
+# so it is memoized per model
+@functools.cache
 def _get_tiktoken_encoding(model: str) -> Encoding:
     try:
         encoding = encoding_for_model(model)
@@ -13,4 +25,17 @@ def _get_tiktoken_encoding(model: str) -> Encoding:
 def tokens_from_string(completion: str, model: str) -> int:
     encoding = _get_tiktoken_encoding(model)
 
-    return len(encoding.encode(completion))
+    # Special tokens are counted as regular text instead of raising
+    return len(encoding.encode_ordinary(completion))
+
+
+def tokens_from_strings(texts: Iterable[str], model: str) -> int:
+    """Counts the tokens of multiple texts, e.g. all the text blocks of a prompt, in a single call"""
+    texts = list(texts)
+    if not texts:
+        return 0
+
+    encoding = _get_tiktoken_encoding(model)
+    if len(texts) > 1 and sum(len(text) for text in texts) >= _PARALLEL_MIN_CHARS:
+        return sum(len(tokens) for tokens in encoding.encode_ordinary_batch(texts, num_threads=_PARALLEL_THREADS))
+    return sum(len(encoding.encode_ordinary(text)) for text in texts)
@@ -0,0 +1,61 @@
+# pyright: reportPrivateUsage=false
+
+from collections.abc import Iterator
+from unittest.mock import Mock, patch
+
+import pytest
+from tiktoken import Encoding
+
+from core.utils import token_utils
+from core.utils.token_utils import tokens_from_string, tokens_from_strings
+
+
+@pytest.fixture
+def mock_encoding_for_model() -> Iterator[Mock]:
+    # Byte level encoding that does not require downloading the tiktoken files, 1 token per byte
+    encoding = Encoding(
+        name="bytes",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={"<|endoftext|>": 256},
+    )
+    token_utils._get_tiktoken_encoding.cache_clear()
+    with patch.object(token_utils, "encoding_for_model", return_value=encoding) as mock:
+        yield mock
+    token_utils._get_tiktoken_encoding.cache_clear()
+
+
+class TestTokensFromString:
+    def test_encoding_is_cached_per_model(self, mock_encoding_for_model: Mock):
+        assert tokens_from_string("hello", "gpt-4o") == 5
+        assert tokens_from_string("hello world", "gpt-4o") == 11
+        mock_encoding_for_model.assert_called_once_with("gpt-4o")
+
+        assert tokens_from_string("hello", "gpt-4.1") == 5
+        assert mock_encoding_for_model.call_count == 2
+
+    def test_special_tokens_are_counted_as_text(self, mock_encoding_for_model: Mock):
+        assert tokens_from_string("<|endoftext|>", "gpt-4o") == 13
+
+
+class TestTokensFromStrings:
+    def test_empty(self, mock_encoding_for_model: Mock):
+        assert tokens_from_strings([], "gpt-4o") == 0
+        mock_encoding_for_model.assert_not_called()
+
+    def test_sum_of_texts(self, mock_encoding_for_model: Mock):
+        assert tokens_from_strings(iter(["hello", "world", ""]), "gpt-4o") == 10
+
+    def test_large_texts_are_encoded_in_parallel(self, mock_encoding_for_model: Mock):
+        texts = ["a" * 100, "b" * 200]
+        with (
+            patch.object(token_utils, "_PARALLEL_MIN_CHARS", 300),
+            patch.object(
+                Encoding,
+                "encode_ordinary_batch",
+                autospec=True,
+                return_value=[[1] * 100, [2] * 200],
+            ) as batch,
+        ):
+            assert tokens_from_strings(texts, "gpt-4o") == 300
+        batch.assert_called_once()
@@ -1,6 +1,6 @@
 import asyncio
 from collections.abc import Sequence
-from typing import Generic, NamedTuple, TypeVar
+from typing import Generic, NamedTuple, TypeVar, cast
 
 from structlog import get_logger
 
@@ -11,6 +11,7 @@ from core.domain.events import (
     StoreCompletionEvent,
     UserConnectedEvent,
 )
+from protocol._common.event_claim_check import EventClaimCheck
 from protocol.worker.tasks._types import TASK
 
 _log = get_logger(__name__)
@@ -43,9 +44,10 @@ def _tasks() -> Sequence[_TaskListing[Event]]:
 
 
 class SystemEventRouter:
-    def __init__(self) -> None:
+    def __init__(self, claim_check: EventClaimCheck | None = None) -> None:
         self._tasks: set[asyncio.Task[None]] = set()
         self._handlers: dict[type[Event], _TaskListing[Event]] = {job.event: job for job in _tasks()}
+        self._claim_check = claim_check
 
     @classmethod
     async def _send_task[T: Event](
@@ -78,10 +80,43 @@ class SystemEventRouter:
         self._tasks.add(t)
         t.add_done_callback(self._tasks.remove)
 
+    async def _send_claim_checked(
+        self,
+        claim_check: EventClaimCheck,
+        jobs: Sequence[TASK[Event]],
+        event: Event,
+        delay: float | None = None,
+    ):
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            arg = await claim_check.offload(event, len(jobs))
+        except Exception as e:  # noqa: BLE001
+            _log.warning("Error offloading event payload, sending it through the broker", exc_info=e)
+            arg = event
+        # References are resolved back to the event by the worker before the jobs execute
+        _ = await asyncio.gather(*(self._send_task(job, cast(Event, arg)) for job in jobs))
+
+    def _schedule_claim_checked(
+        self,
+        claim_check: EventClaimCheck,
+        jobs: Sequence[TASK[Event]],
+        event: Event,
+        delay: float | None = None,
+    ):
+        t = asyncio.create_task(self._send_claim_checked(claim_check, jobs, event, delay=delay))
+        self._tasks.add(t)
+        t.add_done_callback(self._tasks.remove)
+
     def __call__(self, event: Event, delay: float | None = None) -> None:
         try:
             listing = self._handlers[type(event)]
 
+            if self._claim_check:
+                # The event is serialized and offloaded once for all jobs
+                self._schedule_claim_checked(self._claim_check, listing.jobs, event, delay)
+                return
+
             for job in listing.jobs:
                 self._schedule_task(job, event, delay)
 
@@ -1,5 +1,5 @@
 import os
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from typing import final, override
 
 import asyncpg
@@ -14,6 +14,7 @@ from core.storage.completion_storage import CompletionStorage
 from core.storage.deployment_storage import DeploymentStorage
 from core.storage.experiment_storage import ExperimentStorage
 from core.storage.file_storage import FileStorage
+from core.storage.psql._psql_pool import PsqlPoolMonitor, acquire_unscoped, create_psql_pool
 from core.storage.psql.migrations.migrate import migrate
 from core.storage.psql.psql_agent_storage import PsqlAgentsStorage
 from core.storage.psql.psql_annotation_storage import PsqlAnnotationStorage
@@ -35,10 +36,13 @@ class DefaultStorageBuilder(StorageBuilder):
         clickhouse_client: AsyncClient,
         psql_pool: asyncpg.Pool,
         file_storage_builder: Callable[[int], FileStorage],
+        close_file_storage: Callable[[], Awaitable[None]] | None = None,
     ):
         self._clickhouse_client = clickhouse_client
         self._psql_pool = psql_pool
         self._file_storage_builder = file_storage_builder
+        self._close_file_storage = close_file_storage
+        self._psql_pool_monitor = PsqlPoolMonitor(psql_pool)
 
     @override
     def completions(self, tenant_uid: int) -> CompletionStorage:
@@ -78,41 +82,49 @@ class DefaultStorageBuilder(StorageBuilder):
 
     @classmethod
     async def create(cls):
-        psql_pool = await asyncpg.create_pool(dsn=os.environ["PSQL_DSN"])
+        psql_pool = await create_psql_pool(os.environ["PSQL_DSN"])
         clickhouse_client = await create_async_client(
             dsn=os.environ["CLICKHOUSE_DSN"],
             connect_timeout=30,
             send_receive_timeout=300,
         )
 
-        return cls(
+        file_storage_builder, close_file_storage = _default_file_storage_builder()
+        builder = cls(
             clickhouse_client=clickhouse_client,
             psql_pool=psql_pool,
-            file_storage_builder=_default_file_storage_builder(),
+            file_storage_builder=file_storage_builder,
+            close_file_storage=close_file_storage,
         )
+        builder._psql_pool_monitor.start()
+        return builder
 
     async def close(self):
+        await self._psql_pool_monitor.close()
         await self._psql_pool.close()
         await self._clickhouse_client.close()
+        if self._close_file_storage:
+            await self._close_file_storage()
 
     @override
     async def migrate(self):
-        async with self._psql_pool.acquire() as conn:
+        async with acquire_unscoped(self._psql_pool) as conn:
             await migrate(conn)
 
         await migrate_clickhouse(self._clickhouse_client)
 
 
-def _default_file_storage_builder() -> Callable[[int], FileStorage]:
+def _default_file_storage_builder() -> tuple[Callable[[int], FileStorage], Callable[[], Awaitable[None]] | None]:
+    """Returns the file storage builder and a function to release the resources it holds, if any"""
     if azure_blob_dsn := os.environ.get("AZURE_BLOB_DSN"):
-        from core.storage.azure.azure_blob_file_storage import AzureBlobFileStorage
+        from core.storage.azure.azure_blob_file_storage import AzureBlobFileStorageBuilder
 
         azure_container_name = os.environ.get("AZURE_BLOB_CONTAINER", "completions")
-        return lambda tenant_uid: AzureBlobFileStorage(
+        azure_builder = AzureBlobFileStorageBuilder(
             connection_string=azure_blob_dsn,
             container_name=azure_container_name,
-            tenant_uid=tenant_uid,
         )
+        return azure_builder, azure_builder.close
 
     dsn = os.environ.get("FILE_STORAGE_DSN")
     if not dsn:
@@ -127,4 +139,4 @@ def _default_file_storage_builder() -> Callable[[int], FileStorage]:
     return lambda tenant_uid: S3FileStorage(
         connection_string=dsn,
         tenant_uid=tenant_uid,
-    )
+    ), None
@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+import json
+import zlib
+from datetime import timedelta
+from typing import Any
+
+from structlog import get_logger
+
+from core.domain.events import Event
+from core.domain.metrics import send_counter
+from core.storage.kv_storage import KVStorage
+
+_log = get_logger(__name__)
+
+_CLAIM_CHECK_FIELD = "claim_check"
+_KEY_PREFIX = "event_claim_check:"
+# Offloaded payloads must outlive the retries of the jobs that reference them
+_DEFAULT_TTL = timedelta(days=1)
+# Compression is mostly needed for base64 encoded files and repeated messages, speed matters more than ratio
+_COMPRESSION_LEVEL = 1
+
+
+def _compress(payload: bytes) -> bytes:
+    return zlib.compress(payload, level=_COMPRESSION_LEVEL)
+
+
+def _decompress(data: bytes) -> dict[str, Any]:
+    return json.loads(zlib.decompress(data))
+
+
+class EventClaimCheck:
+    """Offloads large events to the KV storage so that only a reference goes through the broker.
+
+    The payload is stored once, compressed and content addressed, whatever the number of jobs
+    the event fans out to. Jobs receive a small dict with the reference that is resolved
+    back to the full event before the job executes."""
+
+    def __init__(self, kv_storage: KVStorage, min_size: int | None, ttl: timedelta = _DEFAULT_TTL):
+        self._kv_storage = kv_storage
+        # None disables offloading, for example when the broker and the KV storage are not shared between processes
+        self._min_size = min_size
+        self._ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self._min_size is not None
+
+    async def offload(self, event: Event, job_count: int) -> Event | dict[str, Any]:
+        """Returns the argument to send to the jobs, either the event itself or a reference to it"""
+        if self._min_size is None:
+            return event
+
+        event_name = type(event).__name__
+        payload = event.model_dump_json().encode()
+        if len(payload) < self._min_size:
+            send_counter("event_broker_bytes", value=len(payload) * job_count, event=event_name, claim_check=False)
+            return event
+
+        key = f"{_KEY_PREFIX}{hashlib.sha256(payload).hexdigest()[:32]}"
+        compressed = await asyncio.to_thread(_compress, payload)
+        await self._kv_storage.setex(key, self._ttl, compressed)
+
+        reference = {"tenant_uid": event.tenant_uid, _CLAIM_CHECK_FIELD: key}
+        send_counter("event_claim_check_bytes", value=len(compressed), event=event_name)
+        send_counter(
+            "event_broker_bytes",
+            value=len(json.dumps(reference)) * job_count,
+            event=event_name,
+            claim_check=True,
+        )
+        return reference
+
+    async def resolve(self, arg: Any) -> Any:
+        """Returns the original event payload if the argument is a reference, the argument otherwise"""
+        if not isinstance(arg, dict) or _CLAIM_CHECK_FIELD not in arg:
+            return arg
+        key: str = arg[_CLAIM_CHECK_FIELD]  # pyright: ignore[reportUnknownVariableType]
+        data = await self._kv_storage.get(key)
+        if data is None:
+            # The job will fail to validate its event and go through the usual error handling
+            _log.error("Claim checked event payload not found", key=key)
+            return arg
+        return await asyncio.to_thread(_decompress, data)
@@ -0,0 +1,51 @@
+import pytest
+
+from core.domain.events import StoreCompletionEvent
+from core.storage.local_kv_storage.local_kv_storage import LocalKVStorage
+from protocol._common.event_claim_check import EventClaimCheck
+from tests.fake_models import fake_completion
+
+
+@pytest.fixture
+def kv_storage():
+    return LocalKVStorage()
+
+
+@pytest.fixture
+def event():
+    return StoreCompletionEvent(tenant_uid=1, completion=fake_completion())
+
+
+class TestEventClaimCheck:
+    async def test_small_events_are_sent_as_is(self, kv_storage: LocalKVStorage, event: StoreCompletionEvent):
+        claim_check = EventClaimCheck(kv_storage, min_size=1024 * 1024)
+        assert await claim_check.offload(event, 2) is event
+
+    async def test_disabled(self, kv_storage: LocalKVStorage, event: StoreCompletionEvent):
+        claim_check = EventClaimCheck(kv_storage, min_size=None)
+        assert not claim_check.enabled
+        assert await claim_check.offload(event, 2) is event
+
+    async def test_large_events_are_offloaded(self, kv_storage: LocalKVStorage, event: StoreCompletionEvent):
+        claim_check = EventClaimCheck(kv_storage, min_size=10)
+
+        reference = await claim_check.offload(event, 2)
+        assert isinstance(reference, dict)
+        assert reference["tenant_uid"] == 1
+        assert len(str(reference)) < len(event.model_dump_json())
+
+        resolved = await claim_check.resolve(reference)
+        assert StoreCompletionEvent.model_validate(resolved) == event
+
+        # Offloading the same event again reuses the same key
+        assert await claim_check.offload(event, 1) == reference
+
+    async def test_resolve_leaves_other_arguments_untouched(self, kv_storage: LocalKVStorage):
+        claim_check = EventClaimCheck(kv_storage, min_size=10)
+        assert await claim_check.resolve({"tenant_uid": 1}) == {"tenant_uid": 1}
+        assert await claim_check.resolve("hello") == "hello"
+
+    async def test_resolve_missing_payload(self, kv_storage: LocalKVStorage):
+        claim_check = EventClaimCheck(kv_storage, min_size=10)
+        reference = {"tenant_uid": 1, "claim_check": "event_claim_check:missing"}
+        assert await claim_check.resolve(reference) == reference
@@ -7,9 +7,11 @@ from structlog import get_logger
 from core.consts import ANOTHERAI_APP_URL
 from core.domain.events import EventRouter
 from core.domain.exceptions import PaymentRequiredError
+from core.domain.metrics import metrics_aggregator
 from core.domain.tenant_data import TenantData
 from core.providers._base.httpx_provider_base import HTTPXProviderBase
 from core.providers.factory.abstract_provider_factory import AbstractProviderFactory
+from core.services.credit_ledger import CreditLedger
 from core.services.email_service import EmailService
 from core.services.payment_service import PaymentHandler
 from core.services.user_manager import UserManager
@@ -18,6 +20,7 @@ from core.storage.kv_storage import KVStorage
 from core.storage.storage_builder import StorageBuilder
 from core.storage.tenant_storage import TenantStorage
 from core.utils.background import wait_for_background_tasks
+from core.utils.file_downloader import file_downloader
 from core.utils.signature_verifier import (
     JWKSetSignatureVerifier,
     JWKSignatureVerifier,
@@ -25,6 +28,8 @@ from core.utils.signature_verifier import (
     SignatureVerifier,
 )
 from protocol._common._default_event_router import SystemEventRouter, TenantEventRouter
+from protocol._common.broker_utils import use_in_memory_broker
+from protocol._common.event_claim_check import EventClaimCheck
 from protocol.api._services.security_service import SecurityService
 
 _log = get_logger(__name__)
@@ -41,7 +46,11 @@ class LifecycleDependencies:
         self.storage_builder = storage_builder
         self.provider_factory = provider_factory
         self._user_manager = user_manager
-        self._system_event_router = SystemEventRouter()
+        self._kv_storage = _default_kv_storage()
+        self.event_claim_check = _default_event_claim_check(self._kv_storage)
+        self._system_event_router = SystemEventRouter(
+            self.event_claim_check if self.event_claim_check.enabled else None,
+        )
         self.security_service = SecurityService(
             self.storage_builder.tenants(-1),
             _default_verifier(),
@@ -49,7 +58,6 @@ class LifecycleDependencies:
             user_storage=self.storage_builder.users(-1),
             event_router=self._system_event_router,
         )
-        self._kv_storage = _default_kv_storage()
         from core.utils import remote_cached
 
         remote_cached.shared_cache = self._kv_storage
@@ -58,9 +66,12 @@ class LifecycleDependencies:
         self.check_credits = (
             _raise_for_negative_credits if should_raise_for_negative_credits else _ignore_negative_credits
         )
+        self.credit_ledger = CreditLedger(self.storage_builder.tenants(-1), self.payment_handler)
 
     async def close(self):
         # TODO: not great ownership here, the objects are passed as parameters but we are closing them here
+        # Pending credit decrements must be applied before the storage is closed
+        await self.credit_ledger.close()
         await self.storage_builder.close()
         await self._user_manager.close()
         await self._kv_storage.close()
@@ -100,8 +111,8 @@ async def startup() -> LifecycleDependencies:
     from core.providers.factory.local_provider_factory import LocalProviderFactory
 
     storage_builder = await _default_storage_builder()
+    # Providers are built lazily on first use
     provider_factory = LocalProviderFactory()
-    _ = provider_factory.build_available_providers()
 
     shared_dependencies = LifecycleDependencies(storage_builder, provider_factory, _default_user_manager())
     LifecycleDependencies.shared = shared_dependencies
@@ -111,7 +122,9 @@ async def startup() -> LifecycleDependencies:
 async def shutdown(dependencies: LifecycleDependencies):
     await dependencies.close()
     await wait_for_background_tasks()
+    await metrics_aggregator.close()
     await HTTPXProviderBase.close()
+    await file_downloader.close()
 
 
 def _default_verifier() -> SignatureVerifier:
@@ -134,6 +147,13 @@ def _default_kv_storage() -> KVStorage:
     return LocalKVStorage()
 
 
+def _default_event_claim_check(kv_storage: KVStorage) -> EventClaimCheck:
+    # Offloaded payloads are read by the worker so the broker and the KV storage must both be shared
+    shared = not use_in_memory_broker(os.environ.get("JOBS_BROKER_URL")) and "REDIS_DSN" in os.environ
+    min_size = int(os.environ.get("EVENT_CLAIM_CHECK_MIN_BYTES", str(64 * 1024))) if shared else None
+    return EventClaimCheck(kv_storage, min_size)
+
+
 async def _default_storage_builder() -> StorageBuilder:
     from protocol._common._default_storage_builder import DefaultStorageBuilder
 
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Response
 
+from core.domain.metrics import metrics_aggregator
+
 router = APIRouter(prefix="/probes", include_in_schema=False)
 
 
@@ -13,3 +15,12 @@ async def health_head() -> Response:
 @router.get("/readiness")
 async def readiness() -> Response:
     return Response(status_code=200)
+
+
+@router.get("/metrics")
+async def metrics() -> Response:
+    """Aggregated metrics of the process in the Prometheus text format"""
+    return Response(
+        content=metrics_aggregator.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -836,6 +836,18 @@ class QueryCompletionResponse(BaseModel):
     url: str
 
 
+class ExportCompletionsRequest(BaseModel):
+    query: str = Field(description="A SQL Query on the 'completions' table")
+    format: Literal["ndjson", "parquet"] = Field(
+        default="ndjson",
+        description="The format of the exported file. ndjson exports one JSON object per line.",
+    )
+
+
+class ExportCompletionsResponse(BaseModel):
+    url: str = Field(description="The URL of the exported file")
+
+
 # ------------------------------------------------
 # Deployments
 
@@ -17,6 +17,8 @@ from protocol.api._api_models import (
     DeploymentCreate,
     DeploymentUpdate,
     Experiment,
+    ExportCompletionsRequest,
+    ExportCompletionsResponse,
     ImportCompletionResponse,
     Model,
     OpenAIListResult,
@@ -117,6 +119,16 @@ async def query_completions(
     return (await completion_service.query_completions(query)).rows
 
 
+@router.post("/v1/completions/exports")
+async def export_completions(
+    completion_service: CompletionServiceDep,
+    request: ExportCompletionsRequest,
+) -> ExportCompletionsResponse:
+    """Exports the result of a query to a file, for example to run offline evaluations on large sets
+    of completions. Rows are streamed to storage so there is no limit on the size of the result."""
+    return await completion_service.export_completions(request.query, request.format)
+
+
 @router.get("/v1/completions/{completion_id}", response_model_exclude_none=True)
 async def get_completion(
     completion_service: CompletionServiceDep,
@@ -45,6 +45,7 @@ def completion_service(tenant: TenantDep, dependencies: LifecycleDependenciesDep
     return CompletionService(
         completion_storage=dependencies.storage_builder.completions(tenant.uid),
         agent_storage=dependencies.storage_builder.agents(tenant.uid),
+        file_storage=dependencies.storage_builder.files(tenant.uid),
     )
 
 
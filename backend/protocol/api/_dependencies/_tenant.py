@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import Depends, Request
 
 from core.domain.tenant_data import TenantData
+from core.services.payment_service import with_cached_credit_balance
 from protocol.api._dependencies._lifecycle import LifecycleDependenciesDep
 
 
@@ -15,7 +16,9 @@ async def authenticated_tenant(request: Request, lifecycle: LifecycleDependencie
 TenantDep = Annotated[TenantData, Depends(authenticated_tenant)]
 
 
-def tenant_with_credits(tenant: TenantDep, lifecycle: LifecycleDependenciesDep) -> TenantData:
+async def tenant_with_credits(tenant: TenantDep, lifecycle: LifecycleDependenciesDep) -> TenantData:
+    # Credits are decremented in batches so the authenticated tenant can be slightly behind
+    tenant = await with_cached_credit_balance(tenant)
     lifecycle.check_credits(tenant)
     return tenant
 
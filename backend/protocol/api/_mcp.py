@@ -20,6 +20,7 @@ from protocol.api._api_models import (
     Deployment,
     Experiment,
     ExperimentInput,
+    ExportCompletionsResponse,
     ModelField,
     Page,
     QueryCompletionResponse,
@@ -552,6 +553,22 @@ async def query_completions(
     return await (await _mcp_utils.completion_service()).query_completions(query)
 
 
+@mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def export_completions(
+    query: str = Field(
+        description="SQL query to execute. Must use ClickHouse SQL syntax. Same table as query_completions.",
+    ),
+    format: Literal["ndjson", "parquet"] = Field(
+        default="ndjson",
+        description="The format of the exported file. ndjson exports one JSON object per line.",
+    ),
+) -> ExportCompletionsResponse:
+    """Exports the full result of a query on the completions table to a file and returns the URL of the file.
+    Use instead of query_completions when the result is too large to be returned directly, for example
+    to build an evaluation dataset from hundreds of thousands of completions."""
+    return await (await _mcp_utils.completion_service()).export_completions(query, format)
+
+
 # ------------------------------------------------------------
 # Dashboards
 
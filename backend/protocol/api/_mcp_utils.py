@@ -19,6 +19,7 @@ from core.domain.exceptions import DefaultError, InvalidTokenError
 from core.domain.tenant_data import TenantData
 from core.providers._base.provider_error import ProviderError
 from core.services.documentation.documentation_search import DocumentationSearch
+from core.services.payment_service import with_cached_credit_balance
 from core.utils.dicts import remove_nulls
 from protocol.api._dependencies._lifecycle import lifecycle_dependencies
 from protocol.api._dependencies._services import completion_runner
@@ -177,7 +178,7 @@ async def playground_service() -> PlaygroundService:
     deps = lifecycle_dependencies()
     tenant = await _authenticated_tenant()
     # Raise for negative credits if payment is enabled
-    deps.check_credits(tenant)
+    deps.check_credits(await with_cached_credit_balance(tenant))
     return PlaygroundService(
         completion_runner(tenant, deps),
         deps.storage_builder.agents(tenant.uid),
@@ -222,7 +223,11 @@ async def agent_service() -> AgentService:
 async def completion_service() -> CompletionService:
     deps = lifecycle_dependencies()
     tenant = await _authenticated_tenant()
-    return CompletionService(deps.storage_builder.completions(tenant.uid), deps.storage_builder.agents(tenant.uid))
+    return CompletionService(
+        deps.storage_builder.completions(tenant.uid),
+        deps.storage_builder.agents(tenant.uid),
+        deps.storage_builder.files(tenant.uid),
+    )
 
 
 async def view_service() -> ViewService:
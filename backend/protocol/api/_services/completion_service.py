@@ -1,3 +1,4 @@
+import mimetypes
 from typing import final
 from urllib.parse import quote_plus
 from uuid import UUID
@@ -6,18 +7,38 @@ from core.consts import ANOTHERAI_APP_URL
 from core.domain.exceptions import BadRequestError
 from core.services.store_completion.completion_storer import CompletionStorer
 from core.storage.agent_storage import AgentStorage
-from core.storage.completion_storage import CompletionStorage
+from core.storage.completion_storage import CompletionStorage, ExportFormat
+from core.storage.file_storage import FileStorage
 from core.utils.uuid import is_uuid7, is_zero, uuid7
-from protocol.api._api_models import Completion, ImportCompletionResponse, QueryCompletionResponse
+from protocol.api._api_models import (
+    Completion,
+    ExportCompletionsResponse,
+    ImportCompletionResponse,
+    QueryCompletionResponse,
+)
 from protocol.api._services._urls import completion_url
 from protocol.api._services.conversions import completion_from_domain, completion_to_domain
 
+_EXPORT_CONTENT_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Registering the extensions so that exported files have a meaningful name
+mimetypes.add_type("application/x-ndjson", ".ndjson")
+mimetypes.add_type("application/vnd.apache.parquet", ".parquet")
+
 
 @final
 class CompletionService:
-    def __init__(self, completion_storage: CompletionStorage, agent_storage: AgentStorage):
+    def __init__(
+        self,
+        completion_storage: CompletionStorage,
+        agent_storage: AgentStorage,
+        file_storage: FileStorage | None = None,
+    ):
         self._completion_storage = completion_storage
         self._agent_storage = agent_storage
+        self._file_storage = file_storage
 
     async def get_completion(self, completion_id: UUID) -> Completion:
         completion = await self._completion_storage.completions_by_id(completion_id)
@@ -30,6 +51,16 @@ class CompletionService:
 
         return QueryCompletionResponse(rows=rows, url=f"{ANOTHERAI_APP_URL}/completions?query={quoted}")
 
+    async def export_completions(self, query: str, fmt: ExportFormat) -> ExportCompletionsResponse:
+        if not self._file_storage:
+            raise ValueError("File storage is required to export completions")
+        url = await self._file_storage.store_stream(
+            self._completion_storage.export_query(query, fmt),
+            _EXPORT_CONTENT_TYPES[fmt],
+            "exports",
+        )
+        return ExportCompletionsResponse(url=url)
+
     @classmethod
     async def create_completion(
         cls,
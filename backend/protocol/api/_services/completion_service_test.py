@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterable
 from unittest.mock import Mock
 
 import pytest
@@ -5,6 +6,7 @@ import pytest
 from core.consts import ANOTHERAI_APP_URL
 from core.storage.agent_storage import AgentStorage
 from core.storage.completion_storage import CompletionStorage
+from core.storage.file_storage import FileStorage
 from protocol.api._services.completion_service import CompletionService
 
 
@@ -19,8 +21,13 @@ def mock_agent_storage():
 
 
 @pytest.fixture
-def completion_service(mock_completion_storage: Mock, mock_agent_storage: Mock):
-    return CompletionService(mock_completion_storage, mock_agent_storage)
+def mock_file_storage():
+    return Mock(spec=FileStorage)
+
+
+@pytest.fixture
+def completion_service(mock_completion_storage: Mock, mock_agent_storage: Mock, mock_file_storage: Mock):
+    return CompletionService(mock_completion_storage, mock_agent_storage, mock_file_storage)
 
 
 class TestQueryCompletions:
@@ -30,3 +37,31 @@ class TestQueryCompletions:
         ]
         res = await completion_service.query_completions("SELECT * FROM completions")
         assert res.url == f"{ANOTHERAI_APP_URL}/completions?query=SELECT+%2A+FROM+completions"
+
+
+class TestExportCompletions:
+    async def test_export_is_streamed_to_storage(
+        self,
+        completion_service: CompletionService,
+        mock_completion_storage: Mock,
+        mock_file_storage: Mock,
+    ):
+        async def _export(query: str, fmt: str):
+            yield b'{"id": "1"}\n'
+            yield b'{"id": "2"}\n'
+
+        mock_completion_storage.export_query.side_effect = _export
+        stored: list[bytes] = []
+
+        async def _store_stream(chunks: AsyncIterable[bytes], content_type: str | None, folder: str):
+            stored.extend([chunk async for chunk in chunks])
+            return f"https://storage/{folder}/file.ndjson"
+
+        mock_file_storage.store_stream.side_effect = _store_stream
+
+        res = await completion_service.export_completions("SELECT id FROM completions", "ndjson")
+
+        assert res.url == "https://storage/exports/file.ndjson"
+        assert stored == [b'{"id": "1"}\n', b'{"id": "2"}\n']
+        mock_completion_storage.export_query.assert_called_once_with("SELECT id FROM completions", "ndjson")
+        assert mock_file_storage.store_stream.call_args.args[1] == "application/x-ndjson"
@@ -0,0 +1,45 @@
+from collections.abc import AsyncIterable
+from io import BytesIO
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from core.domain.exceptions import EntityTooLargeError
+from core.storage.file_storage import FileStorage
+from protocol.api._services.files_service import FilesService
+
+
+@pytest.fixture
+def mock_file_storage():
+    storage = Mock(spec=FileStorage)
+
+    async def _store_stream(chunks: AsyncIterable[bytes], content_type: str | None, folder: str) -> str:
+        data = b"".join([chunk async for chunk in chunks])
+        return f"https://storage/{folder}/{len(data)}"
+
+    storage.store_stream = AsyncMock(side_effect=_store_stream)
+    return storage
+
+
+@pytest.fixture
+def files_service(mock_file_storage: Mock):
+    return FilesService(mock_file_storage)
+
+
+class TestUploadFile:
+    async def test_upload_is_streamed(self, files_service: FilesService, mock_file_storage: Mock):
+        file = UploadFile(BytesIO(b"a" * 1024 * 1024), headers=Headers({"content-type": "image/png"}))
+
+        response = await files_service.upload_file(file)
+
+        assert response.url == f"https://storage/tmp/{1024 * 1024}"
+        mock_file_storage.store_stream.assert_awaited_once()
+        assert mock_file_storage.store_stream.call_args.args[1:] == ("image/png", "tmp")
+
+    async def test_file_too_large(self, files_service: FilesService):
+        file = UploadFile(BytesIO(b"a" * (20 * 1024 * 1024 + 1)))
+
+        with pytest.raises(EntityTooLargeError):
+            await files_service.upload_file(file)
@@ -1,9 +1,8 @@
 from collections.abc import Iterable, Iterator
-from typing import Any, cast
+from functools import cache
+from typing import Any
 
-from core.domain.models.model_data import FinalModelData, LatestModel
-from core.domain.models.model_data_mapping import MODEL_DATAS
-from core.domain.models.models import Model as ModelID
+from core.domain.models.model_index import model_index
 from protocol.api._api_models import Model, ModelField
 from protocol.api._services.conversions import (
     model_response_filter,
@@ -12,25 +11,27 @@ from protocol.api._services.conversions import (
 
 
 def _model_data_iterator() -> Iterator[Model]:
-    for model in ModelID:
-        data = MODEL_DATAS[model]
-        final_data: FinalModelData | LatestModel
-        if isinstance(data, LatestModel):
-            final_data = cast(FinalModelData, MODEL_DATAS[data.model])
-        elif isinstance(data, FinalModelData):
-            final_data = data
-        else:
-            # Skipping deprecated models
-            continue
-        if not final_data.providers:
-            continue
-        yield model_response_from_domain(model.value, final_data)
+    for model, indexed in model_index().listed_models():
+        yield model_response_from_domain(model.value, indexed.data)
+
+
+# The model catalog is static so the responses are built once per process
+
+
+@cache
+def _list_models() -> tuple[Model, ...]:
+    return tuple(_model_data_iterator())
+
+
+@cache
+def _list_models_mcp(fields: frozenset[ModelField] | None) -> tuple[dict[str, Any], ...]:
+    return tuple(model_response_filter(fields, _list_models()))
 
 
 async def list_models() -> list[Model]:
-    return list(_model_data_iterator())
+    return list(_list_models())
 
 
 async def list_models_mcp(fields: Iterable[ModelField] | None = None) -> list[dict[str, Any]]:
     """List models for MCP responses, excluding icon_url to reduce context window usage."""
-    return list(model_response_filter(fields, _model_data_iterator()))
+    return list(_list_models_mcp(frozenset(fields) if fields is not None else None))
@@ -1,5 +1,6 @@
 import re
 import time
+from datetime import timedelta
 from typing import Any, NamedTuple
 from uuid import UUID
 
@@ -23,6 +24,7 @@ from core.services.models_service import suggest_model
 from core.storage.deployment_storage import DeploymentStorage
 from core.utils.schema_sanitation import streamline_schema, validate_schema
 from core.utils.stream_response_utils import safe_streaming_response
+from core.utils.tiered_cache import TieredCache
 from core.utils.uuid import uuid7
 from protocol.api._run_models import (
     CHAT_COMPLETION_REQUEST_UNSUPPORTED_FIELDS,
@@ -44,6 +46,11 @@ _log = structlog.get_logger(__name__)
 
 _DEPLOYMENT_REGEXP = re.compile(r"^(anotherai/)?deployments?/(.+)$")
 
+# Deployment ids are only used to suggest an alternative when the requested model is invalid
+# so they can be slightly stale. Caching them avoids a table scan for every invalid request
+_DEPLOYMENT_IDS_TTL = timedelta(minutes=1)
+_deployment_ids_cache = TieredCache[list[str]](namespace="deployment_ids", ttl=_DEPLOYMENT_IDS_TTL)
+
 
 class _EnvironmentRef(NamedTuple):
     """A reference to a deployed environment"""
@@ -69,6 +76,14 @@ class RunService:
         self._completion_runner = completion_runner
         self._deployments_storage = deployments_storage
 
+    async def _deployment_ids(self) -> list[str]:
+        key = str(self._tenant.uid)
+        if (cached := await _deployment_ids_cache.get(key)) is not None:
+            return cached
+        deployment_ids = [d async for d in self._deployments_storage.list_deployment_ids()]
+        await _deployment_ids_cache.set(key, deployment_ids)
+        return deployment_ids
+
     @classmethod
     async def missing_model_error(
         cls,
@@ -181,7 +196,7 @@ class RunService:
         except MissingModelError as e:
             raise await self.missing_model_error(
                 e.extras.get("model"),
-                [d async for d in self._deployments_storage.list_deployment_ids()],
+                await self._deployment_ids(),
             ) from None
 
         messages = list(request_messages_to_domain(request))
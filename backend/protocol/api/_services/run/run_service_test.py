@@ -462,3 +462,21 @@ To list all models programmatically: Use the list_models tool
 To list all deployments programmatically: Use the list_deployments tool"""
         assert str(result) == expected_message
         mock_suggest_model.assert_called_once_with("claude-sonnet", ["my-agent:prod", "my-agent:dev"])
+
+
+class TestDeploymentIds:
+    async def test_deployment_ids_are_cached(self, mock_completion_runner: Mock, mock_deployments_storage: Mock):
+        async def _list_deployment_ids():
+            for deployment_id in ["deployment-1", "deployment-2"]:
+                yield deployment_id
+
+        mock_deployments_storage.list_deployment_ids = Mock(side_effect=_list_deployment_ids)
+        run_service = RunService(
+            tenant=TenantData(uid=1029, org_id="test-org"),
+            completion_runner=mock_completion_runner,
+            deployments_storage=mock_deployments_storage,
+        )
+
+        assert await run_service._deployment_ids() == ["deployment-1", "deployment-2"]
+        assert await run_service._deployment_ids() == ["deployment-1", "deployment-2"]
+        mock_deployments_storage.list_deployment_ids.assert_called_once()
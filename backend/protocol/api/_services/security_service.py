@@ -16,12 +16,31 @@ from core.storage.tenant_storage import TenantStorage
 from core.storage.user_storage import UserStorage
 from core.utils.coroutines import capture_errors
 from core.utils.signature_verifier import SignatureVerifier
+from core.utils.tiered_cache import TieredCache
 
 NO_AUTHORIZATION_ALLOWED = os.getenv("NO_AUTHORIZATION_ALLOWED") == "true"
 
 
 _log = get_logger(__name__)
 
+# The last used organization only changes when the user switches organization in the web app
+# so a short TTL is enough to absorb bursts of MCP tool calls
+_OAUTH_TENANT_TTL = timedelta(minutes=1)
+# oauth subject -> tenant
+# No in-process tier: the tenant is overwritten when the user switches organization and the new
+# organization must be used by all processes right away
+_oauth_tenant_cache = TieredCache[TenantData](
+    namespace="security.oauth_tenant",
+    ttl=_OAUTH_TENANT_TTL,
+    local_capacity=0,
+)
+
+
+async def cache_oauth_tenant(user_id: str, tenant: TenantData) -> None:
+    """Stores the tenant OAuth tokens of the user resolve to, to call every time the last used organization
+    of the user changes"""
+    await _oauth_tenant_cache.set(user_id, tenant)
+
 
 @final
 class SecurityService:
@@ -93,13 +112,21 @@ class SecurityService:
             )
         return authorization.split(" ")[1]
 
-    async def _oauth_tenant(self, token: str) -> TenantData:
-        user_id = await self._user_manager.validate_oauth_token(token)
+    async def _oauth_user_tenant(self, user_id: str) -> TenantData:
+        if cached := await _oauth_tenant_cache.get(user_id):
+            return cached
         try:
             data = await self._user_storage.last_used_organization(user_id)
         except ObjectNotFoundError:
             # If the user is not found, we auto create a tenant for the user
             data = await self._tenant_from_owner_id(user_id)
+        await cache_oauth_tenant(user_id, data)
+        return data
+
+    async def _oauth_tenant(self, token: str) -> TenantData:
+        user_id = await self._user_manager.validate_oauth_token(token)
+        # Copying since the cached tenant is shared between requests
+        data = (await self._oauth_user_tenant(user_id)).model_copy()
         data.user = User(sub=user_id, email=None)  # TODO: email
         return data
 
@@ -8,12 +8,13 @@ from structlog.typing import EventDict
 
 from core.domain.events import EventRouter
 from core.domain.exceptions import InvalidTokenError, ObjectNotFoundError
-from core.domain.tenant_data import TenantData
+from core.domain.tenant_data import TenantData, User
 from core.services.user_manager import UserManager
+from core.storage.local_kv_storage.local_kv_storage import LocalKVStorage
 from core.storage.tenant_storage import TenantStorage
 from core.storage.user_storage import UserStorage
 from core.utils.signature_verifier import SignatureVerifier
-from protocol.api._services.security_service import SecurityService
+from protocol.api._services.security_service import SecurityService, cache_oauth_tenant
 
 
 @pytest.fixture
@@ -64,6 +65,12 @@ def sample_tenant():
     return TenantData(uid=123, slug="test-tenant")
 
 
+@pytest.fixture
+def shared_cache():
+    with patch("core.utils.remote_cached.shared_cache", LocalKVStorage()):
+        yield
+
+
 class TestFindTenant:
     async def test_no_auth_tenant_not_allowed(self, security_service: SecurityService, mock_tenant_storage: Mock):
         with pytest.raises(InvalidTokenError):
@@ -348,7 +355,7 @@ class TestFindTenant:
 
         result = await security_service.find_tenant(oauth_token)
 
-        assert result == sample_tenant
+        assert result == sample_tenant.model_copy(update={"user": User(sub="user123", email=None)})
         mock_user_manager.validate_oauth_token.assert_called_once_with(oauth_token)
         mock_user_storage.last_used_organization.assert_called_once_with("user123")
         mock_tenant_storage.tenant_by_owner_id.assert_not_called()
@@ -369,12 +376,47 @@ class TestFindTenant:
 
         result = await security_service.find_tenant(oauth_token)
 
-        assert result == sample_tenant
+        assert result == sample_tenant.model_copy(update={"user": User(sub="user123", email=None)})
         mock_user_manager.validate_oauth_token.assert_called_once_with(oauth_token)
         mock_user_storage.last_used_organization.assert_called_once_with("user123")
         mock_tenant_storage.tenant_by_owner_id.assert_called_once_with("user123")
         mock_tenant_storage.create_tenant_for_owner_id.assert_not_called()
 
+    @pytest.mark.usefixtures("shared_cache")
+    async def test_oauth_token_tenant_is_cached(
+        self,
+        security_service: SecurityService,
+        mock_user_manager: Mock,
+        mock_user_storage: Mock,
+        sample_tenant: TenantData,
+    ):
+        mock_user_manager.validate_oauth_token.return_value = "user123"
+        mock_user_storage.last_used_organization.return_value = sample_tenant
+
+        first = await security_service.find_tenant("oat_test")
+        second = await security_service.find_tenant("oat_test")
+
+        assert first == second == sample_tenant.model_copy(update={"user": User(sub="user123", email=None)})
+        assert mock_user_manager.validate_oauth_token.call_count == 2
+        mock_user_storage.last_used_organization.assert_called_once_with("user123")
+
+    @pytest.mark.usefixtures("shared_cache")
+    async def test_oauth_token_tenant_after_organization_switch(
+        self,
+        security_service: SecurityService,
+        mock_user_manager: Mock,
+        mock_user_storage: Mock,
+        sample_tenant: TenantData,
+    ):
+        mock_user_manager.validate_oauth_token.return_value = "user123"
+        mock_user_storage.last_used_organization.return_value = sample_tenant
+        assert (await security_service.find_tenant("oat_test")).uid == 123
+
+        await cache_oauth_tenant("user123", TenantData(uid=456, slug="other-tenant"))
+
+        assert (await security_service.find_tenant("oat_test")).uid == 456
+        mock_user_storage.last_used_organization.assert_called_once_with("user123")
+
     async def test_oauth_token_invalid_raises_without_storage_calls(
         self,
         security_service: SecurityService,
@@ -5,6 +5,7 @@ from taskiq import Context, TaskiqDepends
 from core.domain.events import Event, EventRouter
 from core.domain.tenant_data import TenantData
 from core.services.completion_runner import CompletionRunner
+from core.services.credit_ledger import CreditLedger
 from core.services.payment_service import PaymentService
 from core.services.store_completion.completion_storer import CompletionStorer
 from core.storage.agent_storage import AgentStorage
@@ -92,6 +93,13 @@ def _payment_service(event: EventDep, dependencies: LifecycleDependenciesDep) ->
 PaymentServiceDep = Annotated[PaymentService, TaskiqDepends(_payment_service)]
 
 
+def _credit_ledger(dependencies: LifecycleDependenciesDep) -> CreditLedger:
+    return dependencies.credit_ledger
+
+
+CreditLedgerDep = Annotated[CreditLedger, TaskiqDepends(_credit_ledger)]
+
+
 def _user_storage(event: EventDep, dependencies: LifecycleDependenciesDep) -> UserStorage:
     return dependencies.storage_builder.users(event.tenant_uid)
 
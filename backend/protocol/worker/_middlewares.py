@@ -0,0 +1,156 @@
+import time
+from typing import Any, override
+
+from structlog import get_logger
+from taskiq import (
+    AsyncBroker,
+    SimpleRetryMiddleware,
+    TaskiqMessage,
+    TaskiqMiddleware,
+    TaskiqResult,
+)
+
+from core.domain.exceptions import InternalError
+from core.domain.metrics import send_counter, send_duration, send_gauge
+from protocol._common.errors import configure_scope_for_error
+from protocol._common.lifecycle import LifecycleDependencies
+from protocol.worker._queues import PriorityListQueueBroker, QueueConcurrencyMiddleware, enqueued_at, mark_enqueued
+
+_log = get_logger(__name__)
+
+# Queue depths cost a round trip to the broker so they are not sent after every task
+_QUEUE_DEPTH_INTERVAL_SECONDS = 10.0
+
+
+class ErrorMiddleware(SimpleRetryMiddleware):
+    _queue_depths_sent_at: float = 0.0
+
+    @override
+    def pre_send(self, message: TaskiqMessage) -> TaskiqMessage:
+        mark_enqueued(message)
+        return message
+
+    @override
+    async def on_error(
+        self,
+        message: TaskiqMessage,
+        result: TaskiqResult[Any],
+        exception: BaseException,
+    ):
+        is_fatal = isinstance(exception, InternalError) and exception.fatal
+        msg = (
+            f"Fatal error while executing task {message.task_name}"
+            if is_fatal
+            else f"Retriable Error while executing task {message.task_name}"
+        )
+        with configure_scope_for_error(
+            exception,
+            {"job": True, "transaction": message.task_name},
+            extras={"args": message.args, "kwargs": message.kwargs},
+        ):
+            _log.exception(msg, exc_info=exception)
+
+        if is_fatal:
+            return
+
+        send_counter("job_retry", task_name=message.task_name)
+        await super().on_error(message, result, exception)
+
+    @override
+    async def post_execute(
+        self,
+        message: "TaskiqMessage",
+        result: "TaskiqResult[Any]",
+    ) -> None:
+        """
+        This function tracks number of errors and success executions.
+
+        :param message: received message.
+        :param result: result of the execution.
+        """
+        send_duration(
+            name="job_execution_time",
+            seconds=result.execution_time,
+            task_name=message.task_name,
+            error=result.is_err,
+        )
+        queue_name = message.labels.get("queue_name")
+        if (sent_at := enqueued_at(message)) is not None:
+            # Time spent in the queue and waiting for a concurrency slot
+            send_duration(
+                name="job_queue_time",
+                seconds=max(time.time() - sent_at - result.execution_time, 0),
+                task_name=message.task_name,
+                queue=queue_name,
+            )
+        await self._send_queue_depths()
+
+    async def _send_queue_depths(self):
+        if not isinstance(self.broker, PriorityListQueueBroker):
+            return
+        now = time.monotonic()
+        if now - self._queue_depths_sent_at < _QUEUE_DEPTH_INTERVAL_SECONDS:
+            return
+        self._queue_depths_sent_at = now
+        try:
+            depths = await self.broker.queue_depths()
+        except Exception as e:  # noqa: BLE001
+            _log.warning("Failed to fetch queue depths", exc_info=e)
+            return
+        for queue_name, depth in depths.items():
+            send_gauge(name="job_queue_depth", value=depth, queue=queue_name)
+            send_gauge(name="job_queue_held", value=self.broker.held(queue_name), queue=queue_name)
+
+
+class ClaimCheckMiddleware(TaskiqMiddleware):
+    """Resolves references to offloaded event payloads before a task executes.
+
+    The task executes a copy of the message with the resolved payloads. The references are put back
+    in the message on error and after execution so that retries and error reports do not carry
+    the full payloads."""
+
+    def __init__(self):
+        super().__init__()
+        # Arguments with references of the tasks being executed, by task id
+        self._references: dict[str, list[Any]] = {}
+
+    @override
+    async def pre_execute(self, message: TaskiqMessage) -> TaskiqMessage:
+        dependencies: LifecycleDependencies = self.broker.state.dependencies
+        try:
+            args = [await dependencies.event_claim_check.resolve(arg) for arg in message.args]
+        except Exception as e:  # noqa: BLE001
+            # The task will fail to validate its event and go through the usual error handling
+            _log.exception("Error resolving claim checked event", exc_info=e, task_name=message.task_name)
+            return message
+        if all(resolved is arg for resolved, arg in zip(args, message.args, strict=True)):
+            return message
+        self._references[message.task_id] = message.args
+        return message.model_copy(update={"args": args})
+
+    def _restore_references(self, message: TaskiqMessage, pop: bool):
+        references = self._references.pop(message.task_id, None) if pop else self._references.get(message.task_id)
+        if references is not None:
+            message.args = references
+
+    @override
+    async def on_error(self, message: TaskiqMessage, result: TaskiqResult[Any], exception: BaseException) -> None:
+        self._restore_references(message, pop=False)
+
+    @override
+    async def post_execute(self, message: TaskiqMessage, result: TaskiqResult[Any]) -> None:
+        self._restore_references(message, pop=True)
+
+
+def middlewares(broker: AsyncBroker) -> list[TaskiqMiddleware]:
+    middlewares: list[TaskiqMiddleware] = []
+    # Waiting for a concurrency slot before fetching offloaded payloads so that
+    # prefetched tasks do not hold them in memory
+    if isinstance(broker, PriorityListQueueBroker):
+        middlewares.append(QueueConcurrencyMiddleware(list(broker.queues.values())))
+    # The claim check must come before the error middleware since middlewares handle errors in order
+    # and the references have to be restored before the task is retried
+    middlewares.append(ClaimCheckMiddleware())
+    # TODO: add backoff and jitter
+    middlewares.append(ErrorMiddleware(default_retry_count=3))
+    return middlewares
@@ -0,0 +1,70 @@
+# pyright: reportPrivateUsage=false
+
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from taskiq import InMemoryBroker, TaskiqMessage, TaskiqResult
+
+from protocol.worker._middlewares import (
+    ClaimCheckMiddleware,
+    ErrorMiddleware,
+    middlewares,
+)
+from protocol.worker._queues import PriorityListQueueBroker, QueueConcurrencyMiddleware
+
+_REFERENCE = {"tenant_uid": 1, "claim_check": "event_claim_check:abc"}
+_PAYLOAD = {"tenant_uid": 1, "completion": "large"}
+
+
+async def _resolve(arg: Any) -> Any:
+    return _PAYLOAD if arg == _REFERENCE else arg
+
+
+@pytest.fixture
+def claim_check_middleware() -> ClaimCheckMiddleware:
+    broker = InMemoryBroker()
+    broker.state.dependencies = Mock(event_claim_check=Mock(resolve=AsyncMock(side_effect=_resolve)))
+    middleware = ClaimCheckMiddleware()
+    middleware.set_broker(broker)
+    return middleware
+
+
+def _message(*args: Any) -> TaskiqMessage:
+    return TaskiqMessage(task_id="1", task_name="store_completion", labels={}, args=list(args), kwargs={})
+
+
+def _result() -> TaskiqResult[Any]:
+    return TaskiqResult(is_err=True, return_value=None, execution_time=0.1)
+
+
+class TestClaimCheckMiddleware:
+    async def test_references_are_restored_on_error(self, claim_check_middleware: ClaimCheckMiddleware):
+        message = _message(_REFERENCE)
+
+        executed = await claim_check_middleware.pre_execute(message)
+        assert executed.args == [_PAYLOAD]
+        assert message.args == [_REFERENCE], "the received message should keep the reference"
+
+        await claim_check_middleware.on_error(executed, _result(), ValueError())
+        assert executed.args == [_REFERENCE]
+
+        executed.args = [_PAYLOAD]
+        await claim_check_middleware.post_execute(executed, _result())
+        assert executed.args == [_REFERENCE]
+        assert not claim_check_middleware._references
+
+    async def test_no_reference(self, claim_check_middleware: ClaimCheckMiddleware):
+        message = _message(_PAYLOAD)
+        assert await claim_check_middleware.pre_execute(message) is message
+        assert not claim_check_middleware._references
+
+
+class TestMiddlewares:
+    def test_order(self):
+        broker = PriorityListQueueBroker(url="redis://localhost:6379")
+        assert [type(m) for m in middlewares(broker)] == [
+            QueueConcurrencyMiddleware,
+            ClaimCheckMiddleware,
+            ErrorMiddleware,
+        ]
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import time
+from collections.abc import AsyncGenerator, Awaitable, Sequence
+from typing import Any, NamedTuple, cast, override
+
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from structlog import get_logger
+from taskiq import AckableMessage, TaskiqMessage, TaskiqMiddleware, TaskiqResult
+from taskiq_redis import ListQueueBroker
+
+_log = get_logger(__name__)
+
+# BRPOP only blocks for this long so that queues that are no longer full are listened to again
+_POLL_TIMEOUT_SECONDS = 1
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+class WorkerQueue(NamedTuple):
+    name: str
+    # Maximum number of tasks of the queue executing at the same time in a worker process
+    max_concurrency: int
+    # Number of tasks fetched in advance, waiting for a concurrency slot
+    prefetch: int
+
+    @property
+    def capacity(self) -> int:
+        return self.max_concurrency + self.prefetch
+
+    @classmethod
+    def from_env(cls, name: str, env_prefix: str, max_concurrency: int, prefetch: int) -> "WorkerQueue":
+        return cls(
+            name=name,
+            max_concurrency=_env_int(f"WORKER_{env_prefix}_MAX_CONCURRENCY", max_concurrency),
+            prefetch=_env_int(f"WORKER_{env_prefix}_PREFETCH", prefetch),
+        )
+
+
+# Cheap storage tasks that should never wait behind long running tasks
+STORAGE_QUEUE = WorkerQueue.from_env("taskiq:storage", "STORAGE", max_concurrency=40, prefetch=20)
+# Kept as the taskiq default queue name so that tasks without a queue label land there
+DEFAULT_QUEUE = WorkerQueue.from_env("taskiq", "DEFAULT", max_concurrency=10, prefetch=5)
+# Experiment completions are LLM calls that can take minutes, prefetching them would only hold them back
+EXPERIMENTS_QUEUE = WorkerQueue.from_env("taskiq:experiments", "EXPERIMENTS", max_concurrency=20, prefetch=0)
+
+# Queues in priority order. The sum of the capacities should stay below the
+# --max-async-tasks of the worker so that a full queue never blocks the others
+QUEUES: tuple[WorkerQueue, ...] = (STORAGE_QUEUE, DEFAULT_QUEUE, EXPERIMENTS_QUEUE)
+
+
+class PriorityListQueueBroker(ListQueueBroker):
+    """A redis list broker that listens to several queues in priority order.
+
+    A queue is only listened to while the number of its tasks held by the worker,
+    either executing or prefetched, is below its capacity. Tasks are released
+    when the receiver acknowledges them."""
+
+    def __init__(self, url: str, queues: Sequence[WorkerQueue] = QUEUES, **kwargs: Any):
+        super().__init__(url=url, queue_name=DEFAULT_QUEUE.name, **kwargs)
+        self.queues = {queue.name: queue for queue in queues}
+        self._held = dict.fromkeys(self.queues, 0)
+        self._released: asyncio.Event | None = None
+
+    def held(self, queue_name: str) -> int:
+        return self._held[queue_name]
+
+    def _available_queues(self) -> list[str]:
+        # Dicts keep insertion order so the queues are in priority order
+        return [name for name, queue in self.queues.items() if self._held[name] < queue.capacity]
+
+    async def _brpop(self, queue_names: list[str]) -> tuple[str, bytes] | None:
+        async with Redis(connection_pool=self.connection_pool) as redis_conn:
+            popped = await cast(
+                Awaitable[tuple[bytes, bytes] | None],
+                redis_conn.brpop(queue_names, timeout=_POLL_TIMEOUT_SECONDS),  # pyright: ignore[reportUnknownMemberType]
+            )
+        if not popped:
+            return None
+        queue_name, data = popped
+        return queue_name.decode(), data
+
+    def _release(self, queue_name: str) -> None:
+        self._held[queue_name] -= 1
+        if self._released:
+            self._released.set()
+
+    def _is_executable(self, data: bytes) -> bool:
+        # The receiver skips messages it can not execute without acknowledging them
+        # so they would be held forever
+        try:
+            message = self.formatter.loads(data)
+        except Exception as e:  # noqa: BLE001
+            _log.warning("Dropping message that can not be parsed", exc_info=e)
+            return False
+        if self.find_task(message.task_name) is None:
+            _log.warning("Dropping message for unknown task", task_name=message.task_name)
+            return False
+        return True
+
+    @override
+    async def listen(self) -> AsyncGenerator[AckableMessage]:  # pyright: ignore[reportIncompatibleMethodOverride]
+        self._released = asyncio.Event()
+        while True:
+            queue_names = self._available_queues()
+            if not queue_names:
+                self._released.clear()
+                _ = await self._released.wait()
+                continue
+            try:
+                popped = await self._brpop(queue_names)
+            except RedisConnectionError as e:
+                _log.warning("Redis connection error while listening", exc_info=e)
+                continue
+            if popped is None:
+                continue
+            queue_name, data = popped
+            if queue_name not in self._held or not self._is_executable(data):
+                continue
+            self._held[queue_name] += 1
+            yield AckableMessage(data=data, ack=lambda queue_name=queue_name: self._release(queue_name))
+
+    async def queue_depths(self) -> dict[str, int]:
+        async with Redis(connection_pool=self.connection_pool) as redis_conn, redis_conn.pipeline() as pipe:
+            for name in self.queues:
+                _ = pipe.llen(name)  # pyright: ignore[reportUnknownMemberType]
+            depths: list[int] = await pipe.execute()  # pyright: ignore[reportUnknownMemberType]
+        return dict(zip(self.queues, depths, strict=True))
+
+
+class QueueConcurrencyMiddleware(TaskiqMiddleware):
+    """Limits the number of tasks of each queue executing at the same time.
+    Prefetched tasks wait for a slot before executing."""
+
+    def __init__(self, queues: Sequence[WorkerQueue] = QUEUES):
+        super().__init__()
+        self._semaphores = {queue.name: asyncio.Semaphore(queue.max_concurrency) for queue in queues}
+
+    def _semaphore(self, message: TaskiqMessage) -> asyncio.Semaphore | None:
+        return self._semaphores.get(message.labels.get("queue_name") or DEFAULT_QUEUE.name)
+
+    @override
+    async def pre_execute(self, message: TaskiqMessage) -> TaskiqMessage:
+        if semaphore := self._semaphore(message):
+            _ = await semaphore.acquire()
+        return message
+
+    @override
+    async def post_execute(self, message: TaskiqMessage, result: TaskiqResult[Any]) -> None:
+        if semaphore := self._semaphore(message):
+            semaphore.release()
+
+
+def enqueued_at(message: TaskiqMessage) -> float | None:
+    value = message.labels.get("enqueued_at")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def mark_enqueued(message: TaskiqMessage) -> None:
+    message.labels["enqueued_at"] = time.time()
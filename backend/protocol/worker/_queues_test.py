@@ -0,0 +1,95 @@
+# pyright: reportPrivateUsage=false
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from taskiq import AckableMessage, TaskiqMessage, TaskiqResult
+
+from protocol.worker._queues import PriorityListQueueBroker, QueueConcurrencyMiddleware, WorkerQueue
+
+_QUEUES = [
+    WorkerQueue("storage", max_concurrency=1, prefetch=1),
+    WorkerQueue("experiments", max_concurrency=1, prefetch=0),
+]
+
+
+@pytest.fixture
+def queue_broker():
+    broker = PriorityListQueueBroker(url="redis://localhost:6379", queues=_QUEUES)
+
+    @broker.task(task_name="known_task")
+    async def known_task() -> None:  # pyright: ignore[reportUnusedFunction]
+        pass
+
+    return broker
+
+
+def _message(broker: PriorityListQueueBroker, task_name: str = "known_task") -> bytes:
+    return broker.formatter.dumps(
+        TaskiqMessage(task_id="1", task_name=task_name, labels={}, args=[], kwargs={}),
+    ).message
+
+
+class TestPriorityListQueueBroker:
+    async def test_full_queues_are_not_listened_to(self, queue_broker: PriorityListQueueBroker):
+        popped_from: list[list[str]] = []
+        queue = asyncio.Queue[tuple[str, bytes]]()
+        for name in ["storage", "storage", "experiments"]:
+            queue.put_nowait((name, _message(queue_broker)))
+
+        async def _brpop(queue_names: list[str]):
+            popped_from.append(queue_names)
+            return await queue.get()
+
+        with patch.object(queue_broker, "_brpop", side_effect=_brpop):
+            listener = queue_broker.listen()
+            messages = [await anext(listener) for _ in range(3)]
+
+            assert popped_from == [["storage", "experiments"], ["storage", "experiments"], ["experiments"]]
+            assert queue_broker.held("storage") == 2
+            assert queue_broker.held("experiments") == 1
+
+            # All queues are full so the listener waits for a message to be acknowledged
+            next_message = asyncio.create_task(anext(listener))
+            await asyncio.sleep(0.01)
+            assert not next_message.done()
+
+            queue.put_nowait(("storage", _message(queue_broker)))
+            assert isinstance(messages[0], AckableMessage)
+            _ = messages[0].ack()
+            assert (await asyncio.wait_for(next_message, 1)).data == _message(queue_broker)
+            assert popped_from[-1] == ["storage"]
+
+    async def test_unknown_tasks_are_not_held(self, queue_broker: PriorityListQueueBroker):
+        queue = asyncio.Queue[tuple[str, bytes]]()
+        queue.put_nowait(("storage", _message(queue_broker, "unknown_task")))
+        queue.put_nowait(("storage", b"not a message"))
+        queue.put_nowait(("storage", _message(queue_broker)))
+
+        async def _brpop(queue_names: list[str]):
+            return await queue.get()
+
+        with patch.object(queue_broker, "_brpop", side_effect=_brpop):
+            message = await anext(queue_broker.listen())
+
+        assert message.data == _message(queue_broker)
+        assert queue_broker.held("storage") == 1
+
+
+class TestQueueConcurrencyMiddleware:
+    async def test_limits_concurrency_per_queue(self):
+        middleware = QueueConcurrencyMiddleware(_QUEUES)
+        storage = TaskiqMessage(task_id="1", task_name="a", labels={"queue_name": "storage"}, args=[], kwargs={})
+        experiment = TaskiqMessage(task_id="2", task_name="b", labels={"queue_name": "experiments"}, args=[], kwargs={})
+
+        _ = await middleware.pre_execute(storage)
+        # Another queue is not affected
+        _ = await asyncio.wait_for(middleware.pre_execute(experiment), 1)
+
+        waiting = asyncio.create_task(middleware.pre_execute(storage))
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        await middleware.post_execute(storage, TaskiqResult(is_err=False, return_value=None, execution_time=1))
+        _ = await asyncio.wait_for(waiting, 1)
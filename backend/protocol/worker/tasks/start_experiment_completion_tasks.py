@@ -1,10 +1,11 @@
 from core.domain.events import StartExperimentCompletionEvent
 from protocol.worker._dependencies import PlaygroundServiceDep
+from protocol.worker._queues import EXPERIMENTS_QUEUE
 from protocol.worker.tasks._types import TASK
 from protocol.worker.worker import broker
 
 
-@broker.task(retry_on_error=True)
+@broker.task(retry_on_error=True, queue_name=EXPERIMENTS_QUEUE.name)
 async def start_experiment_completion(
     event: StartExperimentCompletionEvent,
     playground_service: PlaygroundServiceDep,
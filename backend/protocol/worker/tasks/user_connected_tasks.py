@@ -1,4 +1,5 @@
 from core.domain.events import UserConnectedEvent
+from protocol.api._services.security_service import cache_oauth_tenant
 from protocol.worker._dependencies import UserStorageDep
 from protocol.worker.tasks._types import TASK
 from protocol.worker.worker import broker
@@ -7,6 +8,9 @@ from protocol.worker.worker import broker
 @broker.task(retry_on_error=True)
 async def user_authenticated_task(event: UserConnectedEvent, user_storage: UserStorageDep):
     await user_storage.set_last_used_organization(event.user_id, event.organization_id)
+    # OAuth tokens resolve to the last used organization, the cached one is replaced so that
+    # switching organization is visible right away
+    await cache_oauth_tenant(event.user_id, await user_storage.last_used_organization(event.user_id))
 
 
 TASKS: list[TASK[UserConnectedEvent]] = [user_authenticated_task]
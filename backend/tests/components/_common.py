@@ -9,6 +9,7 @@ from pytest_httpx import HTTPXMock
 
 from core.domain.models.providers import Provider
 from core.utils.background import active_background_task_count, wait_for_background_tasks
+from protocol._common.lifecycle import LifecycleDependencies
 from tests.pausable_memory_broker import PausableInMemoryBroker
 from tests.utils import fixtures_json
 
@@ -59,6 +60,9 @@ class IntegrationTestClient:
             await wait_for_background_tasks()
 
             await self.broker.wait_all()
+            # Credit decrements are applied in batches
+            if LifecycleDependencies.shared:
+                await LifecycleDependencies.shared.credit_ledger.flush()
             # Retrying since some tasks could have created other tasks
             running = [task for task in self.broker._running_tasks if not task.done()]  # pyright: ignore [reportPrivateUsage]  # noqa: SLF001
             if not running and not active_background_task_count():
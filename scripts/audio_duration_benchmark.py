@@ -0,0 +1,59 @@
+import time
+from collections.abc import Callable
+from typing import Annotated, Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from core.utils.audio import (
+    _audio_duration_seconds_sync,  # pyright: ignore[reportPrivateUsage]
+    audio_duration_from_headers,
+)
+from tests.utils import fixture_bytes
+
+_FIXTURES = {
+    "files/test.wav": "audio/wav",
+    "files/sample.mp3": "audio/mpeg",
+    "files/sample.flac": "audio/flac",
+}
+
+
+def _timed(fn: Callable[[], Any], iterations: int) -> tuple[Any, float]:
+    """Returns the result of the call and its average duration in ms"""
+    result: Any = None
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = fn()
+    return result, (time.perf_counter() - start) * 1000 / iterations
+
+
+def _row(data: bytes, content_type: str, iterations: int) -> tuple[str, str, str, str]:
+    header_duration, header_ms = _timed(lambda: audio_duration_from_headers(data), iterations)
+    try:
+        decoded_duration, decode_ms = _timed(lambda: _audio_duration_seconds_sync(data, content_type), iterations)
+    except FileNotFoundError:
+        # ffmpeg is not installed
+        return str(header_duration), f"{header_ms:.4f}", "n/a", "n/a"
+    return str(header_duration), f"{header_ms:.4f}", str(decoded_duration), f"{decode_ms:.2f}"
+
+
+def main(
+    iterations: Annotated[int, typer.Option(help="Number of times each duration is computed")] = 20,
+):
+    """Compares computing audio durations from the container headers with decoding the files with ffmpeg"""
+    table = Table(title=f"Audio duration, average over {iterations} iterations")
+    table.add_column("File")
+    table.add_column("Headers (s)", justify="right")
+    table.add_column("Headers (ms)", justify="right")
+    table.add_column("Decoding (s)", justify="right")
+    table.add_column("Decoding (ms)", justify="right")
+
+    for fixture, content_type in _FIXTURES.items():
+        table.add_row(fixture, *_row(fixture_bytes(fixture), content_type, iterations))
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
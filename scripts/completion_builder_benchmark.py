@@ -0,0 +1,99 @@
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Annotated, Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from core.domain.agent import Agent
+from core.domain.agent_input import AgentInput
+from core.domain.message import Message
+from core.domain.models import Model, Provider
+from core.domain.version import Version
+from core.providers._base.llm_completion import LLMCompletion
+from core.providers._base.llm_usage import LLMUsage
+from core.runners.agent_completion_builder import AgentCompletionBuilder
+from core.runners.runner_output import RunnerOutput
+from core.utils.uuid import uuid7
+
+
+def _measure(fn: Callable[[], Any], iterations: int) -> tuple[float, float]:
+    """Returns the memory retained per iteration in KB and the duration per iteration in µs.
+    Durations are measured without tracing allocations since tracemalloc slows down allocations"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        _ = fn()
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    # Keeping the results to measure what a completion retains
+    _ = [fn() for _ in range(iterations)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / iterations, duration * 1_000_000 / iterations
+
+
+def _llm_completion(i: int) -> LLMCompletion:
+    return LLMCompletion(
+        duration_seconds=1.2,
+        model=Model.GPT_4O_2024_11_20,
+        provider=Provider.OPEN_AI,
+        usage=LLMUsage(
+            prompt_token_count=1000 + i,
+            completion_token_count=200,
+            prompt_cost_usd=0.001,
+            completion_cost_usd=0.002,
+        ),
+    )
+
+
+def _builder(agent: Agent, version: Version, agent_input: AgentInput, trace_count: int) -> AgentCompletionBuilder:
+    return AgentCompletionBuilder(
+        id=uuid7(),
+        agent=agent,
+        version=version,
+        agent_input=agent_input,
+        messages=[*(version.prompt or []), *(agent_input.messages or [])],
+        start_time=time.time(),
+        conversation_id=None,
+        metadata={"user_id": "user_123"},
+        llm_completions=[_llm_completion(i) for i in range(trace_count)],
+    )
+
+
+def main(
+    iterations: Annotated[int, typer.Option(help="Number of completions built per measure")] = 2000,
+    trace_count: Annotated[int, typer.Option(help="Number of LLM completions per agent completion")] = 3,
+):
+    """Measures the allocations and time spent creating a completion builder and building the completion"""
+    agent = Agent(uid=1, id="agent", name="agent", created_at=datetime.now(UTC))
+    version = Version(model="gpt-4o", prompt=[Message.with_text("You are a helpful assistant", role="system")])
+    agent_input = AgentInput(messages=[Message.with_text("Hello, who are you?")])
+    output = RunnerOutput(agent_output="I am a helpful assistant")
+
+    table = Table(title=f"{iterations} completions with {trace_count} LLM traces")
+    table.add_column("Operation")
+    table.add_column("Allocated per completion (KB)", justify="right")
+    table.add_column("Duration per completion (µs)", justify="right")
+
+    # Each builder only builds its completion once
+    builders = [_builder(agent, version, agent_input, trace_count) for _ in range(iterations * 2)]
+    builders_iter = iter(builders)
+    operations: dict[str, Callable[[], Any]] = {
+        "create builder": lambda: _builder(agent, version, agent_input, 0),
+        "build traces": lambda: [c.to_domain() for c in builders[0].llm_completions],
+        "build completion": lambda: next(builders_iter).build(output),
+    }
+
+    for name, fn in operations.items():
+        peak, duration = _measure(fn, iterations)
+        table.add_row(name, f"{peak:.2f}", f"{duration:.1f}")
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,89 @@
+import time
+from collections.abc import Callable, Sequence
+from typing import Annotated, Any, cast
+
+import typer
+from clickhouse_connect.driver.query import QueryResult
+from rich.console import Console
+from rich.table import Table
+
+from core.storage.clickhouse._models._ch_completion import ClickhouseCompletion
+from core.storage.clickhouse._models._ch_field_utils import data_and_columns, zip_columns
+from core.storage.clickhouse.clickhouse_client import ClickhouseClient
+from core.utils.uuid import uuid7
+from tests.fake_models import fake_completion
+
+_PROJECTIONS: dict[str, set[str]] = {
+    "all columns": set(),
+    "default (no IO, no traces)": {"input_variables", "input_messages", "output_messages", "traces"},
+    "previews only": {
+        "input_variables",
+        "input_messages",
+        "output_messages",
+        "traces",
+        "version",
+        "messages",
+        "metadata",
+    },
+}
+
+
+def _result(count: int, exclude: set[str]) -> QueryResult:
+    """Builds a query result shaped like the one returned by ClickHouse for the selected columns"""
+    selected = ClickhouseCompletion.select(exclude=exclude)
+    rows: list[list[Any]] = []
+    columns: list[str] = []
+    for i in range(count):
+        completion = fake_completion(id=uuid7(rand=lambda i=i: i))
+        data, all_columns = data_and_columns(ClickhouseCompletion.from_domain(1, completion))
+        kept = [(c, d) for c, d in zip(all_columns, data, strict=True) if c.split(".")[0] in selected]
+        columns = [c for c, _ in kept]
+        rows.append([d for _, d in kept])
+    return QueryResult(result_set=rows, column_names=tuple(columns))
+
+
+def _zip(result: QueryResult):
+    _ = zip_columns(
+        cast(Sequence[str], result.column_names),
+        cast(Sequence[Sequence[Any]], result.result_rows),
+        nested_fields={"annotations", "traces"},
+    )
+
+
+def _decode(result: QueryResult):
+    client = ClickhouseClient(cast(Any, None), 1)
+    rows = cast(Sequence[Sequence[Any]], result.result_rows)
+    _ = client._map_completions(result, rows)  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+
+
+def _measure(fn: Callable[[QueryResult], None], result: QueryResult, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(result)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(
+    count: Annotated[int, typer.Option(help="Number of completions to decode")] = 2000,
+    repeat: Annotated[int, typer.Option(help="Number of runs, the best run is reported")] = 5,
+):
+    """Measures the time spent decoding completions returned by completions_by_ids for different projections"""
+    table = Table(title=f"Decoding {count} completions")
+    table.add_column("Projection")
+    table.add_column("Zip columns (ms)", justify="right")
+    table.add_column("Decode to domain (ms)", justify="right")
+    table.add_column("µs / completion", justify="right")
+
+    for name, exclude in _PROJECTIONS.items():
+        result = _result(count, exclude)
+        zipped = _measure(_zip, result, repeat)
+        decoded = _measure(_decode, result, repeat)
+        table.add_row(name, f"{zipped * 1000:.1f}", f"{decoded * 1000:.1f}", f"{decoded / count * 1e6:.1f}")
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,69 @@
+import base64
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Annotated, Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from core.domain.file import File
+from core.services.store_completion.completion_storer import _file_cache_key  # pyright: ignore[reportPrivateUsage]
+
+
+def _measure(fn: Callable[[], Any]) -> tuple[float, float]:
+    """Returns the peak of memory allocated during the call in MB and its duration in ms"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    _ = fn()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, duration * 1000
+
+
+def _request_files(data: str, count: int) -> list[File]:
+    return [File(url=f"data:application/pdf;base64,{data}") for _ in range(count)]
+
+
+def _handle_request(files: list[File]):
+    """Mimics the file handling of a request: sanitizing the input and computing storage keys twice"""
+    for file in files:
+        _ = file.sanitize()
+    for _ in range(2):
+        for file in files:
+            _ = _file_cache_key(file)
+
+
+def main(
+    size_mb: Annotated[int, typer.Option(help="Size of each file in MB")] = 10,
+    file_count: Annotated[int, typer.Option(help="Number of files in the multimodal request")] = 4,
+):
+    """Measures the memory allocated when handling large base64 files"""
+    raw = b"%PDF" + os.urandom(size_mb * 1024 * 1024)
+    data = base64.b64encode(raw).decode()
+
+    table = Table(title=f"Files of {size_mb}MB ({len(data) / 1024 / 1024:.1f}MB in base64)")
+    table.add_column("Operation")
+    table.add_column("Peak allocated (MB)", justify="right")
+    table.add_column("Duration (ms)", justify="right")
+
+    operations: dict[str, Callable[[], Any]] = {
+        "sanitize data": lambda: File(data=data).sanitize(),
+        "sanitize data url": lambda: File(url=f"data:application/pdf;base64,{data}").sanitize(),
+        "content bytes": lambda: File(data=data).content_bytes(),
+    }
+    files = _request_files(data, file_count)
+    operations[f"request with {file_count} files"] = lambda: _handle_request(files)
+
+    for name, fn in operations.items():
+        peak, duration = _measure(fn)
+        table.add_row(name, f"{peak:.1f}", f"{duration:.1f}")
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
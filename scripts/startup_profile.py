@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Annotated, NamedTuple
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+
+class _ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _parse_importtime(stderr: str) -> list[_ImportTime]:
+    # Lines look like "import time:       295 |        501 |     core.domain"
+    entries: list[_ImportTime] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|", 2)
+        stripped = module.lstrip()
+        entries.append(
+            _ImportTime(
+                module=stripped.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(module) - len(stripped)) // 2,
+            ),
+        )
+    return entries
+
+
+def _run_importtime(module: str) -> list[_ImportTime]:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{result.stderr[-2000:]}")
+    return _parse_importtime(result.stderr)
+
+
+def _package_totals(entries: list[_ImportTime], depth: int) -> dict[str, int]:
+    totals: dict[str, int] = defaultdict(int)
+    for entry in entries:
+        totals[".".join(entry.module.split(".")[:depth])] += entry.self_us
+    return totals
+
+
+def _print_table(console: Console, title: str, rows: list[tuple[str, int]], total_us: int):
+    table = Table(title=title)
+    table.add_column("Module")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("%", justify="right")
+    for name, us in rows:
+        table.add_row(name, f"{us / 1000:.1f}", f"{us / total_us * 100:.1f}")
+    console.print(table)
+
+
+def main(
+    module: Annotated[str, typer.Argument(help="The module to profile")] = "protocol.api.api_server",
+    top: Annotated[int, typer.Option(help="Number of rows to display per table")] = 20,
+    package_depth: Annotated[int, typer.Option(help="Depth at which module times are aggregated")] = 2,
+):
+    """Prints a breakdown of the import time of a module, similar to `python -X importtime`"""
+    entries = _run_importtime(module)
+    total_us = sum(e.self_us for e in entries)
+
+    console = Console()
+    console.print(f"Importing [bold]{module}[/bold] took {total_us / 1000:.1f}ms ({len(entries)} modules)")
+
+    packages = sorted(_package_totals(entries, package_depth).items(), key=lambda x: x[1], reverse=True)
+    _print_table(console, "By package (self time)", packages[:top], total_us)
+
+    by_self = sorted(entries, key=lambda e: e.self_us, reverse=True)
+    _print_table(console, "Slowest modules (self time)", [(e.module, e.self_us) for e in by_self[:top]], total_us)
+
+    first_party = [e for e in entries if e.module.split(".")[0] in {"core", "protocol"}]
+    by_cumulative = sorted(first_party, key=lambda e: e.cumulative_us, reverse=True)
+    _print_table(
+        console,
+        "Slowest first party modules (cumulative time)",
+        [(e.module, e.cumulative_us) for e in by_cumulative[:top]],
+        total_us,
+    )
+
+
+if __name__ == "__main__":
+    typer.run(main)